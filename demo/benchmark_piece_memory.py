@@ -0,0 +1,38 @@
+from ytl.logistics_objects import Piece, Shipment
+import tracemalloc
+import sys
+
+
+def make_piece(i):
+    return Piece(
+        packing='PALLET',
+        stack_limit=2,
+        length=40 + i % 9,
+        width=40 + i % 7,
+        height=30 + i % 5,
+        dimension_unit_of_measure='IN',
+        weight=100 + i % 11,
+        weight_unit_of_measure='LBS',
+        name=f'Shipment 1:  Piece {i+1}',
+    )
+
+
+def get_bytes_per_object(make, num_objects):
+    '''
+    Get Memory Held by Each of `num_objects` Objects, as Measured by tracemalloc
+    '''
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    objects = [make(i) for i in range(num_objects)]
+    size = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+    del objects
+    return size / num_objects
+
+
+num_pieces = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+
+print('')
+print(f'Bytes per piece:     {get_bytes_per_object(make_piece, num_pieces):.0f}')
+print(f'Bytes per shipment:  {get_bytes_per_object(lambda i : Shipment(pieces=make_piece(i)), num_pieces):.0f}  (including its piece)')
+print('')
@@ -0,0 +1,91 @@
+import unittest
+from ytl.py3dbp import Packer, Bin, Item, NoRotateBin
+from ytl.optimizer_functions import optimize_shipment_arrangement
+from ytl.utils import get_overlapping_pairs
+from ytl.logistics_objects.skyline import FloorSkyline
+from tests.logistics_objects import make_shipment, make_trailer
+import numpy as np
+
+
+def pack_items(dims, numeric_mode, bin_dims=(98.5, 300, 1.5), bin_class=Bin):
+	packer = Packer()
+	packer.add_bin(bin_class(name='bin', width=bin_dims[0], height=bin_dims[1], depth=bin_dims[2], max_weight=42500))
+	for i, (width, length, depth, weight) in enumerate(dims):
+		packer.add_item(Item(name=f'item {i:03d}', width=width, height=length, depth=depth, weight=weight))
+	packer.pack(bigger_first=True, numeric_mode=numeric_mode)
+	return [
+		(item.name, item.rotation_type, item.get_position())
+		for item in sorted(packer.items, key=lambda x : x.name)
+	], len(packer.bins[0].unfitted_items), packer.bins[0].get_total_weight()
+
+
+class NumericModeTest(unittest.TestCase):
+	def test_integer_mode_matches_decimal_mode(self):
+		rng = np.random.default_rng(5)
+		for i in range(30):
+			dims = [
+				(
+					float(rng.choice([12, 20, 33.5, 40.25, 47.9995])),
+					float(rng.choice([12, 20, 33.5, 40.25, 48.0005])),
+					1 if i % 2 == 0 else float(rng.choice([10, 30.5])),
+					float(rng.integers(50, 500)),
+				)
+				for _ in range(30)
+			]
+			bin_dims = (98.5, 300, 1.5) if i % 2 == 0 else (60, 100, 50)
+			bin_class = NoRotateBin if i % 3 == 0 else Bin
+			decimal_result = pack_items(dims, 'decimal', bin_dims, bin_class)
+			integer_result = pack_items(dims, 'integer', bin_dims, bin_class)
+			self.assertEqual(decimal_result[:2], integer_result[:2])
+			self.assertEqual(float(decimal_result[2]) * 1000, integer_result[2])
+
+
+class FloorPackingTest(unittest.TestCase):
+	def test_floor_packers_produce_valid_arrangements(self):
+		rng = np.random.default_rng(9)
+		for i in range(20):
+			dims = [
+				(float(rng.choice([40, 48, 33.5, 60])), float(rng.choice([40, 48, 30.25])))
+				for _ in range(15)
+			]
+			for algorithm in ['MAXRECTS_PACK', 'SKYLINE_PACK', 'SKYLINE_LOAD']:
+				allow_rotations = i % 2 == 0
+				shipments = [make_shipment(length, width) for length, width in dims]
+				trailer = make_trailer(shipments, length=2000)
+				optimize_shipment_arrangement(trailer, algorithm, max_iter=2, allow_rotations=allow_rotations)
+				self.assertTrue(trailer.arrangement_is_valid())
+				self.assertEqual(len(get_overlapping_pairs(trailer.get_shipment_boundaries())), 0)
+				if not allow_rotations:
+					self.assertEqual([(s.length, s.width) for s in shipments], dims)
+
+	def test_maxrects_fills_rows(self):
+		shipments = [make_shipment(48, 40) for _ in range(6)]
+		trailer = make_trailer(shipments)
+		optimize_shipment_arrangement(trailer, 'MAXRECTS_PACK')
+		self.assertEqual(trailer.get_shipment_boundaries()[:, 0, 1].max(), 120)
+
+	def test_floor_skyline_covers_placements(self):
+		rng = np.random.default_rng(29)
+		for _ in range(50):
+			skyline = FloorSkyline(width=98.5)
+			placed = []
+			for _ in range(25):
+				length, width = float(rng.choice([40, 48, 33.5, 20.3])), float(rng.choice([40, 48, 30.25, 17.1]))
+				x, y, rotated = skyline.find_position(length, width)
+				if rotated:
+					length, width = width, length
+				self.assertTrue(0 <= y and y + width <= 98.5)
+				for x0, y0, l0, w0 in placed:
+					self.assertFalse(x < x0 + l0 and x + length > x0 and y < y0 + w0 and y + width > y0)
+				placed += [(x, y, length, width)]
+				skyline.place(x, y, length, width)
+				segments = skyline.get_segments()
+				self.assertTrue(all([start < end for start, end, height in segments]))
+				for x0, y0, l0, w0 in placed:
+					for start, end, height in segments:
+						if start < y0 + w0 and end > y0:
+							self.assertGreaterEqual(height, x0 + l0)
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,479 @@
+import unittest
+from ytl.logistics_objects import Piece, PieceGroup, PieceTable, Shipment, Trailer
+from ytl.utils import intervals_overlap, interval_is_subset, get_current_trailer_configuration, restore_trailer_configuration
+from ytl.optimizer_functions import optimize_shipment_arrangement
+from ytl.optimizer_functions.shipment_arrangement.greedy import loss_function, score_candidate_positions
+from ytl.optimizer_functions.piece_arrangement.greedy import StackProfile, greedy_stack_pieces, greedy_stack_piece_groups
+from ytl.py3dbp import NoRotateBin
+import numpy as np
+import copy
+import pickle
+
+
+def make_shipment(length, width, height=30, position=(0, 0, 0)):
+	piece = Piece(
+		packing='PALLET',
+		stack_limit=1,
+		length=length,
+		width=width,
+		height=height,
+		dimension_unit_of_measure='IN',
+		weight=100,
+		weight_unit_of_measure='LBS',
+	)
+	shipment = Shipment(pieces=piece)
+	shipment.position = np.array(position, dtype=float)
+	return shipment
+
+
+def make_trailer(shipments, length=636, width=98.5, height=108, spatial_index=None, occupancy_grid=None):
+	return Trailer(
+		shipments=shipments,
+		length=length,
+		width=width,
+		height=height,
+		dimension_unit_of_measure='IN',
+		weight=0,
+		weight_unit_of_measure='LBS',
+		max_weight=42500,
+		spatial_index=spatial_index,
+		occupancy_grid=occupancy_grid,
+	)
+
+
+def pairwise_arrangement_is_valid(trailer):
+	trailer_boundaries = [[0, trailer.length], [0, trailer.width], [0, trailer.height]]
+	boundaries = [s.get_boundaries() for s in trailer.shipments]
+	for i, s_i in enumerate(boundaries):
+		if not all([interval_is_subset(s_i[k], trailer_boundaries[k]) for k in range(3)]):
+			return False
+		for s_j in boundaries[:i]:
+			if all([intervals_overlap(s_i[k], s_j[k]) for k in range(3)]):
+				return False
+	return True
+
+
+def random_trailer(rng, num_shipments=6, spatial_index=None):
+	shipments = [
+		make_shipment(
+			float(rng.choice([20, 33.5, 48])),
+			float(rng.choice([20, 30.5, 40])),
+			position=(rng.uniform(0, 500), rng.uniform(0, 60), 0),
+		)
+		for _ in range(num_shipments)
+	]
+	return make_trailer(shipments, spatial_index=spatial_index), shipments
+
+
+def stepwise_slide(shipment, trailer, delta):
+	count = 0
+	while trailer.arrangement_is_valid(shipment) and count < 1000:
+		shipment.move(delta)
+		count += 1
+	shipment.move(-delta)
+
+
+class ShipmentSlideTest(unittest.TestCase):
+	def test_slide_back_stops_at_obstacle(self):
+		blocker = make_shipment(40, 40, position=(0, 0, 0))
+		shipment = make_shipment(40, 40, position=(100.5, 10, 0))
+		trailer = make_trailer([blocker, shipment])
+		shipment.slide_back(trailer)
+		self.assertEqual(list(shipment.position), [40.5, 10, 0])
+		self.assertTrue(trailer.arrangement_is_valid())
+
+	def test_slide_matches_stepwise_slide(self):
+		rng = np.random.default_rng(7)
+		for _ in range(50):
+			trailer, shipments = random_trailer(rng)
+			for shipment in shipments:
+				for method, delta in [
+					('slide_back', np.array([-1, 0, 0])),
+					('slide_left', np.array([0, -1, 0])),
+					('slide_right', np.array([0, 1, 0])),
+				]:
+					start = shipment.position.copy()
+					stepwise_slide(shipment, trailer, delta)
+					expected = shipment.position.copy()
+					shipment.position = start.copy()
+					getattr(shipment, method)(trailer)
+					np.testing.assert_allclose(shipment.position, expected)
+					shipment.position = start
+
+
+class CachedBoundariesTest(unittest.TestCase):
+	def test_cache_invalidated_on_changes(self):
+		bottom = make_shipment(48, 40, height=30)
+		top = Piece(
+			packing='BOX', stack_limit=2, length=30, width=20, height=10,
+			dimension_unit_of_measure='IN', weight=10, weight_unit_of_measure='LBS',
+		)
+		np.testing.assert_allclose(bottom.get_boundaries(), [[0, 48], [0, 40], [0, 30]])
+		bottom.move(np.array([10, 5, 0]))
+		np.testing.assert_allclose(bottom.get_boundaries(), [[10, 58], [5, 45], [0, 30]])
+		bottom.stack(top)
+		np.testing.assert_allclose(bottom.get_boundaries(), [[10, 58], [5, 45], [0, 40]])
+		bottom.rotate()
+		np.testing.assert_allclose(bottom.get_local_boundaries(), [[0, 40], [0, 48], [0, 40]])
+		np.testing.assert_allclose(top.get_boundaries(), [[0, 20], [0, 30], [30, 40]])
+		bottom.remove_piece(top)
+		np.testing.assert_allclose(bottom.get_boundaries(), [[10, 50], [5, 53], [0, 30]])
+		bottom.position = np.array([0, 0, 0])
+		np.testing.assert_allclose(bottom.get_boundaries(), [[0, 40], [0, 48], [0, 30]])
+
+	def test_binpack_objects_built_on_use(self):
+		shipment = make_shipment(48, 40, height=30)
+		self.assertIsNone(shipment.pieces[0]._binpack_item)
+		shipment._update_binpack_item(height=1)
+		self.assertIsNone(shipment._binpack_item)
+		item = shipment.binpack_item
+		self.assertEqual((item.width, item.height, item.depth, item.weight), (40, 48, 1, 100))
+		self.assertIs(shipment.binpack_item, item)
+		trailer = make_trailer([shipment])
+		trailer._update_binpack_bin(height=1.5, length=100, allow_rotations=False)
+		self.assertEqual((trailer.binpack_bin.height, trailer.binpack_bin.depth), (100, 1.5))
+		self.assertIsInstance(trailer.binpack_bin, NoRotateBin)
+
+	def test_slotted_objects_keep_positions_as_values(self):
+		shipment = make_shipment(48, 40, position=(10, 5.5, 0))
+		self.assertFalse(hasattr(shipment, '__dict__') or hasattr(shipment.pieces[0], '__dict__'))
+		position = shipment.position
+		with self.assertRaises(ValueError):
+			position[0] = 100
+		self.assertIs(shipment.position, position)
+		np.testing.assert_allclose(shipment.position, [10, 5.5, 0])
+		for other in [copy.copy(shipment), copy.deepcopy(shipment), pickle.loads(pickle.dumps(shipment))]:
+			np.testing.assert_allclose(other.get_boundaries(), shipment.get_boundaries())
+			with self.assertRaises(ValueError):
+				other.position[0] = 100
+			self.assertEqual(other.pieces[0].packing, 'PALLET')
+
+
+class TrailerBoundaryStoreTest(unittest.TestCase):
+	def test_store_follows_shipment_changes(self):
+		rng = np.random.default_rng(11)
+		trailer, shipments = random_trailer(rng)
+		shipments[0].move(np.array([5, 0, 0]))
+		shipments[1].rotate()
+		shipments[2].position = np.array([300, 20, 0])
+		trailer.remove_shipment(shipments[3])
+		trailer.add_shipment(make_shipment(40, 48, position=(200, 0, 0)))
+		np.testing.assert_allclose(
+			trailer.get_shipment_boundaries(),
+			np.array([s.get_boundaries() for s in trailer.shipments]),
+		)
+
+	def test_validation_matches_pairwise_validation(self):
+		rng = np.random.default_rng(3)
+		for i in range(150):
+			spatial_index = [None, 'UNIFORM_GRID', 'LENGTH_INTERVAL'][i % 3]
+			trailer, shipments = random_trailer(rng, spatial_index=spatial_index)
+			shipments[0].move(np.array([-10, 5, 0]))
+			trailer.remove_shipment(shipments.pop())
+			self.assertEqual(trailer.arrangement_is_valid(), pairwise_arrangement_is_valid(trailer))
+			for shipment in shipments:
+				s_i = shipment.get_boundaries()
+				trailer_boundaries = [[0, trailer.length], [0, trailer.width], [0, trailer.height]]
+				expected = all([interval_is_subset(s_i[k], trailer_boundaries[k]) for k in range(3)]) and not any([
+					all([intervals_overlap(s_i[k], s.get_boundaries()[k]) for k in range(3)])
+					for s in shipments if s is not shipment
+				])
+				self.assertEqual(trailer.arrangement_is_valid(shipment), expected)
+
+	def test_arrangement_violations(self):
+		a = make_shipment(40, 40, position=(0, 0, 0))
+		b = make_shipment(40, 40, position=(20, 20, 0))
+		c = make_shipment(40, 40, position=(100, 80, 0))
+		d = make_shipment(40, 40, position=(40, 0, 0))
+		trailer = make_trailer([a, b, c, d])
+		violations = trailer.get_arrangement_violations()
+		self.assertEqual(violations['outside_trailer'], [c])
+		self.assertEqual(violations['overlapping_pairs'], [(a, b), (b, d)])
+		self.assertFalse(trailer.arrangement_is_valid())
+
+	def test_store_survives_copies(self):
+		rng = np.random.default_rng(13)
+		for spatial_index in [None, 'UNIFORM_GRID', 'LENGTH_INTERVAL']:
+			trailer, _ = random_trailer(rng, spatial_index=spatial_index)
+			for trailer_copy in [copy.deepcopy(trailer), pickle.loads(pickle.dumps(trailer))]:
+				shipments = trailer_copy.shipments
+				shipments[0].move(np.array([7, 0, 0]))
+				shipments[1].rotate()
+				trailer_copy.remove_shipment(shipments[2])
+				np.testing.assert_allclose(
+					trailer_copy.get_shipment_boundaries(),
+					np.array([s.get_boundaries() for s in trailer_copy.shipments]),
+				)
+				self.assertEqual(trailer_copy.arrangement_is_valid(), pairwise_arrangement_is_valid(trailer_copy))
+				for shipment in trailer_copy.shipments:
+					others = [s for s in trailer_copy.shipments if s is not shipment]
+					expected = not any([
+						all([intervals_overlap(shipment.get_boundaries()[k], s.get_boundaries()[k]) for k in range(3)])
+						for s in others
+					])
+					self.assertEqual(trailer_copy.arrangement_is_valid(shipment), expected and bool(trailer_copy._in_trailer(shipment.get_boundaries())))
+
+	def test_configuration_snapshot_restores_store(self):
+		rng = np.random.default_rng(29)
+		for spatial_index, occupancy_grid in [(None, None), ('UNIFORM_GRID', None), (None, 2)]:
+			trailer, shipments = random_trailer(rng, spatial_index=spatial_index)
+			if occupancy_grid is not None:
+				trailer.set_occupancy_grid(occupancy_grid)
+			expected = [(tuple(s.position), s.is_rotated) for s in shipments]
+			expected_boundaries = {id(s) : s.get_boundaries().copy() for s in shipments}
+			snapshot = get_current_trailer_configuration(trailer)
+			values = snapshot.values
+			# Snapshots hold values, not the shipments' positions
+			shipments[0].move(np.array([5, 0, 0]))
+			shipments[1].rotate()
+			trailer.shipments = trailer.shipments[::-1]
+			self.assertEqual(tuple(snapshot.positions[0]), expected[0][0])
+			restore_trailer_configuration(snapshot)
+			self.assertEqual([(tuple(s.position), s.is_rotated) for s in shipments], expected)
+			for s in trailer.shipments:
+				np.testing.assert_array_equal(trailer.get_shipment_boundaries(s), expected_boundaries[id(s)])
+				np.testing.assert_array_equal(s.get_boundaries(), expected_boundaries[id(s)])
+			self.assertEqual(trailer.get_front_extent(), max([b[0, 1] for b in expected_boundaries.values()]))
+			self.assertEqual(trailer.arrangement_is_valid(), pairwise_arrangement_is_valid(trailer))
+			for shipment in trailer.shipments:
+				others = [s for s in trailer.shipments if s is not shipment]
+				overlaps = any([
+					all([intervals_overlap(shipment.get_boundaries()[k], s.get_boundaries()[k]) for k in range(3)])
+					for s in others
+				])
+				self.assertEqual(trailer.arrangement_is_valid(shipment), not overlaps and bool(trailer._in_trailer(shipment.get_boundaries())))
+			# Capturing again reuses the snapshot array
+			self.assertIs(snapshot.capture().values, values)
+
+	def test_front_extent_follows_shipment_changes(self):
+		rng = np.random.default_rng(23)
+		trailer, shipments = random_trailer(rng, num_shipments=8)
+		for i in range(300):
+			action = rng.integers(5)
+			if action == 0 and len(trailer.shipments) > 1:
+				trailer.remove_shipment(trailer.shipments[rng.integers(len(trailer.shipments))])
+			elif action == 1:
+				trailer.add_shipment(make_shipment(40, 30.5, position=(rng.uniform(0, 500), 0, 0)))
+			elif action == 2:
+				trailer.shipments[rng.integers(len(trailer.shipments))].rotate()
+			elif action == 3 and i % 50 == 0:
+				trailer = copy.deepcopy(trailer)
+			else:
+				trailer.shipments[rng.integers(len(trailer.shipments))].move(np.array([rng.uniform(-80, 80), 0, 0]))
+			expected = max([s.position[0] + s.length for s in trailer.shipments])
+			self.assertEqual(trailer.get_front_extent(), expected)
+			self.assertEqual(trailer.get_front_shipment().get_boundaries()[0, 1], expected)
+		trailer.shipments = []
+		self.assertEqual(trailer.get_front_extent(), -np.inf)
+		self.assertIsNone(trailer.get_front_shipment())
+
+	def test_occupancy_grid_matches_exact_geometry(self):
+		rng = np.random.default_rng(31)
+		for i in range(60):
+			shipments = [
+				make_shipment(
+					float(rng.choice([24, 36, 48, 33.5])),
+					float(rng.choice([24, 40, 30.5])),
+					position=(2 * rng.integers(0, 60), 2 * rng.integers(0, 30), 0),
+				)
+				for _ in range(8)
+			]
+			exact = make_trailer(shipments)
+			expected = [
+				(exact.arrangement_is_valid(s), [exact.get_max_displacement(s, axis, direction) for axis in range(2) for direction in (-1, 1)])
+				for s in shipments
+			]
+			for resolution in [1, 2, 6]:
+				exact.set_occupancy_grid(resolution)
+				result = [
+					(exact.arrangement_is_valid(s), [exact.get_max_displacement(s, axis, direction) for axis in range(2) for direction in (-1, 1)])
+					for s in shipments
+				]
+				candidates = np.array([s.get_boundaries() for s in shipments])
+				candidate = exact.remove_shipment(shipments[0])
+				self.assertEqual(
+					list(exact.placements_overlap(candidates)),
+					[bool(np.any([np.all([intervals_overlap(c[k], s.get_boundaries()[k]) for k in range(3)]) for s in shipments[1:]])) for c in candidates],
+				)
+				exact.add_shipment(candidate)
+				shipments = shipments[1:] + [candidate]
+				expected = expected[1:] + expected[:1]
+				for (valid, distances), (grid_valid, grid_distances) in zip(expected, result[1:] + result[:1]):
+					self.assertEqual(valid, grid_valid)
+					if valid:
+						self.assertEqual(distances, grid_distances)
+				exact.set_occupancy_grid(None)
+
+	def test_occupancy_grid_first_fit(self):
+		trailer = make_trailer([make_shipment(48, 40, position=(0, 0, 0)), make_shipment(48, 40, position=(0, 48, 0))], occupancy_grid=2)
+		self.assertEqual(trailer.occupancy_grid.first_fit(48, 8), (0, 40))
+		self.assertEqual(trailer.occupancy_grid.first_fit(48, 12), (48, 0))
+
+
+class GreedyStackTest(unittest.TestCase):
+	def random_piece(self, rng):
+		return Piece(
+			packing=str(rng.choice(['PALLET', 'BOX'])),
+			stack_limit=int(rng.choice([1, 2, 3, 5])),
+			length=float(rng.choice([12, 20, 40, 48])),
+			width=float(rng.choice([12, 20, 40, 30.25])),
+			height=float(rng.choice([10, 20, 30.5])),
+			dimension_unit_of_measure='IN',
+			weight=10,
+			weight_unit_of_measure='LBS',
+		)
+
+	def test_stack_profile_matches_shipment(self):
+		rng = np.random.default_rng(37)
+		for _ in range(200):
+			bottom = self.random_piece(rng)
+			shipment = Shipment(pieces=bottom)
+			profile = StackProfile(bottom)
+			for _ in range(6):
+				piece = self.random_piece(rng)
+				can_stack = shipment.can_stack(piece=piece, trailer_height=100)
+				self.assertEqual(profile.can_stack(piece=piece, trailer_height=100), can_stack)
+				if can_stack:
+					shipment.stack(piece)
+					profile.add(piece)
+
+	def test_stacks_respect_limits(self):
+		rng = np.random.default_rng(41)
+		pieces = [self.random_piece(rng) for _ in range(150)]
+		shipments = greedy_stack_pieces(pieces, trailer_height=100)
+		self.assertEqual(sorted([id(p) for s in shipments for p in s.pieces]), sorted([id(p) for p in pieces]))
+		for shipment in shipments:
+			self.assertLessEqual(shipment.height, 100)
+			self.assertLessEqual(len(shipment.pieces), max(1, min([p.stack_limit for p in shipment.pieces])))
+			for bottom, top in zip(shipment.pieces[:-1], shipment.pieces[1:]):
+				self.assertLessEqual(top.length, bottom.length)
+				self.assertLessEqual(top.width, bottom.width)
+
+	def test_piece_groups_match_pieces(self):
+		rng = np.random.default_rng(43)
+		for allow_rotations in [True, False]:
+			groups = [
+				PieceGroup(
+					count=int(rng.integers(1, 30)),
+					index=i,
+					packing=str(rng.choice(['PALLET', 'BOX'])),
+					stack_limit=int(rng.choice([1, 2, 3, 5])),
+					length=float(rng.choice([20, 40, 48])),
+					width=float(rng.choice([20, 40, 48])),
+					height=float(rng.choice([10, 20, 30.5])),
+					dimension_unit_of_measure='IN',
+					weight=10,
+					weight_unit_of_measure='LBS',
+				)
+				for i in range(12)
+			]
+			pieces = [piece for group in groups for piece in group.make_pieces()]
+			shipments = greedy_stack_pieces(pieces, trailer_height=100, allow_rotations=allow_rotations)
+			group_shipments = greedy_stack_piece_groups(groups, trailer_height=100, allow_rotations=allow_rotations)
+			self.assertEqual(len(group_shipments), len(shipments))
+			self.assertEqual(len(set([id(p) for s in group_shipments for p in s.pieces])), len(pieces))
+			for shipment, group_shipment in zip(shipments, group_shipments):
+				self.assertEqual(
+					[(p.name, p.is_rotated, tuple(p.position)) for p in group_shipment.pieces],
+					[(p.name, p.is_rotated, tuple(p.position)) for p in shipment.pieces],
+				)
+				self.assertEqual(group_shipment.get_boundaries().tolist(), shipment.get_boundaries().tolist())
+
+	def test_tie_order(self):
+		# Pieces with the same footprint are taken in reverse order, as in the original sort
+		group = PieceGroup(count=3, packing='PALLET', stack_limit=2, length=48, width=40, height=40, dimension_unit_of_measure='IN', weight=10, weight_unit_of_measure='LBS')
+		expected = [['Shipment 1:  Piece 3', 'Shipment 1:  Piece 2'], ['Shipment 1:  Piece 1']]
+		self.assertEqual([[p.name for p in s.pieces] for s in greedy_stack_pieces(group.make_pieces(), trailer_height=100)], expected)
+		self.assertEqual([[p.name for p in s.pieces] for s in greedy_stack_piece_groups([group], trailer_height=100)], expected)
+
+
+class PieceTableTest(unittest.TestCase):
+	def make_stacked_trailer(self):
+		shipments = []
+		for i, (length, width) in enumerate([(48, 40), (40, 48), (36, 30)]):
+			shipment = make_shipment(length, width, height=30)
+			shipment.stack(Piece(
+				packing='BOX', stack_limit=2, length=30, width=20, height=10,
+				dimension_unit_of_measure='IN', weight=10, weight_unit_of_measure='LBS', name=f'top {i}',
+			))
+			shipment.position = np.array([100 - 50 * i, 50 * (i % 2), 0])
+			shipments += [shipment]
+		shipments[1].rotate()
+		return make_trailer(shipments)
+
+	def test_views_match_objects(self):
+		trailer = self.make_stacked_trailer()
+		table = trailer.get_piece_table()
+		self.assertEqual(len(table), 6)
+		self.assertEqual(PieceTable.from_shipments(trailer.shipments).get_load_order(), table.get_load_order())
+		for j, shipment in enumerate(trailer.shipments):
+			view = table.get_shipment(j)
+			self.assertEqual((view.length, view.width, view.height, view.weight), (shipment.length, shipment.width, shipment.height, shipment.weight))
+			np.testing.assert_allclose(view.get_boundaries(), shipment.get_boundaries())
+			for piece, piece_view in zip(shipment.pieces, view.pieces):
+				self.assertEqual(
+					(piece_view.name, piece_view.length, piece_view.width, piece_view.packing, piece_view.is_rotated),
+					(piece.name, piece.length, piece.width, piece.packing, piece.is_rotated),
+				)
+				np.testing.assert_allclose(piece_view.get_boundaries(), piece.get_boundaries())
+
+	def test_shipment_quantities_are_cached(self):
+		trailer = self.make_stacked_trailer()
+		table = trailer.get_piece_table()
+		self.assertIs(table.get_shipment_dims(), table.get_shipment_dims())
+		self.assertEqual(table.get_shipment(0).height, 40)
+		table.height = table.height * 2
+		self.assertEqual(table.get_shipment(0).height, 60)
+		table.weight[:] = 1
+		table.changed()
+		self.assertEqual(table.get_shipment(0).weight, 2)
+
+	def test_load_order_and_validation(self):
+		trailer = self.make_stacked_trailer()
+		load_order = trailer.get_load_order()
+		self.assertEqual([load_order[i]['name'] for i in range(1, 7)], [None, 'top 2', None, 'top 1', None, 'top 0'])
+		self.assertEqual(load_order[2]['position'], [0.0, 0.0, 30.0])
+		self.assertTrue(load_order[2]['piece_is_stacked'])
+		table = trailer.get_piece_table()
+		self.assertTrue(table.arrangement_is_valid([[0, trailer.length], [0, trailer.width], [0, trailer.height]]))
+		self.assertFalse(table.arrangement_is_valid([[0, 120], [0, trailer.width], [0, trailer.height]]))
+		trailer.shipments[0].position = np.array([60, 50, 0])
+		table = trailer.get_piece_table()
+		self.assertEqual(table.get_overlapping_pieces().tolist(), [[0, 2], [1, 3]])
+		self.assertFalse(table.arrangement_is_valid())
+
+
+class GreedyLoadTest(unittest.TestCase):
+	def test_batched_scores_match_loss_function(self):
+		rng = np.random.default_rng(19)
+		for _ in range(30):
+			trailer, shipments = random_trailer(rng)
+			shipment = shipments[-1]
+			trailer.remove_shipment(shipment)
+			positions = np.column_stack([rng.uniform(-10, 600, 12), rng.uniform(-10, 80, 12), np.zeros(12)])
+			rotated = rng.random(12) < .5
+			batch_loss = score_candidate_positions(trailer, shipment, positions, rotated)
+			trailer.add_shipment(shipment)
+			for position, rot, loss in zip(positions, rotated, batch_loss):
+				if rot:
+					shipment.rotate()
+				shipment.position = position
+				self.assertEqual(loss_function(trailer, shipment), loss)
+				if rot:
+					shipment.rotate()
+
+	def test_parallel_greedy_load_is_seeded(self):
+		arrangements = []
+		for executor in ['process', 'thread', 'thread']:
+			rng = np.random.default_rng(17)
+			shipments = [make_shipment(float(rng.choice([40, 48, 33.5])), float(rng.choice([40, 30.25]))) for _ in range(12)]
+			trailer = make_trailer(shipments)
+			optimize_shipment_arrangement(trailer, 'GREEDY_LOAD', max_iter=6, workers=3, executor=executor, seed=4)
+			self.assertTrue(trailer.arrangement_is_valid())
+			arrangements += [[(tuple(s.position), s.is_rotated) for s in shipments]]
+		self.assertEqual(arrangements[0], arrangements[1])
+		self.assertEqual(arrangements[1], arrangements[2])
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -78,4 +78,30 @@ SHIPMENT_ARRANGEMENT_ALGORITHM_TEST_OPTIONS = [
 			'timeout' : 5,
 		},
 	],
+	[
+		{
+			'algorithm' : 'MAXRECTS_PACK',
+			'max_iter' : None,
+			'timeout' : None,
+		},
+		{
+			'algorithm' : 'SLIDE_BACK',
+			'max_iter' : None,
+			'timeout' : None,
+		},
+	],
+	[
+		{
+			'algorithm' : 'SKYLINE_PACK',
+			'max_iter' : 3,
+			'timeout' : 5,
+		},
+	],
+	[
+		{
+			'algorithm' : 'SKYLINE_LOAD',
+			'max_iter' : 3,
+			'timeout' : 5,
+		},
+	],
 ]
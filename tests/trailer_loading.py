@@ -1,9 +1,12 @@
 
 import unittest
+import time
 from ytl.generator import generate_random_trailer_load_plan
 from ytl import (
     PiecesTooLongForServiceException, NoPiecesException,
 )
+from ytl.services import optimize_trailer_load_plan
+from ytl.services.trailer_load import get_portfolio_pool
 from ytl.standard_logistic_dims import STANDARD_TRAILER_DIMS
 from . import test_params
 
@@ -217,6 +220,67 @@ class TrailerLinearFeetTest(unittest.TestCase):
 								'Rotated a piece when rotations are not allowed'
 							)
 
+	def test_shipment_optimization_portfolio(self):
+		shipment_list = [
+			{
+				'length' : length, 'width' : width, 'height' : 40, 'weight' : 500,
+				'packing' : 'PALLET', 'stack_limit' : 1, 'num_pieces' : num_pieces,
+				'dimension_unit_of_measure' : 'IN', 'weight_unit_of_measure' : 'LBS',
+			}
+			for length,width,num_pieces in [(48,40,5),(40,40,3),(36,30,4),(48,48,2)]
+		]
+		trailer_dims = STANDARD_TRAILER_DIMS[0]
+		portfolio = [
+			[{'algorithm' : 'NO_STACK_BIN_PACK'},{'algorithm' : 'SLIDE_BACK','max_iter' : 2}],
+			[{'algorithm' : 'SKYLINE_LOAD'}],
+			[{'algorithm' : 'MAXRECTS_PACK'}],
+		]
+		chain_linear_feet = [
+			optimize_trailer_load_plan(shipment_list,trailer_dims,shipment_optimization_ls=chain).get_linear_feet()
+			for chain in portfolio
+		]
+		for executor in ['process','thread']:
+			trailer = optimize_trailer_load_plan(
+				shipment_list,
+				trailer_dims,
+				shipment_optimization_portfolio=portfolio,
+				portfolio_workers=2,
+				portfolio_executor=executor,
+			)
+			self.assertTrue(trailer.arrangement_is_valid())
+			self.assertEqual(trailer.get_linear_feet(),min(chain_linear_feet))
+			self.assertGreaterEqual(trailer.get_linear_feet(),trailer.get_linear_feet_lower_bound())
+			self.assertEqual(len(trailer.get_summary().get('load_order')),14)
+
+		# Shipments as wide as the trailer can only be loaded end to end, every arrangement reaches the lower bound
+		shipment_list = [dict(shipment_list[0],width=trailer_dims.get('inner_width'),num_pieces=3)]
+		trailer = optimize_trailer_load_plan(
+			shipment_list,
+			trailer_dims,
+			allow_rotations=False,
+			shipment_optimization_portfolio=portfolio,
+			stop_at_lower_bound=True,
+		)
+		self.assertTrue(trailer.arrangement_is_valid())
+		self.assertEqual(trailer.get_linear_feet(),trailer.get_linear_feet_lower_bound(allow_rotations=False))
+
+		# A chain of many greedy iterations, taking over a minute, is stopped once the other chain reaches the lower bound
+		slow_portfolio = [[{'algorithm' : 'GREEDY_LOAD','max_iter' : 100000}],[{'algorithm' : 'NO_STACK_BIN_PACK'}]]
+		for executor in ['process','thread']:
+			start = time.perf_counter()
+			trailer = optimize_trailer_load_plan(
+				shipment_list,
+				trailer_dims,
+				allow_rotations=False,
+				shipment_optimization_portfolio=slow_portfolio,
+				portfolio_workers=2,
+				portfolio_executor=executor,
+				stop_at_lower_bound=True,
+			)
+			self.assertLess(time.perf_counter() - start,30)
+			self.assertEqual(trailer.get_linear_feet(),trailer.get_linear_feet_lower_bound(allow_rotations=False))
+			self.assertIs(get_portfolio_pool(executor,2),get_portfolio_pool(executor,2))
+
 
 if __name__ == '__main__':
 	unittest.main()
@@ -1,7 +1,14 @@
 
 import unittest
+import tempfile
+import contextlib
+import json
+import io
+import os
 from ytl.generator import generate_random_trailer_load_plan_wrapper
+from ytl.services import RequestCache, SQLitePlanStore, optimize_trailer_load_plan_wrapper, optimize_trailer_load_plans_batch
 from ytl.standard_logistic_dims import STANDARD_TRAILER_DIMS
+from ytl.__main__ import main
 from . import test_params
 
 class TrailerLinearFeetTest(unittest.TestCase):
@@ -204,6 +211,165 @@ class TrailerLinearFeetTest(unittest.TestCase):
 								'Rotated a piece when rotations are not allowed'
 							)
 
+	def test_request_cache(self):
+		shipment_list = [
+			{'length' : 48, 'width' : 40, 'height' : 40, 'weight' : 500, 'packing' : 'PALLET', 'stack_limit' : 2, 'num_pieces' : 5},
+			{'length' : 40, 'width' : 40, 'height' : 30, 'weight' : 300, 'packing' : 'BOX', 'stack_limit' : 3, 'num_pieces' : 4},
+			{'length' : 48, 'width' : 40, 'height' : 40, 'weight' : 500, 'packing' : 'PALLET', 'stack_limit' : 2, 'num_pieces' : 2},
+			{'length' : 36, 'width' : 30, 'height' : 20, 'weight' : 3000, 'packing' : 'PALLET', 'stack_limit' : 1, 'num_pieces' : 2},
+		]
+		request_data = {'equipment_code' : 'DV_53', 'shipment_list' : shipment_list, 'seed' : 7}
+		cache = RequestCache(max_size=2)
+		status_code, response_data = optimize_trailer_load_plan_wrapper(request_data, cache=cache)
+		self.assertEqual(status_code, 200)
+		self.assertEqual(optimize_trailer_load_plan_wrapper(request_data, cache=RequestCache()), (200, response_data))
+		# Hits are copies, changing one does not change the cached load plan
+		hit_response_data = optimize_trailer_load_plan_wrapper(request_data, cache=cache)[1]
+		self.assertEqual(hit_response_data, response_data)
+		hit_response_data['linear_feet'] = -1
+		next(iter(hit_response_data['load_order'].values()))['position'][0] = -1
+		self.assertEqual(optimize_trailer_load_plan_wrapper(request_data, cache=cache)[1], response_data)
+		self.assertNotIn('dimension_unit_of_measure', shipment_list[0])
+
+		# Same pieces in another order and grouping, named after the request's own shipment list
+		reordered_request_data = dict(request_data, shipment_list=[
+			shipment_list[3], shipment_list[1], dict(shipment_list[0], num_pieces=7),
+		])
+		status_code, reordered_response_data = optimize_trailer_load_plan_wrapper(reordered_request_data, cache=cache)
+		self.assertEqual(status_code, 200)
+		self.assertEqual(reordered_response_data, optimize_trailer_load_plan_wrapper(reordered_request_data, cache=RequestCache())[1])
+		self.assertEqual(
+			sorted([p['name'] for p in reordered_response_data['load_order'].values()]),
+			sorted([f'Shipment {i+1}:  Piece {j+1}' for i, n in enumerate([2, 4, 7]) for j in range(n)]),
+		)
+		self.assertEqual(cache.get_stats()['hits'], 3)
+		self.assertEqual(cache.get_stats()['misses'], 1)
+
+		# Seed and algorithm settings are part of the key, the least recently used request is evicted
+		for seed in [8, 9]:
+			self.assertEqual(optimize_trailer_load_plan_wrapper(dict(request_data, seed=seed), cache=cache)[0], 200)
+		self.assertEqual(cache.get_stats()['evictions'], 1)
+		optimize_trailer_load_plan_wrapper(request_data, cache=cache)
+		self.assertEqual(cache.get_stats()['misses'], 4)
+
+		cache = RequestCache(ttl=0)
+		for _ in range(2):
+			optimize_trailer_load_plan_wrapper(request_data, cache=cache)
+		self.assertEqual((cache.get_stats()['hits'], cache.get_stats()['expirations']), (0, 1))
+
+		# Invalid requests are not cached
+		self.assertEqual(optimize_trailer_load_plan_wrapper(dict(request_data, shipment_list=[dict(shipment_list[0], length=-1)]), cache=cache)[0], 400)
+		self.assertEqual(len(cache), 1)
+
+	def test_plan_store(self):
+		shipment_list = [
+			{'length' : 48, 'width' : 40, 'height' : 40, 'weight' : 500, 'packing' : 'PALLET', 'stack_limit' : 2, 'num_pieces' : 5},
+			{'length' : 40, 'width' : 40, 'height' : 30, 'weight' : 300, 'packing' : 'BOX', 'stack_limit' : 3, 'num_pieces' : 4},
+		]
+		request_data = {'equipment_code' : 'DV_53', 'shipment_list' : shipment_list, 'seed' : 7}
+		with tempfile.TemporaryDirectory() as directory:
+			path = os.path.join(directory, 'plans.db')
+			store = SQLitePlanStore(path)
+			status_code, response_data = optimize_trailer_load_plan_wrapper(request_data, cache=RequestCache(store=store))
+			self.assertEqual(status_code, 200)
+			store.close()
+
+			# A fresh cache, as in a restarted or other worker process, is served from the store
+			cache = RequestCache(store=SQLitePlanStore(path))
+			self.assertEqual(optimize_trailer_load_plan_wrapper(request_data, cache=cache), (200, response_data))
+			self.assertEqual((cache.get_stats()['store_hits'], cache.get_stats()['misses']), (1, 0))
+			cache.store.close()
+
+			# Stored plans expire with the cache's time to live
+			cache = RequestCache(ttl=0, store=SQLitePlanStore(path))
+			cache.put('k', response_data)
+			self.assertIsNone(cache.get('k'))
+			self.assertEqual((cache.get_stats()['store_hits'], cache.get_stats()['expirations'], len(cache)), (0, 1, 0))
+			cache.store.close()
+			cache = RequestCache(ttl=3600, store=SQLitePlanStore(path))
+			self.assertEqual(cache.get('k')['response'], response_data)
+			self.assertEqual(cache.get_stats()['store_hits'], 1)
+			cache.store.close()
+
+			# Plans stamped with another version are discarded
+			store = SQLitePlanStore(path, version='other')
+			self.assertEqual(len(store), 0)
+			store.close()
+
+			# Least recently used plans are pruned to fit the size cap
+			store = SQLitePlanStore(path, max_bytes=1000)
+			for i in range(20):
+				store.put(str(i), {'plan' : 'x' * i + os.urandom(50).hex()})
+			self.assertLessEqual(store.get_stats()['total_bytes'], 1000)
+			self.assertIsNone(store.get('0'))
+			self.assertIsNotNone(store.get('19'))
+			store.close()
+
+	def test_batch(self):
+		requests = [
+			{
+				'equipment_code' : 'DV_53',
+				'shipment_list' : [{'length' : 48, 'width' : 40, 'height' : 40, 'weight' : 500, 'packing' : 'PALLET', 'stack_limit' : 2, 'num_pieces' : i % 5 + 1}],
+				'seed' : i,
+			}
+			for i in range(12)
+		]
+		requests[3] = {'equipment_code' : 'DV_53', 'shipment_list' : []}
+		expected = [optimize_trailer_load_plan_wrapper(request_data) for request_data in requests]
+		for kwargs in [{'workers' : 1}, {'workers' : 2, 'chunksize' : 3}, {'workers' : 2, 'ordered' : False, 'max_in_flight' : 1, 'cache_size' : 4}, {'workers' : 3, 'executor' : 'thread', 'cache_size' : 4}]:
+			results = list(optimize_trailer_load_plans_batch(iter(requests), **kwargs))
+			if kwargs.get('ordered', True):
+				self.assertEqual([idx for idx, _, _, _ in results], list(range(len(requests))))
+			self.assertEqual(
+				[(status_code, response_data) for _, status_code, response_data, _ in sorted(results, key=lambda result : result[0])],
+				expected,
+			)
+			self.assertTrue(all([seconds >= 0 for _, _, _, seconds in results]))
+		self.assertEqual(expected[3][0], 400)
+		with self.assertRaises(NotImplementedError):
+			optimize_trailer_load_plans_batch(requests, executor='unknown')
+
+	def test_command_line_batch(self):
+		requests = [
+			{
+				'equipment_code' : 'DV_53',
+				'shipment_list' : [{'length' : 48, 'width' : 40, 'height' : 40, 'weight' : 500, 'packing' : 'PALLET', 'stack_limit' : 2, 'num_pieces' : i + 1}],
+				'seed' : i,
+			}
+			for i in range(4)
+		]
+		lines = [json.dumps(requests[0]), '', 'not json', json.dumps(requests[1]), json.dumps(requests[2]), json.dumps(requests[3])]
+		with tempfile.TemporaryDirectory() as directory:
+			input_path = os.path.join(directory, 'requests.jsonl')
+			output_path = os.path.join(directory, 'responses.jsonl')
+			with open(input_path, 'w') as f:
+				f.write('\n'.join(lines) + '\n')
+			report = io.StringIO()
+			with contextlib.redirect_stderr(report):
+				self.assertEqual(main([input_path, '--output', output_path, '--workers', '1']), 0)
+			report = json.loads(report.getvalue())
+			self.assertEqual((report['records'], report['status_codes'], report['next_offset']), (5, {'200' : 4, '400' : 1}, 6))
+			with open(output_path) as f:
+				records = [json.loads(line) for line in f]
+			self.assertEqual([record['index'] for record in records], [0, 2, 3, 4, 5])
+			self.assertEqual([record['status_code'] for record in records], [200, 400, 200, 200, 200])
+			self.assertEqual(records[0]['response'], optimize_trailer_load_plan_wrapper(requests[0])[1])
+			self.assertTrue(all([record['latency_ms'] >= 0 for record in records]))
+
+			# Resuming appends the remaining records, summaries leave out load orders
+			with open(output_path, 'w') as f:
+				f.write('\n'.join([json.dumps(record) for record in records[:3]]) + '\n')
+			report = io.StringIO()
+			with contextlib.redirect_stderr(report):
+				self.assertEqual(main([input_path, '--output', output_path, '--workers', '1', '--offset', '4', '--summary-only', '--store', os.path.join(directory, 'plans.db')]), 0)
+			report = json.loads(report.getvalue())
+			self.assertEqual((report['records'], report['next_offset']), (2, 6))
+			with open(output_path) as f:
+				resumed_records = [json.loads(line) for line in f]
+			self.assertEqual([record['index'] for record in resumed_records], [0, 2, 3, 4, 5])
+			self.assertNotIn('load_order', resumed_records[-1]['response'])
+			self.assertEqual(resumed_records[-1]['response']['linear_feet'], records[-1]['response']['linear_feet'])
+
 
 if __name__ == '__main__':
 	unittest.main()
@@ -1,4 +1,4 @@
-__version__ = '1.0.0'
+__version__ = '1.0.1'
 
 from .services.trailer_load import optimize_trailer_load_plan
 from .services.trailer_load_api import optimize_trailer_load_plan_wrapper
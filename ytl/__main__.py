@@ -0,0 +1,146 @@
+'''
+Batch Trailer Load Optimization from the Command Line
+
+Reads one request per line of a JSONL file, or stdin, and writes one
+response per line, in the order of the requests, e.g.
+
+	python -m ytl requests.jsonl --workers 8 --output responses.jsonl
+
+Each response record holds the `index` of the request line, its
+`status_code`, the `latency_ms` of the optimization, and the `response`.
+A throughput report is written to stderr at the end, with the offset to
+pass to `--offset` to resume after the last written record.
+'''
+from typing import Iterable, Dict
+from .services.batch import optimize_trailer_load_plans_batch
+from .services.plan_store import SQLitePlanStore
+from .defaults import DEFAULT_BATCH_CHUNKSIZE
+from itertools import islice
+import numpy as np
+import argparse
+import json
+import time
+import sys
+
+
+def get_argument_parser():
+	'''
+	Get Parser of the Command Line Arguments
+	'''
+	parser = argparse.ArgumentParser(prog='python -m ytl',description='Optimize trailer load plans of JSONL requests')
+	parser.add_argument('input',nargs='?',default='-',help='JSONL file of requests, stdin if - or omitted')
+	parser.add_argument('-o','--output',default='-',help='JSONL file of responses, stdout if - or omitted, appended to when resuming')
+	parser.add_argument('-w','--workers',type=int,default=None,help='Number of worker processes, the number of CPUs if omitted')
+	parser.add_argument('--chunksize',type=int,default=DEFAULT_BATCH_CHUNKSIZE,help='Number of requests sent to a worker at a time')
+	parser.add_argument('--max-in-flight',type=int,default=None,help='Maximum number of chunks submitted to the workers and not yet written')
+	parser.add_argument('--offset',type=int,default=0,help='Number of request lines to skip, to resume an interrupted run')
+	parser.add_argument('--summary-only',action='store_true',help='Write responses without load orders')
+	parser.add_argument('--cache-size',type=int,default=None,help='Maximum number of requests cached by each worker')
+	parser.add_argument('--store',default=None,help='SQLite file of load plans shared by the workers and runs')
+	return parser
+
+
+def read_requests(lines : Iterable[str], offset : int = 0, line_numbers : Dict = None):
+	'''
+	Read Requests from Lines of JSONL, Skipping Blank Lines and the First `offset` Lines
+
+	Lines that are not valid JSON are read as None, which the API
+	rejects as an invalid request.  The line number of each request is
+	added to `line_numbers`, keyed by the position of the request.
+	'''
+	i = 0
+	for line_number,line in enumerate(islice(lines,offset,None),offset):
+		if len(line.strip()) == 0:
+			continue
+		try:
+			request_data = json.loads(line)
+		except ValueError:
+			request_data = None
+		if line_numbers is not None:
+			line_numbers[i] = line_number
+		i += 1
+		yield request_data
+
+
+def get_summary_response(response_dict : Dict):
+	'''
+	Get Response without its Load Order, or the Echoed Request of Errors
+	'''
+	return {key : value for key,value in response_dict.items() if key not in ['load_order','request']}
+
+
+def get_throughput_report(status_codes : Dict, latencies, seconds : float, next_offset : int):
+	'''
+	Get Report of the Number of Records, Status Codes, Throughput, and Latency of a Run
+	'''
+	num_records = sum(status_codes.values())
+	latencies = np.array(latencies) * 1000
+	return {
+		'records' : num_records,
+		'status_codes' : {str(status_code) : count for status_code,count in sorted(status_codes.items())},
+		'seconds' : round(seconds,3),
+		'records_per_second' : round(num_records / seconds,3) if seconds > 0 else None,
+		'latency_ms' : {
+			'mean' : round(float(latencies.mean()),3),
+			'p50' : round(float(np.percentile(latencies,50)),3),
+			'p95' : round(float(np.percentile(latencies,95)),3),
+			'max' : round(float(latencies.max()),3),
+		} if num_records > 0 else None,
+		'next_offset' : next_offset,
+	}
+
+
+def main(argv=None):
+	'''
+	Run Requests of a JSONL File Through `optimize_trailer_load_plans_batch`, Writing JSONL Responses as they are Ready
+	'''
+	args = get_argument_parser().parse_args(argv)
+	input_file = sys.stdin if args.input == '-' else open(args.input)
+	output_file = sys.stdout if args.output == '-' else open(args.output,'a' if args.offset > 0 else 'w')
+	store = SQLitePlanStore(args.store) if args.store is not None else None
+	line_numbers = {}
+	status_codes = {}
+	latencies = []
+	next_offset = args.offset
+	start = time.perf_counter()
+	results = optimize_trailer_load_plans_batch(
+		read_requests(input_file,offset=args.offset,line_numbers=line_numbers),
+		workers=args.workers,
+		chunksize=args.chunksize,
+		max_in_flight=args.max_in_flight,
+		cache_size=args.cache_size,
+		store=store,
+	)
+	interrupted = False
+	try:
+		for idx,status_code,response_dict,seconds in results:
+			line_number = line_numbers.pop(idx)
+			if args.summary_only:
+				response_dict = get_summary_response(response_dict)
+			output_file.write(json.dumps({
+				'index' : line_number,
+				'status_code' : status_code,
+				'latency_ms' : round(seconds * 1000,3),
+				'response' : response_dict,
+			}) + '\n')
+			output_file.flush()
+			status_codes[status_code] = status_codes.get(status_code,0) + 1
+			latencies += [seconds]
+			next_offset = line_number + 1
+	except KeyboardInterrupt:
+		interrupted = True
+	finally:
+		results.close()
+		if input_file is not sys.stdin:
+			input_file.close()
+		if output_file is not sys.stdout:
+			output_file.close()
+		if store is not None:
+			store.close()
+	report = get_throughput_report(status_codes,latencies,time.perf_counter() - start,next_offset)
+	sys.stderr.write(json.dumps(report) + '\n')
+	return 130 if interrupted else 0
+
+
+if __name__ == '__main__':
+	sys.exit(main())
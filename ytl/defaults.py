@@ -1,6 +1,16 @@
 
 OVERWEIGHT_SHIPMENT_THRESHOLD = 2000
 DEFAULT_PIECE_ARRANGEMENT_ALGORITHM = 'GREEDY_STACK'
+DEFAULT_SPATIAL_INDEX = 'LENGTH_INTERVAL'
+SPATIAL_INDEX_SHIPMENT_THRESHOLD = 300
+DEFAULT_PORTFOLIO_EXECUTOR = 'process'
+DEFAULT_REQUEST_CACHE_SIZE = 1024
+REQUEST_CACHE_MAX_LAYOUTS = 16
+DEFAULT_PLAN_STORE_MAX_BYTES = 256 * 2**20
+PLAN_STORE_PRUNE_FRACTION = .9
+DEFAULT_BATCH_EXECUTOR = 'process'
+DEFAULT_BATCH_CHUNKSIZE = 1
+BATCH_IN_FLIGHT_PER_WORKER = 4
 DEFAULT_SHIPMENT_ARRANGEMENT_ALGORITHM = [
     {
         'algorithm' : 'NO_STACK_BIN_PACK',
@@ -1,7 +1,9 @@
 
 from .piece import Piece
+from .piece_group import PieceGroup
 from .shipment import Shipment
 from .trailer import Trailer
+from .piece_table import PieceTable, PieceView, ShipmentView
 
 '''
 OOP inheritance structure
@@ -11,6 +13,8 @@ LogisticsObject
 		Piece(ShippingObject) - Non-divisible items
 		Shipment(ShippingObject) - Collections/stacks of Piece objects, treated as single items to be arranged in Trailer
 	Trailer(LogisticsObject)
+PieceGroup - Count of identical Piece objects, made into pieces as shipments need them
+PieceTable - Columnar arrays of the pieces of a load, with read-only PieceView and ShipmentView rows
 '''
 
 
@@ -62,6 +62,13 @@ class LogisticsObject:
 	other objects to provide basic measurement and weight functionality.
 	'''
 
+	# Instances hold no __dict__, large loads keep tens of thousands of pieces in memory
+	__slots__ = (
+		'dimension_unit_of_measure','length_raw','width_raw','height_raw','length','width','height',
+		'weight_unit_of_measure','weight_raw','weight','_boundaries_cache','_x','_y','_z','_position','is_rotated',
+		'id','name','desc',
+	)
+
 	default_dimension_units = options.DimUomInches
 	default_volume_units = options.VolumeUomCubicFeet
 	default_weight_units = options.WeightUomPounds
@@ -72,6 +79,8 @@ class LogisticsObject:
 		assert weight_unit_of_measure in list(map(lambda x : x[0],WEIGHT_UNIT_OF_MEASURE_OPTIONS))
         
         # Set raw and normalized dimensions
+		# Raw values are made floats first, so normalized values share them when no conversion is needed
+		length,width,height,weight = float(length),float(width),float(height),float(weight)
 		self.dimension_unit_of_measure = dimension_unit_of_measure
 		self.length_raw = length
 		self.width_raw = width
@@ -89,7 +98,8 @@ class LogisticsObject:
         # Initialized position as 0,0,0
         # A frame of reference is required to interpret position attribute further
 		# The position vector is of the form (length,width,height)
-		self.position = np.array([0,0,0])
+		self._boundaries_cache = None
+		self.position = (0.,0.,0.)
 		self.set_var_types()
 		self.is_rotated = False
 
@@ -118,20 +128,59 @@ class LogisticsObject:
 			return VOLUME_CONVERTER[f'CUBIC_{self.default_dimension_units}'][self.default_volume_units](volume)
 		return VOLUME_CONVERTER[self.default_volume_units][units](volume)
 	
+	@property
+	def position(self):
+		'''
+		Position of the Object as a Read-Only Array, Reassign it to Move the Object
+		'''
+		# Positions are kept as three floats, the array is cached until the object moves
+		# Copied or unpickled arrays are writable again, and are rebuilt
+		position = self._position
+		if position is None or position.flags.writeable:
+			position = np.array((self._x,self._y,self._z))
+			position.setflags(write=False)
+			self._position = position
+		return position
+
+	@position.setter
+	def position(self,position):
+		self._set_position(position)
+		self._boundaries_changed()
+
+	def _set_position(self,position):
+		'''
+		Set Position and Clear Cached Boundaries, Without Notifying a Parent Object
+		'''
+		self._x,self._y,self._z = [float(p) for p in position]
+		self._position = None
+		self._boundaries_cache = None
+
+	def _boundaries_changed(self):
+		'''
+		Invalidate Cached Boundaries After the Object Moved, Rotated, or Changed Shape
+		'''
+		self._boundaries_cache = None
+
 	def get_boundaries(self):
 		'''
 		Get the Profile of the Shipping Object
+
+		Boundaries are cached until the object is moved or rotated, the
+		returned array is read-only.
 		'''
-		boundaries = np.array([
-			self.position[0],
-			self.position[0] + self.length,
-			self.position[1],
-			self.position[1] + self.width,
-			self.position[2],
-			self.position[2] + self.height,
-		])
-		boundaries.shape = (3,2)
-		return boundaries
+		if self._boundaries_cache is None:
+			boundaries = np.array([
+				self._x,
+				self._x + self.length,
+				self._y,
+				self._y + self.width,
+				self._z,
+				self._z + self.height,
+			])
+			boundaries.shape = (3,2)
+			boundaries.flags.writeable = False
+			self._boundaries_cache = boundaries
+		return self._boundaries_cache
 	
 	def rotate(self):
 		'''
@@ -144,6 +193,7 @@ class LogisticsObject:
 		self.length, self.width = self.width, self.length
 		self.length_raw, self.width_raw = self.width_raw, self.length_raw
 		self.is_rotated = not self.is_rotated
+		self._boundaries_changed()
 	
 	def get_weight(self,units=None):
 		'''
@@ -159,34 +209,47 @@ class ShippingObject(LogisticsObject):
 	Generalized Piece or Shipment that is Meant to be Moved Around Inside a Parent LogisticsObject
 	'''
 
+	__slots__ = ('_binpack_item_exists','_binpack_item','_binpack_item_kwargs')
+
 	def __init__(self,*args,**kwargs):
 		super(ShippingObject,self).__init__(*args,**kwargs)
 		self._binpack_item_exists = False
+		self._binpack_item = None
+
+	@property
+	def binpack_item(self):
+		'''
+		Bin Packing Object Associated to This Shipping Object, Built on First Use
+		'''
+		if self._binpack_item is None:
+			self._set_binpack_item()
+			kwargs = self._binpack_item_kwargs
+			self._binpack_item = Item(
+				name = kwargs.get('name',getattr(self,'name','Unnamed Shipping Object')),
+				width = kwargs.get('width',self.width), 
+				height = kwargs.get('length',self.length),
+				depth = kwargs.get('height',self.height),
+				weight = kwargs.get('weight',self.weight)
+			)
+		return self._binpack_item
 	
 	def _set_binpack_item(self,**kwargs):
 		'''
-		Create a Bin Packing Object Associated to This Shipping Object
+		Set Overrides of the Bin Packing Object Associated to This Shipping Object
+
+		The bin packing object is only built when `binpack_item` is used,
+		from the overrides and the object's current dimensions, as most
+		algorithms never need it.
 		'''
 		if not self._binpack_item_exists:
-			width = kwargs.get('width',self.width)
-			height = kwargs.get('height',self.height)
-			length = kwargs.get('length',self.length)
-			weight = kwargs.get('weight',self.weight)
-			self.binpack_item = Item(
-				name = kwargs.get('name',getattr(self,'name','Unnamed Shipping Object')),
-				width = width, 
-				height = length,
-				depth = height,
-				weight = weight
-			)
+			self._binpack_item_kwargs = kwargs
 			self._binpack_item_exists = True
 	
 	def _delete_binpack_item(self):
 		'''
 		Delete Bin Packing Object
 		'''
-		if hasattr(self,'binpack_item'):
-			delattr(self,'binpack_item')
+		self._binpack_item = None
 		self._binpack_item_exists = False
 	
 	def _update_binpack_item(self,*args,**kwargs):
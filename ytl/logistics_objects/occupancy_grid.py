@@ -0,0 +1,185 @@
+import math
+import numpy as np
+
+
+class OccupancyGrid:
+	'''
+	Occupancy Grid of the Trailer Floor
+
+	The floor is split into square cells of `resolution` inches, x along
+	the length and y along the width, and each cell counts the objects
+	covering it.  Objects with floor boundaries on cell edges (see
+	`is_aligned`) are represented exactly, so collision checks become
+	slices of the grid.  Other objects have to be checked with exact
+	geometry by the caller.  The grid grows along the length as needed,
+	and only covers whole cells across the width.
+	'''
+
+	def __init__(self,width : float,length : float = 0,resolution : float = 1):
+		self.resolution = float(resolution)
+		self.width = width
+		self.clear(length=length)
+
+	def clear(self,length : float = None):
+		'''
+		Remove All Objects from the Grid
+		'''
+		if length is None:
+			length = self.counts.shape[0] * self.resolution
+		self.counts = np.zeros(
+			(max(math.ceil(length / self.resolution),1),math.floor(self.width / self.resolution)),
+			dtype=np.int32,
+		)
+
+	def is_aligned(self,boundaries):
+		'''
+		Check Boundaries, of shape (3,2) or (n,3,2), are Represented Exactly by the Grid
+
+		Floor boundaries have to be finite multiples of the resolution and
+		the object has to stand on the floor.
+		'''
+		floor = boundaries[...,:2,:]
+		return (
+			np.all(np.isfinite(floor),axis=(-2,-1)) &
+			np.all(np.mod(floor,self.resolution) == 0,axis=(-2,-1)) &
+			(boundaries[...,2,0] == 0) & (boundaries[...,2,1] > 0)
+		)
+
+	def _get_cells(self,boundaries):
+		'''
+		Get Cell Index Ranges [i0,i1) x [j0,j1) Covered by Aligned Boundaries, Clipped to the Grid
+		'''
+		cells = np.floor_divide(boundaries[...,:2,:],self.resolution).astype(int)
+		i = np.clip(cells[...,0,:],0,self.counts.shape[0])
+		j = np.clip(cells[...,1,:],0,self.counts.shape[1])
+		return i[...,0],i[...,1],j[...,0],j[...,1]
+
+	def add(self,boundaries,count : int = 1):
+		'''
+		Add Object with Aligned Boundaries to the Grid
+		'''
+		i1 = int(boundaries[0,1] // self.resolution)
+		if i1 > self.counts.shape[0]:
+			self.counts = np.concatenate([
+				self.counts,
+				np.zeros((max(i1,2 * self.counts.shape[0]) - self.counts.shape[0],self.counts.shape[1]),dtype=np.int32),
+			])
+		i0,i1,j0,j1 = self._get_cells(boundaries)
+		self.counts[i0:i1,j0:j1] += count
+
+	def remove(self,boundaries):
+		'''
+		Remove Object with Aligned Boundaries from the Grid
+		'''
+		self.add(boundaries,count=-1)
+
+	def is_free(self,boundaries,own : int = 0):
+		'''
+		Check that No Other Object Covers Aligned Boundaries
+
+		Parameters
+		------------
+		boundaries : np.ndarray
+			Boundaries of shape (3,2)
+		own : int
+			Number of times the checked object is itself registered in the grid
+		'''
+		i0,i1,j0,j1 = self._get_cells(boundaries)
+		return not np.any(self.counts[i0:i1,j0:j1] > own)
+
+	def _get_summed_area(self,lo : int = 0,hi : int = None):
+		'''
+		Get Summed Area Table of Occupied Cells in Rows [lo,hi) Along the Length
+		'''
+		counts = self.counts[lo:hi]
+		summed_area = np.zeros((counts.shape[0] + 1,counts.shape[1] + 1),dtype=np.int32)
+		summed_area[1:,1:] = (counts > 0).cumsum(axis=0,dtype=np.int32).cumsum(axis=1)
+		return summed_area
+
+	def windows_are_free(self,boundaries):
+		'''
+		Check Aligned Boundaries of Shape (n,3,2) are Free of Objects, Using the Summed Area Table
+		'''
+		i0,i1,j0,j1 = self._get_cells(boundaries)
+		if len(i0) == 0:
+			return np.zeros(0,dtype=bool)
+		# Only the rows spanned by the windows are summed
+		lo = i0.min()
+		summed_area = self._get_summed_area(lo,i1.max())
+		i0,i1 = i0 - lo,i1 - lo
+		occupied = summed_area[i1,j1] - summed_area[i0,j1] - summed_area[i1,j0] + summed_area[i0,j0]
+		return occupied == 0
+
+	def get_free_positions(self,length : float,width : float):
+		'''
+		Get Free Lower-Left Positions for a Footprint Inside the Grid
+
+		Parameters
+		------------
+		length : float
+			Footprint length, rounded up to whole cells
+		width : float
+			Footprint width, rounded up to whole cells
+
+		Returns
+		------------
+		is_free : np.ndarray
+			Boolean array, True at cell (i,j) if the footprint fits with its lower-left corner at that cell
+		'''
+		a = math.ceil(length / self.resolution)
+		b = math.ceil(width / self.resolution)
+		nx,ny = self.counts.shape
+		if a > nx or b > ny:
+			return np.zeros((0,0),dtype=bool)
+		summed_area = self._get_summed_area()
+		occupied = (
+			summed_area[a:,b:] - summed_area[:nx-a+1,b:] -
+			summed_area[a:,:ny-b+1] + summed_area[:nx-a+1,:ny-b+1]
+		)
+		return occupied == 0
+
+	def first_fit(self,length : float,width : float):
+		'''
+		Get the Free Position for a Footprint Closest to the Front of the Grid
+
+		Returns
+		------------
+		position : Tuple[float, float]
+			Position along the length and width, None if the footprint does not fit in the grid
+		'''
+		is_free = self.get_free_positions(length,width)
+		if not np.any(is_free):
+			return None
+		i,j = np.unravel_index(np.argmax(is_free),is_free.shape)
+		return i * self.resolution,j * self.resolution
+
+	def get_free_distance(self,boundaries,axis : int,direction : int):
+		'''
+		Get Distance an Object with Aligned Boundaries can Move Before Reaching an Occupied Cell
+
+		Parameters
+		------------
+		boundaries : np.ndarray
+			Boundaries of shape (3,2)
+		axis : int
+			Axis of movement, 0 for length and 1 for width
+		direction : int
+			-1 for movement toward the origin, 1 for movement away from it
+
+		Returns
+		------------
+		distance : float
+			Distance to the nearest occupied cell, inf if there is none
+		'''
+		i0,i1,j0,j1 = self._get_cells(boundaries)
+		lanes = self.counts[:,j0:j1] if axis == 0 else self.counts[i0:i1,:].T
+		start,end = (i0,i1) if axis == 0 else (j0,j1)
+		if direction < 0:
+			occupied = np.flatnonzero(np.any(lanes[:start] > 0,axis=1))
+			if len(occupied) == 0:
+				return np.inf
+			return boundaries[axis,0] - (occupied[-1] + 1) * self.resolution
+		occupied = np.flatnonzero(np.any(lanes[end:] > 0,axis=1))
+		if len(occupied) == 0:
+			return np.inf
+		return (end + occupied[0]) * self.resolution - boundaries[axis,1]
@@ -11,6 +11,8 @@ class Piece(ShippingObject):
 	being taken apart or separated.
 	'''
 
+	__slots__ = ('packing','commodity','value','stack_limit')
+
 	def __init__(self,packing,stack_limit,commodity=None,value=None,*args,**kwargs):
 		super(Piece,self).__init__(*args,**kwargs)
 		# Ensure a valid packing type is provided
@@ -23,5 +25,3 @@ class Piece(ShippingObject):
 		self.value = value
 		self.stack_limit = stack_limit
 
-		self._set_binpack_item()
-
@@ -0,0 +1,91 @@
+from copy import copy
+from .piece import Piece
+
+
+class PieceGroup:
+	'''
+	Group of Identical Pieces
+
+	Stands for `count` pieces sharing dimensions, weight, packing, and
+	stack limit, e.g. one entry of a shipment list with `num_pieces`.  A
+	single template piece is built for the group, so unit conversion and
+	validation run once, and algorithms working on groups allocate counts
+	of pieces instead of piece objects.  Individual pieces are only made,
+	by copying the template, when a shipment needs them.
+	'''
+
+	def __init__(self,count : int = 1,index : int = 0,**kwargs):
+		assert count > 0
+		self.count = count
+		# Position of the group in the shipment list, used to name its pieces
+		self.index = index
+		self.piece_kwargs = kwargs
+		self.template = Piece(**{**kwargs,'name' : self.get_piece_name(0)})
+		self.rotated_template = self.make_piece(0,rotated=True)
+
+		self.length = self.template.length
+		self.width = self.template.width
+		self.height = self.template.height
+		self.weight = self.template.weight
+		self.packing = self.template.packing
+		self.stack_limit = self.template.stack_limit
+
+	@classmethod
+	def from_shipment_list(cls,shipment_list):
+		'''
+		Create One Group per Shipment List Entry, Counting `num_pieces` Pieces
+		'''
+		groups = []
+		for i,shipment_dict in enumerate(shipment_list):
+			kwargs = dict(shipment_dict)
+			groups += [cls(count=kwargs.pop('num_pieces',1),index=i,**kwargs)]
+		return groups
+
+	def get_signature(self):
+		'''
+		Get the Attributes Shared by All Pieces of the Group, in Default Units
+		'''
+		return (self.length,self.width,self.height,self.weight,self.packing,self.stack_limit)
+
+	def get_template(self,rotated : bool = False):
+		'''
+		Get the Piece Describing All Pieces of the Group, in the Requested Orientation
+
+		Templates are shared and must not be moved, rotated, or stacked.
+		'''
+		return self.rotated_template if rotated else self.template
+
+	def get_piece_name(self,j : int):
+		'''
+		Get Name of the Piece at Index `j` Within the Group
+		'''
+		return f'Shipment {self.index+1}:  Piece {j+1}'
+
+	def make_piece(self,j : int,rotated : bool = False):
+		'''
+		Make the Piece at Index `j` Within the Group
+
+		Parameters
+		------------
+		j : int
+			Index of the piece within the group
+		rotated : bool
+			Rotate the piece from its original orientation
+
+		Returns
+		------------
+		piece : logistics_objects.Piece
+			Piece at the origin, with its own position and orientation
+		'''
+		piece = copy(self.template)
+		piece._delete_binpack_item()
+		piece.name = self.get_piece_name(j)
+		if rotated:
+			piece.rotate()
+		return piece
+
+	def make_pieces(self):
+		'''
+		Make All Pieces of the Group
+		'''
+		return [self.make_piece(j) for j in range(self.count)]
@@ -0,0 +1,342 @@
+from ..utils import get_overlapping_pairs
+import numpy as np
+
+
+def column_property(column : str, doc : str = None):
+	'''
+	Read-Only Property of a View Returning its Row of a Table Column
+	'''
+	return property(lambda self : getattr(self.table,column)[self.index].item(),doc=doc)
+
+
+class PieceTable:
+	'''
+	Columnar Table of the Pieces of a Load
+
+	Piece attributes are kept as one NumPy array per column, one row per
+	piece, with pieces of the same shipment in consecutive rows.  Piece
+	positions are relative to their shipment, like `Piece.position`, and
+	shipment positions are kept in a separate (m,3) array indexed by the
+	`shipment_id` column, so load-wide quantities are array expressions
+	instead of loops over shipment and piece objects.
+
+	`PieceView` and `ShipmentView` give read-only access to rows of the
+	table with the attributes of `Piece` and `Shipment`.
+
+	Shipment extents, dimensions, and weights are computed once and
+	cached, as views read them for every attribute access.  Replacing a
+	column clears the cache, `changed` must be called after editing a
+	column in place.
+	'''
+
+	def __setattr__(self,name,value):
+		object.__setattr__(self,name,value)
+		object.__setattr__(self,'_shipment_cache',{})
+
+	def changed(self):
+		'''
+		Clear Cached Shipment Quantities After Columns were Edited in Place
+		'''
+		self._shipment_cache = {}
+
+	def _get_cached(self,key : str,compute):
+		'''
+		Get a Cached Shipment Quantity, Computing it as a Read-Only Array if Missing
+		'''
+		value = self._shipment_cache.get(key)
+		if value is None:
+			value = compute()
+			value.setflags(write=False)
+			self._shipment_cache[key] = value
+		return value
+
+	def __init__(self,length,width,height,weight,stack_limit,packing,position,is_rotated,shipment_id,shipment_position,name=None):
+		self.length = np.asarray(length,dtype=float)
+		self.width = np.asarray(width,dtype=float)
+		self.height = np.asarray(height,dtype=float)
+		self.weight = np.asarray(weight,dtype=float)
+		self.stack_limit = np.asarray(stack_limit,dtype=int)
+		self.packing = np.asarray(packing,dtype=str)
+		self.position = np.asarray(position,dtype=float).reshape(-1,3)
+		self.is_rotated = np.asarray(is_rotated,dtype=bool)
+		self.shipment_id = np.asarray(shipment_id,dtype=int)
+		self.shipment_position = np.asarray(shipment_position,dtype=float).reshape(-1,3)
+		self.name = np.empty(len(self.length),dtype=object)
+		if name is not None:
+			self.name[:] = name
+
+	@classmethod
+	def from_shipments(cls,shipments):
+		'''
+		Create a Table from the Pieces of the Provided Shipments
+
+		Parameters
+		------------
+		shipments : List[logistics_objects.Shipment]
+			Shipments whose pieces make up the rows of the table, shipment ids are indices in this list
+
+		Returns
+		------------
+		table : PieceTable
+			Table with one row per piece, in the order of the shipments and their pieces
+		'''
+		pieces = [(i,piece) for i,shipment in enumerate(shipments) for piece in shipment.pieces]
+		return cls(
+			length=[piece.length for _,piece in pieces],
+			width=[piece.width for _,piece in pieces],
+			height=[piece.height for _,piece in pieces],
+			weight=[piece.weight for _,piece in pieces],
+			stack_limit=[piece.stack_limit for _,piece in pieces],
+			packing=[piece.packing for _,piece in pieces],
+			position=[piece.position for _,piece in pieces],
+			is_rotated=[piece.is_rotated for _,piece in pieces],
+			shipment_id=[i for i,_ in pieces],
+			shipment_position=[shipment.position for shipment in shipments],
+			name=[piece.name for _,piece in pieces],
+		)
+
+	def __len__(self):
+		return len(self.length)
+
+	def get_num_shipments(self):
+		'''
+		Get Number of Shipments in the Table, Including Shipments Without Pieces
+		'''
+		return len(self.shipment_position)
+
+	def get_piece(self,i : int):
+		'''
+		Get Read-Only View of Piece Row `i`
+		'''
+		return PieceView(self,i)
+
+	def get_shipment(self,j : int):
+		'''
+		Get Read-Only View of Shipment `j`
+		'''
+		return ShipmentView(self,j)
+
+	def get_dims(self):
+		'''
+		Get Piece Dimensions as an (n,3) Array of Length, Width, and Height
+		'''
+		return np.stack([self.length,self.width,self.height],axis=1)
+
+	def get_volumes(self):
+		'''
+		Get Piece Volumes in Cubic Inches
+		'''
+		return self.length * self.width * self.height
+
+	def get_positions(self):
+		'''
+		Get Piece Positions in the Frame of the Shipment Positions, e.g. the Trailer
+		'''
+		return self.position + self.shipment_position[self.shipment_id]
+
+	def get_boundaries(self):
+		'''
+		Get Piece Boundaries in the Frame of the Shipment Positions, as an (n,3,2) Array
+		'''
+		positions = self.get_positions()
+		return np.stack([positions,positions + self.get_dims()],axis=2)
+
+	def get_shipment_local_boundaries(self):
+		'''
+		Get Extent of the Pieces of Each Shipment Relative to the Shipment Position, as an (m,3,2) Array
+
+		Shipments without pieces get infinite empty boundaries, like `Shipment.get_local_boundaries`.
+		'''
+		return self._get_cached('local_boundaries',self._compute_shipment_local_boundaries)
+
+	def _compute_shipment_local_boundaries(self):
+		lower = np.full((self.get_num_shipments(),3),np.inf)
+		upper = np.full((self.get_num_shipments(),3),-np.inf)
+		np.minimum.at(lower,self.shipment_id,self.position)
+		np.maximum.at(upper,self.shipment_id,self.position + self.get_dims())
+		return np.stack([lower,upper],axis=2)
+
+	def get_shipment_dims(self):
+		'''
+		Get Length, Width, and Height of Each Shipment from its Pieces, as an (m,3) Array
+
+		Shipments without pieces have zero dimensions, like `Shipment._set_dims`.
+		'''
+		return self._get_cached('dims',self._compute_shipment_dims)
+
+	def _compute_shipment_dims(self):
+		boundaries = self.get_shipment_local_boundaries()
+		dims = boundaries[:,:,1] - boundaries[:,:,0]
+		dims[~np.isfinite(dims)] = 0
+		return dims
+
+	def get_shipment_weights(self):
+		'''
+		Get Total Piece Weight of Each Shipment
+		'''
+		return self._get_cached('weights',lambda : np.bincount(self.shipment_id,weights=self.weight,minlength=self.get_num_shipments()))
+
+	def get_load_order_index(self):
+		'''
+		Get Rows in the Order the Pieces need to be Loaded
+
+		Shipments are loaded from the back of the trailer to the front and
+		across its width, and pieces of a shipment from the bottom up.
+		'''
+		shipment_key = self.shipment_position[:,0] * 10000 + self.shipment_position[:,1]
+		shipment_rank = np.empty(self.get_num_shipments(),dtype=int)
+		shipment_rank[np.argsort(shipment_key,kind='stable')] = np.arange(self.get_num_shipments())
+		return np.lexsort((self.position[:,2],shipment_rank[self.shipment_id]))
+
+	def get_load_order(self):
+		'''
+		Get Load Plan in the Order Pieces need to be Loaded, see `Trailer.get_load_order`
+		'''
+		order = self.get_load_order_index()
+		positions = self.get_positions()[order]
+		return {
+			idx : {
+				'name' : name,
+				'position' : position,
+				'piece_width' : width,
+				'piece_length' : length,
+				'piece_height' : height,
+				'piece_weight' : weight,
+				'piece_packing' : packing,
+				'piece_is_rotated' : is_rotated,
+				'piece_is_stacked' : is_stacked,
+			}
+			for idx,(name,position,width,length,height,weight,packing,is_rotated,is_stacked) in enumerate(zip(
+				self.name[order].tolist(),
+				positions.tolist(),
+				self.width[order].tolist(),
+				self.length[order].tolist(),
+				self.height[order].tolist(),
+				self.weight[order].tolist(),
+				self.packing[order].tolist(),
+				self.is_rotated[order].tolist(),
+				(self.position[order,2] > 0).tolist(),
+			),1)
+		}
+
+	def get_overlapping_pieces(self):
+		'''
+		Get Pairs of Rows of Pieces Occupying the Same Space, Across All Shipments
+
+		Returns
+		------------
+		pairs : np.ndarray
+			Array of shape (k,2) of row indices of overlapping pieces, lower index first
+		'''
+		return get_overlapping_pairs(self.get_boundaries())
+
+	def get_pieces_outside(self,container_boundaries):
+		'''
+		Get Rows of Pieces not Fully Inside the Provided (3,2) Boundaries
+		'''
+		container_boundaries = np.asarray(container_boundaries,dtype=float)
+		boundaries = self.get_boundaries()
+		inside = np.all(
+			(boundaries[...,0] >= container_boundaries[:,0]) & (boundaries[...,1] <= container_boundaries[:,1]),
+			axis=-1
+		)
+		return np.flatnonzero(~inside)
+
+	def arrangement_is_valid(self,container_boundaries=None):
+		'''
+		Validate that No Two Pieces of the Load Occupy the Same Space
+
+		Parameters
+		------------
+		container_boundaries : np.ndarray
+			Boundaries of shape (3,2) that all pieces must be inside, not checked if None
+
+		Returns
+		------------
+		is_valid : bool
+			True if the arrangement of pieces is physically possible, False if not
+		'''
+		if container_boundaries is not None and len(self.get_pieces_outside(container_boundaries)) > 0:
+			return False
+		return len(self.get_overlapping_pieces()) == 0
+
+
+class PieceView:
+	'''
+	Read-Only View of a Row of a PieceTable with the Attributes of a Piece
+	'''
+
+	__slots__ = ('table','index')
+
+	def __init__(self,table : PieceTable,index : int):
+		self.table = table
+		self.index = index
+
+	length = column_property('length')
+	width = column_property('width')
+	height = column_property('height')
+	weight = column_property('weight')
+	stack_limit = column_property('stack_limit')
+	packing = column_property('packing')
+	is_rotated = column_property('is_rotated')
+	name = property(lambda self : self.table.name[self.index])
+	shipment_id = column_property('shipment_id')
+
+	@property
+	def position(self):
+		return self.table.position[self.index].copy()
+
+	def get_boundaries(self):
+		'''
+		Get the Profile of the Piece Relative to its Shipment Position
+		'''
+		position = self.table.position[self.index]
+		return np.stack([position,position + self.table.get_dims()[self.index]],axis=1)
+
+
+class ShipmentView:
+	'''
+	Read-Only View of the Rows of a PieceTable Making Up a Shipment, with the Attributes of a Shipment
+	'''
+
+	__slots__ = ('table','index')
+
+	def __init__(self,table : PieceTable,index : int):
+		self.table = table
+		self.index = index
+
+	@property
+	def pieces(self):
+		return [PieceView(self.table,i) for i in np.flatnonzero(self.table.shipment_id == self.index)]
+
+	@property
+	def position(self):
+		return self.table.shipment_position[self.index].copy()
+
+	@property
+	def length(self):
+		return self.table.get_shipment_dims()[self.index,0].item()
+
+	@property
+	def width(self):
+		return self.table.get_shipment_dims()[self.index,1].item()
+
+	@property
+	def height(self):
+		return self.table.get_shipment_dims()[self.index,2].item()
+
+	@property
+	def weight(self):
+		return self.table.get_shipment_weights()[self.index].item()
+
+	def get_local_boundaries(self):
+		'''
+		Get Shipment Profile Relative to the Shipment Position
+		'''
+		return self.table.get_shipment_local_boundaries()[self.index]
+
+	def get_boundaries(self):
+		'''
+		Get Shipment Profile
+		'''
+		return self.get_local_boundaries() + self.table.shipment_position[self.index][:,None]
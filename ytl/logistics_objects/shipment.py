@@ -5,7 +5,8 @@ from ..py3dbp import (
 	Bin,
 	NoRotateBin,
 )
-from ..utils import intervals_overlap
+from ..utils import get_overlapping_pairs
+from copy import copy
 import numpy as np
 
 class Shipment(ShippingObject):
@@ -17,9 +18,19 @@ class Shipment(ShippingObject):
 	and transported as a single unit.  It may be a single piece or 
 	it may be many pieces put together.
 	'''
+
+	__slots__ = (
+		'_trailer','_local_boundaries','pieces','max_weight',
+		'_binpack_bin_exists','_binpack_bin','_binpack_bin_kwargs',
+	)
+
 	def __init__(self,pieces=[],*args,**kwargs):
 		if isinstance(pieces,Piece):
 			pieces = [pieces]
+		# Trailer the shipment is loaded in, notified when the shipment's boundaries change
+		self._trailer = None
+		self._local_boundaries = None
+		self._boundaries_cache = None
 		self.pieces = []
 		self.add_piece(pieces)
 		self.arrange_pieces()
@@ -35,15 +46,33 @@ class Shipment(ShippingObject):
 			**kwargs
 		)
 		self._binpack_bin_exists = False
+		self._binpack_bin = None
 		self.max_weight = 100000
 
+	def _boundaries_changed(self):
+		'''
+		Invalidate Cached Boundaries and Notify the Trailer Holding the Shipment
+		'''
+		self._boundaries_cache = None
+		if self._trailer is not None:
+			self._trailer._update_shipment_boundaries(self)
+
+	def _pieces_changed(self):
+		'''
+		Invalidate the Cached Piece Extent After Pieces were Added, Removed, or Rearranged
+		'''
+		self._local_boundaries = None
+		self._boundaries_changed()
+
 	def arrange_pieces(self,**kwargs):
 		'''
 		Trivial Piece Arragemet:  Place Shipment End-to-End in the Length direction
 		'''
 		length_pos = 0
 		for piece in self.pieces:
-			piece.position[0] = length_pos
+			position = piece.position.copy()
+			position[0] = length_pos
+			piece.position = position
 			length_pos += piece.length
 		# Update shipment dimension/weight attributes
 		self._set_dims()
@@ -52,18 +81,20 @@ class Shipment(ShippingObject):
 		'''
 		Update Dimensions, Weight, and Piece Ordering for Shipment
 		'''
+		# Each access to a position makes a new array, so positions are read once
+		positions = np.array([piece.position for piece in self.pieces]).reshape(-1,3)
 		if len(self.pieces) == 0:
 			self.length = 0
 			self.width = 0
 			self.height = 0
 			self.weight = 0
 		else:
-			self.length = max([piece.position[0] + piece.length for piece in self.pieces]) - min([piece.position[0] for piece in self.pieces])
-			self.width = max([piece.position[1] + piece.width for piece in self.pieces]) - min([piece.position[1] for piece in self.pieces])
-			self.height = max([piece.position[2] + piece.height for piece in self.pieces]) - min([piece.position[2] for piece in self.pieces])
+			ends = positions + np.array([[piece.length,piece.width,piece.height] for piece in self.pieces])
+			self.length,self.width,self.height = (ends.max(axis=0) - positions.min(axis=0)).tolist()
 			self.weight = sum([piece.weight for piece in self.pieces])
-		stack_order = np.argsort([p.position[2] for p in self.pieces])
+		stack_order = np.argsort(positions[:,2])
 		self.pieces = [self.pieces[i] for i in stack_order]
+		self._pieces_changed()
 
 	def add_piece(self,piece):
 		'''
@@ -73,6 +104,7 @@ class Shipment(ShippingObject):
 			piece = [piece]
 		assert all([isinstance(p,Piece) for p in piece])
 		self.pieces += piece
+		self._pieces_changed()
 
 	def remove_piece(self,piece):
 		'''
@@ -80,61 +112,80 @@ class Shipment(ShippingObject):
 		'''
 		if isinstance(piece,Piece):
 			self.pieces = [p for p in self.pieces if p != piece]
+			self._pieces_changed()
 			return piece
 		elif isinstance(piece,int):
-			return self.pieces.pop(piece)
+			piece = self.pieces.pop(piece)
+			self._pieces_changed()
+			return piece
 		else:
 			raise Exception(f'Data type for {piece} not recognized')
 
+	def get_local_boundaries(self):
+		'''
+		Get Shipment Profile Relative to the Shipment Position
+
+		The extent of the pieces is cached until pieces are added, removed,
+		rearranged, or rotated.
+		'''
+		if self._local_boundaries is None:
+			if len(self.pieces) == 0:
+				boundaries = np.array([np.inf,-np.inf,np.inf,-np.inf,np.inf,-np.inf])
+				boundaries.shape = (3,2)
+			else:
+				piece_boundaries = np.array([piece.get_boundaries() for piece in self.pieces])
+				boundaries = np.stack([
+					piece_boundaries[:,:,0].min(axis=0),
+					piece_boundaries[:,:,1].max(axis=0),
+				],axis=1)
+			boundaries.flags.writeable = False
+			self._local_boundaries = boundaries
+		return self._local_boundaries
+
 	def get_boundaries(self):
 		'''
 		Get Shipment Profile
+
+		Boundaries are cached until the shipment or its pieces change, the
+		returned array is read-only.
 		'''
-		boundaries = np.array([np.inf,-np.inf,np.inf,-np.inf,np.inf,-np.inf])
-		boundaries.shape = (3,2)
-		for piece in self.pieces:
-			piece_boundaries = piece.get_boundaries()
-			for i in range(3):
-				boundaries[i,0] = min([boundaries[i,0],piece_boundaries[i,0]])
-				boundaries[i,1] = max([boundaries[i,1],piece_boundaries[i,1]])
-		for i in range(3):
-			boundaries[i,0] += self.position[i]
-			boundaries[i,1] += self.position[i]
-		return boundaries
+		if self._boundaries_cache is None:
+			boundaries = self.get_local_boundaries() + self.position[:,None]
+			boundaries.flags.writeable = False
+			self._boundaries_cache = boundaries
+		return self._boundaries_cache
 	
+	@property
+	def binpack_bin(self):
+		'''
+		Bin Packing Object Associated to This Shipment, Built on First Use
+		'''
+		if self._binpack_bin is None:
+			self._set_binpack_bin()
+			allow_rotations,kwargs = self._binpack_bin_kwargs
+			bin_class = Bin if allow_rotations else NoRotateBin
+			self._binpack_bin = bin_class(
+				name = kwargs.get('name',getattr(self,'name','Unnamed Shipment Object')),
+				width = kwargs.get('width',self.width), 
+				height = kwargs.get('length',self.length),
+				depth = kwargs.get('height',self.height),
+				max_weight = kwargs.get('max_weight',self.weight)
+			)
+		return self._binpack_bin
+
 	def _set_binpack_bin(self,allow_rotations=True,**kwargs):
 		'''
-		Set Bin Pack Items
+		Set Overrides of the Bin Packing Object, Built when `binpack_bin` is Used
 		'''
 		if not self._binpack_bin_exists:
-			width = kwargs.get('width',self.width)
-			height = kwargs.get('height',self.height)
-			length = kwargs.get('length',self.length)
-			max_weight = kwargs.get('max_weight',self.weight)
-			if allow_rotations:
-				self.binpack_bin = Bin(
-					name = kwargs.get('name',getattr(self,'name','Unnamed Shipment Object')),
-					width = width, 
-					height = length,
-					depth = height,
-					max_weight = max_weight
-				)
-			else:
-				self.binpack_bin = NoRotateBin(
-					name = kwargs.get('name',getattr(self,'name','Unnamed Shipment Object')),
-					width = width, 
-					height = length,
-					depth = height,
-					max_weight = max_weight
-				)
+			self._binpack_bin_kwargs = (allow_rotations,kwargs)
 			self._binpack_bin_exists = True
 	
 	def _delete_binpack_bin(self):
 		'''
 		Delete Bin Pack Item
 		'''
-		if hasattr(self,'binpack_item'):
-			delattr(self,'binpack_item')
+		self._binpack_bin = None
 		self._binpack_bin_exists = False
 	
 	def _update_binpack_bin(self,allow_rotations=True,*args,**kwargs):
@@ -148,15 +199,16 @@ class Shipment(ShippingObject):
 		'''
 		Validate Positions of Shipment's Pieces are Physically Valid
 		'''
-		piece_boundaries_list = [piece.get_boundaries() for piece in self.pieces]
-		for i in range(len(piece_boundaries_list)):
-			p_i = piece_boundaries_list[i]
-			for j in range(i):
-				p_j = piece_boundaries_list[j]
-				overlap = all([intervals_overlap(p_i[k],p_j[k]) for k in range(3)])
-				if overlap:
-					return False
-		return True
+		return len(self.get_overlapping_pieces()) == 0
+
+	def get_overlapping_pieces(self):
+		'''
+		Get Pairs of Pieces in the Shipment Occupying the Same Space
+		'''
+		if len(self.pieces) == 0:
+			return []
+		pairs = get_overlapping_pairs([piece.get_boundaries() for piece in self.pieces])
+		return [(self.pieces[i],self.pieces[j]) for i,j in pairs]
 
 	def rotate(self):
 		self.length, self.width = self.width, self.length
@@ -165,49 +217,72 @@ class Shipment(ShippingObject):
 		
 		# Also rotate all pieces within the shipment
 		for piece in self.pieces:
-			piece.position[0],piece.position[1] = piece.position[1],piece.position[0]
-			piece.length, piece.width = piece.width, piece.length
-			piece.length_raw, piece.width_raw = piece.width_raw, piece.length_raw
-			piece.is_rotated = not piece.is_rotated
+			piece.position = piece.position[[1,0,2]]
+			piece.rotate()
+		self._pieces_changed()
 	
 	def move(self,delta):
 		'''
 		Move the Shipment
 		'''
-		self.position += delta
+		self.position = self.position + delta
 	
+	def _slide(self,trailer,axis : int,direction : int,max_steps : int = 999):
+		'''
+		Slide Shipment Along an Axis as far as it can Within the Trailer
+
+		Equivalent to moving the shipment one inch at a time until the
+		arrangement becomes invalid (backing off the final step), but the
+		number of steps is computed in one pass from the obstacles that
+		overlap the shipment's projection.
+
+		Parameters
+		------------
+		trailer : logistics_objects.Trailer
+			Trailer containing the shipment
+		axis : int
+			Axis to slide along, 0 for length and 1 for width
+		direction : int
+			-1 to slide toward the origin, 1 to slide away from it
+		max_steps : int
+			Maximum number of one inch steps to slide
+		
+		Returns
+		------------
+		None
+		'''
+		delta = np.array([0,0,0])
+		delta[axis] = direction
+		if not trailer.arrangement_is_valid(self):
+			# Matches the stepwise slide, which backs off one step from an invalid start
+			self.move(-delta)
+			return
+		distance = trailer.get_max_displacement(self,axis=axis,direction=direction)
+		steps = int(min(np.floor(distance + 1e-9),max_steps))
+		if steps <= 0:
+			return
+		self.move(steps * delta)
+		if not trailer.arrangement_is_valid(self):
+			# Guard against floating point round-off in the computed distance
+			self.move(-delta)
+
 	def slide_back(self,trailer):
 		'''
 		Slide Shipment Back in Length Direction as far as it can Within the Trailer
 		'''
-		delta = np.array([-1,0,0])
-		count = 0
-		while trailer.arrangement_is_valid(self) and count < 1000:
-			self.move(delta)
-			count += 1
-		self.move(-delta)
+		self._slide(trailer,axis=0,direction=-1)
 
 	def slide_right(self,trailer):
 		'''
 		Slide Shipment to the Right in the Width Direction as far as it can Within the Trailer
 		'''
-		delta = np.array([0,1,0])
-		count = 0
-		while trailer.arrangement_is_valid(self) and count < 1000:
-			self.move(delta)
-			count += 1
-		self.move(-delta)
+		self._slide(trailer,axis=1,direction=1)
 
 	def slide_left(self,trailer):
 		'''
 		Slide Shipment to the Left in the Width Direction as far as it can Within the Trailer
 		'''
-		delta = np.array([0,-1,0])
-		count = 0
-		while trailer.arrangement_is_valid(self) and count < 1000:
-			self.move(delta)
-			count += 1
-		self.move(-delta)
+		self._slide(trailer,axis=1,direction=-1)
 
 	def can_stack(self,piece,trailer_height):
 		'''
@@ -236,6 +311,24 @@ class Shipment(ShippingObject):
 			packing_stackable
 		)
 		
+	def replicate(self):
+		'''
+		Copy the Shipment and its Pieces
+
+		The copy is not loaded in a trailer, and has no bin packing
+		objects.  Arrays are shared until reassigned, like positions.
+		'''
+		shipment = copy(self)
+		shipment._trailer = None
+		shipment._delete_binpack_item()
+		shipment._delete_binpack_bin()
+		shipment.pieces = []
+		for piece in self.pieces:
+			piece = copy(piece)
+			piece._delete_binpack_item()
+			shipment.pieces += [piece]
+		return shipment
+
 	def stack(self,piece):
 		'''
 		Stack Piece on Shipment
@@ -0,0 +1,131 @@
+from bisect import bisect_left, bisect_right
+
+
+class FloorSkyline:
+	'''
+	Skyline of the Trailer Floor Along the Trailer Width
+
+	The floor width is split into lateral segments, each recording how far
+	along the trailer length the floor is occupied.  Segment starts are
+	kept sorted, so finding the segments under a lateral range is a
+	bisection, and the lowest feasible position for a width `w` at lateral
+	offset `y` costs O(log n + k) for the k segments the range spans.
+
+	Every placement lands at or beyond the skyline, so placements made
+	through the skyline never overlap one another.
+	'''
+
+	def __init__(self,width : float):
+		self.width = width
+		self.clear()
+
+	def clear(self):
+		'''
+		Reset the Skyline to an Empty Floor
+		'''
+		self._starts = [0]
+		self._heights = [0]
+
+	def get_segments(self):
+		'''
+		Get Skyline Segments
+
+		Returns
+		------------
+		segments : List[Tuple[float, float, float]]
+			Lateral start, lateral end, and occupied length of each segment
+		'''
+		ends = self._starts[1:] + [self.width]
+		return list(zip(self._starts,ends,self._heights))
+
+	def get_lowest_x(self,y : float,width : float):
+		'''
+		Get Lowest Position Along the Length for a Width at a Lateral Offset
+
+		Parameters
+		------------
+		y : float
+			Lateral offset of the placement
+		width : float
+			Lateral width of the placement
+
+		Returns
+		------------
+		x : float
+			Smallest position along the length with the floor free across [y, y + width)
+		'''
+		i = bisect_right(self._starts,y) - 1
+		j = bisect_left(self._starts,y + width)
+		return max(self._heights[i:max(j,i+1)])
+
+	def get_candidate_offsets(self,width : float):
+		'''
+		Get Lateral Offsets Worth Trying for a Width
+
+		Every gap in the skyline is covered by placing against the left end
+		of each segment, or against its right end.
+		'''
+		offsets = set()
+		for start,end,height in self.get_segments():
+			for y in (start,end - width):
+				if y >= 0 and y + width <= self.width:
+					offsets.add(y)
+		return sorted(offsets)
+
+	def find_position(self,length : float,width : float,allow_rotations : bool = True):
+		'''
+		Find the Placement Ending Closest to the Front of the Floor
+
+		Ties go to the placement closest to the floor origin.
+
+		Returns
+		------------
+		placement : Tuple[float, float, bool]
+			Position along the length, lateral offset, and whether the footprint is rotated, None if it does not fit
+		'''
+		orientations = [(length,width,False)]
+		if allow_rotations and length != width:
+			orientations += [(width,length,True)]
+		best = None
+		for l,w,rotated in orientations:
+			for y in self.get_candidate_offsets(w):
+				x = self.get_lowest_x(y,w)
+				score = (x + l,x,y)
+				if best is None or score < best[0]:
+					best = (score,x,y,rotated)
+		if best is None:
+			return None
+		return best[1],best[2],best[3]
+
+	def place(self,x : float,y : float,length : float,width : float):
+		'''
+		Raise the Skyline over a Placed Footprint
+
+		The footprint is assumed to be at or beyond the skyline across its
+		width, e.g. a position returned by `find_position`.
+		'''
+		y1 = min(y + width,self.width)
+		i = bisect_right(self._starts,y) - 1
+		j = bisect_left(self._starts,y1)
+		starts,heights = [y],[x + length]
+		# Keep the rest of the last covered segment beyond the footprint
+		if y1 < self.width and (j == len(self._starts) or self._starts[j] != y1):
+			starts,heights = [y,y1],[x + length,self._heights[j-1]]
+		if self._starts[i] < y:
+			starts,heights = [self._starts[i]] + starts,[self._heights[i]] + heights
+		self._starts[i:j] = starts
+		self._heights[i:j] = heights
+		self._merge(max(i-1,0),i+len(starts)+1)
+
+	def _merge(self,lo : int,hi : int):
+		'''
+		Merge Neighbouring Segments of Equal Height Between Two Indices
+		'''
+		k = max(lo,1)
+		while k < min(hi,len(self._starts)):
+			if self._heights[k] == self._heights[k-1]:
+				del self._starts[k]
+				del self._heights[k]
+				hi -= 1
+			else:
+				k += 1
@@ -0,0 +1,140 @@
+from bisect import bisect_left, bisect_right
+import math
+
+
+class UniformGridIndex:
+	'''
+	Uniform Grid Spatial Index over the Length x Width Plane
+
+	Each object is registered in every grid cell its length x width
+	footprint touches.  A query returns the objects registered in the
+	cells touched by the queried boundaries, which is a superset of the
+	objects overlapping it, so results need an exact check afterwards.
+	'''
+
+	def __init__(self,cell_size : float = 48):
+		self.cell_size = float(cell_size)
+		self.clear()
+
+	def clear(self):
+		'''
+		Remove All Objects from the Index
+		'''
+		self._cells = {}
+		self._key_cells = {}
+
+	def _get_cells(self,boundaries):
+		'''
+		Get Grid Cells Touched by Provided Boundaries
+		'''
+		(x0,x1),(y0,y1) = boundaries[0],boundaries[1]
+		if not all([math.isfinite(v) for v in (x0,x1,y0,y1)]):
+			# Unbounded objects (e.g. shipments with no pieces) go in a catch-all cell
+			return (None,)
+		i0,i1 = math.floor(x0 / self.cell_size),math.floor(x1 / self.cell_size)
+		j0,j1 = math.floor(y0 / self.cell_size),math.floor(y1 / self.cell_size)
+		return tuple([(i,j) for i in range(i0,i1+1) for j in range(j0,j1+1)])
+
+	def insert(self,key,boundaries):
+		'''
+		Add Object to the Index
+		'''
+		cells = self._get_cells(boundaries)
+		self._key_cells[key] = cells
+		for cell in cells:
+			self._cells.setdefault(cell,set()).add(key)
+
+	def remove(self,key):
+		'''
+		Remove Object from the Index
+		'''
+		for cell in self._key_cells.pop(key,()):
+			self._cells[cell].discard(key)
+			if len(self._cells[cell]) == 0:
+				del self._cells[cell]
+
+	def update(self,key,boundaries):
+		'''
+		Update the Boundaries of an Object in the Index
+		'''
+		if self._get_cells(boundaries) != self._key_cells.get(key):
+			self.remove(key)
+			self.insert(key,boundaries)
+
+	def query(self,boundaries):
+		'''
+		Get Keys of Objects that may Overlap the Provided Boundaries
+		'''
+		keys = set(self._cells.get(None,()))
+		for cell in self._get_cells(boundaries):
+			keys.update(self._cells.get(cell,()))
+		return keys
+
+
+class LengthIntervalIndex:
+	'''
+	Interval Index on the Length Axis
+
+	Objects are kept sorted by the start of their length interval.  Since
+	no object is longer than the longest object seen, a query only needs
+	the objects starting within that distance of the queried interval,
+	which is found by bisection.  Like `UniformGridIndex`, results are a
+	superset of the overlapping objects.
+	'''
+
+	def __init__(self):
+		self.clear()
+
+	def clear(self):
+		'''
+		Remove All Objects from the Index
+		'''
+		self._starts = []
+		self._keys = []
+		self._key_starts = {}
+		self._max_length = 0
+
+	def insert(self,key,boundaries):
+		'''
+		Add Object to the Index
+		'''
+		start = float(boundaries[0,0])
+		idx = bisect_right(self._starts,start)
+		self._starts.insert(idx,start)
+		self._keys.insert(idx,key)
+		self._key_starts[key] = start
+		self._max_length = max(self._max_length,float(boundaries[0,1] - boundaries[0,0]))
+
+	def remove(self,key):
+		'''
+		Remove Object from the Index
+		'''
+		if key not in self._key_starts:
+			return
+		start = self._key_starts.pop(key)
+		idx = bisect_left(self._starts,start)
+		while self._keys[idx] != key:
+			idx += 1
+		del self._starts[idx]
+		del self._keys[idx]
+
+	def update(self,key,boundaries):
+		'''
+		Update the Boundaries of an Object in the Index
+		'''
+		self.remove(key)
+		self.insert(key,boundaries)
+
+	def query(self,boundaries):
+		'''
+		Get Keys of Objects that may Overlap the Provided Boundaries
+		'''
+		lo = bisect_right(self._starts,boundaries[0,0] - self._max_length)
+		hi = bisect_left(self._starts,boundaries[0,1])
+		return set(self._keys[lo:hi])
+
+
+SPATIAL_INDEX_ROUTER = {
+	'UNIFORM_GRID' : UniformGridIndex,
+	'LENGTH_INTERVAL' : LengthIntervalIndex,
+}
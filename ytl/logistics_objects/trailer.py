@@ -1,6 +1,10 @@
 
 from .common import LogisticsObject, get_rectangle_plot_lists
 from .shipment import Shipment
+from .piece_table import PieceTable
+from .spatial_index import SPATIAL_INDEX_ROUTER
+from .occupancy_grid import OccupancyGrid
+from ..utils import get_overlapping_pairs
 from ..py3dbp import (
 	Bin,
 	NoRotateBin,
@@ -8,9 +12,9 @@ from ..py3dbp import (
 from ..unit_converters import (
 	DIMENSION_CONVERTER,VOLUME_CONVERTER,
 )
-from ..utils import intervals_overlap,interval_is_subset
 from .. import options
 import numpy as np
+import heapq
 from matplotlib import pyplot
 
 class Trailer(LogisticsObject):
@@ -18,19 +22,294 @@ class Trailer(LogisticsObject):
 	Generalized Trailer Object
 	'''
 	
-	def __init__(self,max_weight,shipments=[],name='Unnamed Trailer',*args,**kwargs):
+	def __init__(self,max_weight,shipments=[],name='Unnamed Trailer',spatial_index=None,occupancy_grid=None,*args,**kwargs):
 		if isinstance(shipments,Shipment):
 			shipments = [shipments]
 		super(Trailer,self).__init__(*args,**kwargs)
 
 		self.max_weight = max_weight
 		self.name = name
+		self.set_spatial_index(spatial_index)
+		self.set_occupancy_grid(occupancy_grid)
 		self.shipments = []
 		self.add_shipment(shipments)
 
 		self._binpack_bin_exists = False
+		self._binpack_bin = None
 		self.set_var_types(variables='max_weight',dtype=float)
 
+	@property
+	def shipments(self):
+		return self._shipments
+
+	@shipments.setter
+	def shipments(self,shipments):
+		for shipment in getattr(self,'_shipments',[]):
+			shipment._trailer = None
+		self._shipments = []
+		self._shipment_rows = {}
+		self._boundaries = np.zeros((0,3,2))
+		self._reset_front_extent()
+		if self.spatial_index is not None:
+			self.spatial_index.clear()
+		self._off_grid = set()
+		if self.occupancy_grid is not None:
+			self.occupancy_grid.clear()
+		self.add_shipment(shipments)
+
+	def set_spatial_index(self,spatial_index=None,**kwargs):
+		'''
+		Set the Spatial Index Used for Single Shipment Collision Queries
+
+		Parameters
+		------------
+		spatial_index : str
+			Spatial index key, options are the keys of `SPATIAL_INDEX_ROUTER`,
+			or None to check every shipment in the trailer.  An index object
+			with the same interface is also accepted.
+		
+		Returns
+		------------
+		None
+		'''
+		if isinstance(spatial_index,str):
+			if not spatial_index in SPATIAL_INDEX_ROUTER.keys():
+				raise NotImplementedError(f'Spatial index `{spatial_index}` has not been implemented')
+			spatial_index = SPATIAL_INDEX_ROUTER[spatial_index](**kwargs)
+		self.spatial_index = spatial_index
+		if spatial_index is not None:
+			spatial_index.clear()
+			for shipment,boundaries in zip(getattr(self,'_shipments',[]),getattr(self,'_boundaries',[])):
+				spatial_index.insert(id(shipment),boundaries)
+
+	def set_occupancy_grid(self,resolution : float = None):
+		'''
+		Set the Occupancy Grid Used for Single Shipment Collision Checks
+
+		Shipments with floor boundaries on whole grid cells are checked
+		against the grid, and shipments with fractional boundaries are
+		checked with exact geometry.
+
+		Parameters
+		------------
+		resolution : float
+			Grid cell size in inches (e.g. 1, 2, or 6), or None to only use
+			exact geometry
+		
+		Returns
+		------------
+		None
+		'''
+		self._off_grid = set()
+		if resolution is None:
+			self.occupancy_grid = None
+			return
+		self.occupancy_grid = OccupancyGrid(width=self.width,length=self.length,resolution=resolution)
+		for shipment,boundaries in zip(getattr(self,'_shipments',[]),getattr(self,'_boundaries',[])):
+			self._grid_add(id(shipment),boundaries)
+
+	def _grid_add(self,key,boundaries):
+		'''
+		Register Shipment Boundaries in the Occupancy Grid, or as Off-Grid
+		'''
+		if self.occupancy_grid is None:
+			return
+		if self.occupancy_grid.is_aligned(boundaries):
+			self.occupancy_grid.add(boundaries)
+		else:
+			self._off_grid.add(key)
+
+	def _grid_remove(self,key,boundaries):
+		'''
+		Remove Shipment Boundaries from the Occupancy Grid
+		'''
+		if self.occupancy_grid is None:
+			return
+		if key in self._off_grid:
+			self._off_grid.discard(key)
+		else:
+			self.occupancy_grid.remove(boundaries)
+
+	def _on_grid(self,shipment):
+		'''
+		Check the Shipment is in the Trailer and Represented in the Occupancy Grid
+		'''
+		return (
+			self.occupancy_grid is not None and
+			id(shipment) in self._shipment_rows and
+			not id(shipment) in self._off_grid
+		)
+
+	def _get_off_grid_boundaries(self,shipment=None):
+		'''
+		Get Boundaries of Shipments not Represented in the Occupancy Grid, Excluding the Provided Shipment
+		'''
+		rows = [self._shipment_rows[key] for key in self._off_grid if key != id(shipment)]
+		return self._boundaries[np.array(rows,dtype=int)]
+
+	def _update_shipment_boundaries(self,shipment):
+		'''
+		Refresh the Stored Boundaries of a Shipment After it Moved, Rotated, or Changed Shape
+		'''
+		boundaries = shipment.get_boundaries()
+		row = self._shipment_rows[id(shipment)]
+		self._grid_remove(id(shipment),self._boundaries[row])
+		self._grid_add(id(shipment),boundaries)
+		self._boundaries[row] = boundaries
+		if self.spatial_index is not None:
+			self.spatial_index.update(id(shipment),boundaries)
+		self._push_front_extent(id(shipment),boundaries[0,1])
+		if self._front_extent is not None:
+			if boundaries[0,1] >= self._front_extent:
+				self._front_extent,self._front_key = boundaries[0,1],id(shipment)
+			elif self._front_key == id(shipment):
+				# Front-most shipment moved back, find the new one on the next lookup
+				self._front_extent = None
+
+	def _reset_front_extent(self):
+		'''
+		Rebuild Front-Most Extent Tracking from the Stored Boundaries
+		'''
+		self._extent_heap = [(-x1,id(s)) for s,x1 in zip(self._shipments,self._boundaries[:,0,1])]
+		heapq.heapify(self._extent_heap)
+		self._front_extent = None
+		self._front_key = None
+
+	def _push_front_extent(self,key,x1):
+		'''
+		Record the Length Axis End of a Shipment in the Extent Heap
+
+		Entries are never updated in place, outdated entries are dropped
+		when they reach the top of the heap or when the heap is rebuilt.
+		'''
+		heapq.heappush(self._extent_heap,(-x1,key))
+		if len(self._extent_heap) > 4 * len(self._shipments) + 64:
+			front_extent,front_key = self._front_extent,self._front_key
+			self._reset_front_extent()
+			self._front_extent,self._front_key = front_extent,front_key
+
+	def get_front_extent(self):
+		'''
+		Get Front-Most Length Axis Extent of the Shipments in the Trailer
+
+		The extent is tracked as shipments are added, moved, and removed
+		instead of being computed over all shipments.
+		
+		Returns
+		------------
+		front_extent : float
+			Largest shipment boundary along the trailer length, -inf if the trailer is empty
+		'''
+		if self._front_extent is None:
+			while len(self._extent_heap) > 0:
+				neg_x1,key = self._extent_heap[0]
+				row = self._shipment_rows.get(key)
+				if row is not None and self._boundaries[row,0,1] == -neg_x1:
+					break
+				heapq.heappop(self._extent_heap)
+			if len(self._extent_heap) > 0:
+				self._front_extent,self._front_key = -self._extent_heap[0][0],self._extent_heap[0][1]
+			else:
+				self._front_extent,self._front_key = -np.inf,None
+		return self._front_extent
+
+	def get_front_shipment(self):
+		'''
+		Get the Shipment Reaching Furthest Along the Trailer Length
+		'''
+		self.get_front_extent()
+		if self._front_key is None:
+			return None
+		return self._shipments[self._shipment_rows[self._front_key]]
+
+	def _index_shipments(self):
+		'''
+		Rebuild the Shipment to Boundary Row Lookup
+		'''
+		self._shipment_rows = {id(s) : i for i,s in enumerate(self._shipments)}
+
+	def __setstate__(self,state):
+		'''
+		Rebuild Lookups Keyed by Shipment Identity After Copying or Unpickling
+		'''
+		# Attributes held in the slots of base classes come as a separate dictionary
+		state,slot_state = state if isinstance(state,tuple) else (state,None)
+		self.__dict__.update(state)
+		for key,value in (slot_state or {}).items():
+			setattr(self,key,value)
+		self._index_shipments()
+		self._reset_front_extent()
+		self.set_spatial_index(self.spatial_index)
+		if self.occupancy_grid is not None:
+			self.set_occupancy_grid(self.occupancy_grid.resolution)
+
+	def get_shipment_boundaries(self,shipment=None):
+		'''
+		Get Stored Shipment Boundaries
+
+		Boundaries of all shipments are kept in a single (n,3,2) array,
+		ordered like `shipments`, and updated whenever a shipment in the
+		trailer is added, removed, moved, or rotated.
+
+		Parameters
+		------------
+		shipment : logistics_objects.Shipment
+			Shipment to get boundaries for, all shipments if None
+		
+		Returns
+		------------
+		boundaries : np.ndarray
+			Array of shape (n,3,2) for all shipments, or (3,2) for the provided shipment
+		'''
+		if shipment is None:
+			return self._boundaries
+		if id(shipment) in self._shipment_rows:
+			return self._boundaries[self._shipment_rows[id(shipment)]]
+		return shipment.get_boundaries()
+
+	def set_configuration(self,positions,is_rotated,shipments=None):
+		'''
+		Move and Rotate All Shipments in the Trailer at Once
+
+		Shipments are rotated only where their orientation differs, the
+		positions are written without notifying the trailer shipment by
+		shipment, and the stored boundaries, front extent, spatial index,
+		and occupancy grid are rebuilt once from the cached piece extents.
+
+		Parameters
+		------------
+		positions : np.ndarray
+			Array of shape (n,3) with the position of each shipment
+		is_rotated : np.ndarray
+			Array of length n with the orientation of each shipment
+		shipments : List[logistics_objects.Shipment]
+			All shipments of the trailer, in the order of `positions` and `is_rotated`, the order of `shipments` if None
+
+		Returns
+		------------
+		None
+		'''
+		positions = np.asarray(positions,dtype=float).reshape(-1,3)
+		is_rotated = np.asarray(is_rotated,dtype=bool)
+		assert len(positions) == len(self._shipments) and len(is_rotated) == len(self._shipments)
+		if shipments is not None:
+			rows = np.array([self._shipment_rows[id(s)] for s in shipments],dtype=int)
+			assert len(set(rows.tolist())) == len(self._shipments)
+			order = np.argsort(rows)
+			positions,is_rotated = positions[order],is_rotated[order]
+		for shipment,rotated in zip(self._shipments,is_rotated):
+			if bool(rotated) != shipment.is_rotated:
+				shipment.rotate()
+		# Boundary rows are rebuilt below, so shipments do not notify the trailer as they move
+		for shipment,position in zip(self._shipments,positions.tolist()):
+			shipment._set_position(position)
+		if len(self._shipments) > 0:
+			self._boundaries = np.array([s.get_local_boundaries() for s in self._shipments]) + positions[:,:,None]
+		self._reset_front_extent()
+		self.set_spatial_index(self.spatial_index)
+		if self.occupancy_grid is not None:
+			self.set_occupancy_grid(self.occupancy_grid.resolution)
+
 	def get_boundaries(self):
 		'''
 		Get Trailer Profile
@@ -39,17 +318,12 @@ class Trailer(LogisticsObject):
 			boundaries = np.array([0,0,0,0,0,0])
 			boundaries.shape = (3,2)
 			return boundaries
-		boundaries = np.array([np.inf,-np.inf,np.inf,-np.inf,np.inf,-np.inf])
-		boundaries.shape = (3,2)
-		for shipment in self.shipments:
-			shipment_boundaries = shipment.get_boundaries()
-			for i in range(3):
-				boundaries[i,0] = min([boundaries[i,0],shipment_boundaries[i,0]])
-				boundaries[i,1] = max([boundaries[i,1],shipment_boundaries[i,1]])
-		for i in range(3):
-			boundaries[i,0] += self.position[i]
-			boundaries[i,1] += self.position[i]
-		return boundaries
+		boundaries = np.stack([
+			self._boundaries[:,:,0].min(axis=0),
+			self._boundaries[:,:,1].max(axis=0),
+		],axis=1)
+		boundaries[0,1] = self.get_front_extent()
+		return boundaries + np.asarray(self.position)[:,None]
 	
 	def add_shipment(self,shipment):
 		'''
@@ -58,53 +332,78 @@ class Trailer(LogisticsObject):
 		if isinstance(shipment,Shipment):
 			shipment = [shipment]
 		assert all([isinstance(s,Shipment) for s in shipment])
-		self.shipments += shipment
+		if len(shipment) == 0:
+			return
+		first_row = len(self._shipments)
+		self._shipments += shipment
+		self._boundaries = np.concatenate(
+			[self._boundaries,np.array([s.get_boundaries() for s in shipment],dtype=float)]
+		)
+		for row,s in enumerate(shipment,first_row):
+			s._trailer = self
+			if self.spatial_index is not None:
+				self.spatial_index.insert(id(s),self._boundaries[row])
+			self._grid_add(id(s),self._boundaries[row])
+			self._push_front_extent(id(s),self._boundaries[row,0,1])
+			if self._front_extent is not None and self._boundaries[row,0,1] >= self._front_extent:
+				self._front_extent,self._front_key = self._boundaries[row,0,1],id(s)
+		self._index_shipments()
 
 	def remove_shipment(self,shipment):
 		'''
 		Remove Shipment from Trailer
 		'''
 		if isinstance(shipment,Shipment):
-			self.shipments = [s for s in self.shipments if s != shipment]
-			return shipment
+			keep = [s != shipment for s in self._shipments]
 		elif isinstance(shipment,int):
-			return self.shipments.pop(shipment)
+			keep = [True] * len(self._shipments)
+			keep[shipment] = False
+			shipment = self._shipments[shipment]
 		else:
 			raise Exception(f'Data type for {shipment} not recognized')
+		if not all(keep):
+			self._grid_remove(id(shipment),self._boundaries[keep.index(False)])
+			self._shipments = [s for s,k in zip(self._shipments,keep) if k]
+			self._boundaries = self._boundaries[np.array(keep,dtype=bool)]
+			shipment._trailer = None
+			if self.spatial_index is not None:
+				self.spatial_index.remove(id(shipment))
+			self._index_shipments()
+			if self._front_key == id(shipment):
+				self._front_extent = None
+		return shipment
+
+	@property
+	def binpack_bin(self):
+		'''
+		Bin Packing Object Associated to This Trailer, Built on First Use
+		'''
+		if self._binpack_bin is None:
+			self._set_binpack_bin()
+			allow_rotations,kwargs = self._binpack_bin_kwargs
+			bin_class = Bin if allow_rotations else NoRotateBin
+			self._binpack_bin = bin_class(
+				name = kwargs.get('name',getattr(self,'name','Unnamed Shipment Object')),
+				width = kwargs.get('width',self.width), 
+				height = kwargs.get('length',self.length),
+				depth = kwargs.get('height',self.height),
+				max_weight = kwargs.get('max_weight',self.max_weight)
+			)
+		return self._binpack_bin
 
 	def _set_binpack_bin(self,allow_rotations=True,*args,**kwargs):
 		'''
-		Set Bin Packing Object
+		Set Overrides of the Bin Packing Object, Built when `binpack_bin` is Used
 		'''
 		if not self._binpack_bin_exists:
-			width = kwargs.get('width',self.width)
-			height = kwargs.get('height',self.height)
-			length = kwargs.get('length',self.length)
-			max_weight = kwargs.get('max_weight',self.max_weight)
-			if allow_rotations:
-				self.binpack_bin = Bin(
-					name = kwargs.get('name',getattr(self,'name','Unnamed Shipment Object')),
-					width = width, 
-					height = length,
-					depth = height,
-					max_weight = max_weight
-				)
-			else:
-				self.binpack_bin = NoRotateBin(
-					name = kwargs.get('name',getattr(self,'name','Unnamed Shipment Object')),
-					width = width, 
-					height = length,
-					depth = height,
-					max_weight = max_weight
-				)
+			self._binpack_bin_kwargs = (allow_rotations,kwargs)
 			self._binpack_bin_exists = True
 	
 	def _delete_binpack_bin(self):
 		'''
 		Delete Bin Pack Item
 		'''
-		if hasattr(self,'binpack_item'):
-			delattr(self,'binpack_item')
+		self._binpack_bin = None
 		self._binpack_bin_exists = False
 	
 	def _update_binpack_bin(self,allow_rotations=True,*args,**kwargs):
@@ -114,41 +413,167 @@ class Trailer(LogisticsObject):
 		self._delete_binpack_bin()
 		self._set_binpack_bin(allow_rotations=allow_rotations,*args,**kwargs)
 	
+	def _in_trailer(self,boundaries):
+		'''
+		Check Boundaries, of shape (3,2) or (n,3,2), are Inside the Trailer
+		'''
+		trailer_boundaries = np.array([[0,self.length],[0,self.width],[0,self.height]])
+		return np.all(
+			(boundaries[...,0] >= trailer_boundaries[:,0]) & (boundaries[...,1] <= trailer_boundaries[:,1]),
+			axis=-1
+		)
+
 	def arrangement_is_valid(self,shipment=None):
 		'''
 		Validate that the Arrangement of Shipments in Trailer is Physically Possible
+
+		Parameters
+		------------
+		shipment : logistics_objects.Shipment
+			Only validate the placement of this shipment against the trailer 
+			walls and the other shipments when provided, validate the whole
+			arrangement if None
+		
+		Returns
+		------------
+		is_valid : bool
+			True if the arrangement is physically possible, False if not
 		'''
-		trailer_boundaries = np.array([[0,self.length],[0,self.width],[0,self.height]])
 		if shipment is None:
-			shipment_boundaries_list = [shipment.get_boundaries() for shipment in self.shipments]
-			for i in range(len(shipment_boundaries_list)):
-				s_i = shipment_boundaries_list[i]
-				# Validate shipment is inside the trailer
-				in_trailer = all(
-					[interval_is_subset(s_i[k],trailer_boundaries[k]) for k in range(3)]
-				)
-				if not in_trailer:
-					return False
-				for j in range(i):
-					s_j = shipment_boundaries_list[j]
-					# Validate shipment does not occupy the same space as any other previous shipment
-					overlap = all(
-						[intervals_overlap(s_i[k],s_j[k]) for k in range(3)]
-					)
-					if overlap:
-						return False
-			return True
-		else:
-			shipment_boundaries_list = [s.get_boundaries() for s in self.shipments if s != shipment]
-			s_i = shipment.get_boundaries()
-			in_trailer = all([interval_is_subset(s_i[k],trailer_boundaries[k]) for k in range(3)])
-			if not in_trailer:
+			if not np.all(self._in_trailer(self._boundaries)):
+				return False
+			return len(get_overlapping_pairs(self._boundaries)) == 0
+		s_i = self.get_shipment_boundaries(shipment)
+		if not self._in_trailer(s_i):
+			return False
+		if self._on_grid(shipment):
+			if not self.occupancy_grid.is_free(s_i,own=1):
 				return False
-			for s_j in shipment_boundaries_list:
-				overlap = all([intervals_overlap(s_i[k],s_j[k]) for k in range(3)])
-				if overlap:
-					return False
-			return True
+			others = self._get_off_grid_boundaries(shipment)
+		else:
+			others = self._get_neighbor_boundaries(shipment,s_i)
+		overlap = np.all(
+			(others[:,:,0] < s_i[:,1]) & (others[:,:,1] > s_i[:,0]),
+			axis=1
+		)
+		return not np.any(overlap)
+
+	def placements_overlap(self,boundaries):
+		'''
+		Check Candidate Placements Against the Shipments in the Trailer
+
+		Parameters
+		------------
+		boundaries : np.ndarray
+			Array of shape (k,3,2) of candidate boundaries for a shipment not in the trailer
+		
+		Returns
+		------------
+		overlap : np.ndarray
+			Boolean array of shape (k,), True where the candidate overlaps a shipment in the trailer
+		'''
+		def any_overlap(candidates,others):
+			return np.any(np.all(
+				(others[None,:,:,0] < candidates[:,None,:,1]) & (others[None,:,:,1] > candidates[:,None,:,0]),
+				axis=2
+			),axis=1)
+		if self.occupancy_grid is None:
+			return any_overlap(boundaries,self._boundaries)
+		on_grid = self.occupancy_grid.is_aligned(boundaries)
+		overlap = np.zeros(len(boundaries),dtype=bool)
+		overlap[~on_grid] = any_overlap(boundaries[~on_grid],self._boundaries)
+		overlap[on_grid] = (
+			~self.occupancy_grid.windows_are_free(boundaries[on_grid]) |
+			any_overlap(boundaries[on_grid],self._get_off_grid_boundaries())
+		)
+		return overlap
+
+	def get_arrangement_violations(self):
+		'''
+		Get Shipments that Make the Trailer Arrangement Physically Impossible
+
+		Diagnostic companion to `arrangement_is_valid`, the arrangement is 
+		valid exactly when both returned lists are empty.
+
+		Returns
+		------------
+		violations : Dict
+			Dictionary with `outside_trailer`, the list of shipments not fully
+			inside the trailer, and `overlapping_pairs`, the list of tuples of
+			shipments occupying the same space
+		'''
+		outside = np.flatnonzero(~self._in_trailer(self._boundaries))
+		pairs = get_overlapping_pairs(self._boundaries)
+		return {
+			'outside_trailer' : [self.shipments[i] for i in outside],
+			'overlapping_pairs' : [(self.shipments[i],self.shipments[j]) for i,j in pairs],
+		}
+
+	def _get_neighbor_boundaries(self,shipment,boundaries):
+		'''
+		Get Boundaries of the Other Shipments that may Overlap the Provided Boundaries
+
+		All other shipments are returned when the trailer has no spatial index.
+		'''
+		if self.spatial_index is None:
+			if id(shipment) in self._shipment_rows:
+				return np.delete(self._boundaries,self._shipment_rows[id(shipment)],axis=0)
+			return self._boundaries
+		keys = self.spatial_index.query(boundaries)
+		keys.discard(id(shipment))
+		return self._boundaries[[self._shipment_rows[key] for key in keys]]
+
+	def get_max_displacement(self,shipment,axis : int,direction : int):
+		'''
+		Get the Maximum Distance a Shipment can Move Along an Axis Without Collision
+
+		Only shipments overlapping the moving shipment's projection onto the
+		other two axes can block it, so the distance is the smallest gap to
+		one of those shipments or to the trailer wall.  The shipment's current
+		position is assumed to be valid.
+
+		Parameters
+		------------
+		shipment : logistics_objects.Shipment
+			Shipment to be moved
+		axis : int
+			Axis of movement, 0 for length, 1 for width, and 2 for height
+		direction : int
+			-1 for movement toward the origin, 1 for movement away from it
+		
+		Returns
+		------------
+		distance : float
+			Maximum distance the shipment can move before colliding
+		'''
+		trailer_dims = [self.length,self.width,self.height]
+		s_i = self.get_shipment_boundaries(shipment)
+		if direction < 0:
+			distance = s_i[axis,0]
+		else:
+			distance = trailer_dims[axis] - s_i[axis,1]
+		if self._on_grid(shipment) and axis < 2:
+			distance = min(distance,self.occupancy_grid.get_free_distance(s_i,axis,direction))
+			others = self._get_off_grid_boundaries(shipment)
+		else:
+			others = self._boundaries
+			if id(shipment) in self._shipment_rows:
+				others = np.delete(others,self._shipment_rows[id(shipment)],axis=0)
+		if len(others) == 0:
+			return distance
+		cross_axes = [k for k in range(3) if k != axis]
+		in_projection = np.all(
+			(others[:,cross_axes,0] < s_i[cross_axes,1]) & (others[:,cross_axes,1] > s_i[cross_axes,0]),
+			axis=1
+		)
+		if direction < 0:
+			gaps = s_i[axis,0] - others[in_projection,axis,1]
+		else:
+			gaps = others[in_projection,axis,0] - s_i[axis,1]
+		gaps = gaps[gaps >= 0]
+		if len(gaps) > 0:
+			distance = min(distance,gaps.min())
+		return distance
 
 	def balance(self):
 		'''
@@ -156,7 +581,7 @@ class Trailer(LogisticsObject):
 		'''
 		trailer_center = self.width / 2
 		for shipment in self.shipments:
-			boundaries = shipment.get_boundaries()
+			boundaries = self.get_shipment_boundaries(shipment)
 			center = np.mean(boundaries[1,:])
 			if center < trailer_center:
 				shipment.slide_left(self)
@@ -212,6 +637,36 @@ class Trailer(LogisticsObject):
 		boundaries = self.get_boundaries()
 		return DIMENSION_CONVERTER[self.default_dimension_units][options.DimUomFeet](boundaries[0,1] - boundaries[0,0])
 
+	def get_linear_feet_lower_bound(self,allow_rotations : bool = True):
+		'''
+		Get a Lower Bound on the Linear Feet of Any Valid Load Plan of the Shipments in the Trailer
+
+		Shipments stand on the trailer floor, so a load plan is at least as
+		long as the floor area of the shipments divided by the trailer
+		width, and at least as long as the shortest orientation of each
+		shipment that fits across the trailer width.
+
+		Parameters
+		------------
+		allow_rotations : bool
+			Allow shipments to be rotated when loading
+
+		Returns
+		------------
+		linear_feet : float
+			Linear feet no load plan of the shipments can go below
+		'''
+		if len(self._shipments) == 0:
+			return 0.
+		dims = np.array([(s.length,s.width) for s in self._shipments])
+		lengths = np.where(dims[:,1] <= self.width,dims[:,0],np.inf)
+		if allow_rotations:
+			lengths = np.minimum(lengths,np.where(dims[:,0] <= self.width,dims[:,1],np.inf))
+		# Shipments too wide in either orientation cannot be loaded, and do not bound the length
+		lengths[~np.isfinite(lengths)] = 0
+		linear_inches = max(np.prod(dims,axis=1).sum() / self.width,lengths.max())
+		return DIMENSION_CONVERTER[self.default_dimension_units][options.DimUomFeet](linear_inches)
+
 	def _set_weight(self):
 		'''
 		Calculate and Update Trailer Total Weight
@@ -221,47 +676,31 @@ class Trailer(LogisticsObject):
 		else:
 			self.weight = sum([shipment.weight for shipment in self.shipments])
 
-	def get_load_order(self):
+	def get_piece_table(self):
+		'''
+		Get Columnar Table of the Pieces Loaded in the Trailer, see `PieceTable`
+		'''
+		return PieceTable.from_shipments(self.shipments)
+
+	def get_load_order(self,piece_table : PieceTable = None):
 		'''
 		Get Load Plan in the Order They Need to be Loaded
 		'''
-		load_order = {}
-		idx = 1
-		for shipment in sorted(self.shipments,key=lambda x : x.position[0] * 10000 + x.position[1]):
-			for piece in sorted(shipment.pieces,key=lambda x : x.position[2]):
-				load_order.update({
-					idx : {
-						'name' : piece.name,
-						'position' : list(shipment.position + piece.position),
-						'piece_width' : piece.width,
-						'piece_length' : piece.length,
-						'piece_height' : piece.height,
-						'piece_weight' : piece.weight,
-						'piece_packing' : piece.packing,
-						'piece_is_rotated' : piece.is_rotated,
-						'piece_is_stacked' : piece.position[2] > 0,
-					}
-				})
-				idx += 1
-		return load_order
+		if piece_table is None:
+			piece_table = self.get_piece_table()
+		return piece_table.get_load_order()
 
 	def get_summary(self):
 		'''
 		Get Summary of Optimized Trailer Load Plan
 		'''
-		num_pieces = sum([len(shipment.pieces) for shipment in self.shipments])
-		volume = 0
-		for shipment in self.shipments:
-			for piece in shipment.pieces:
-				volume += piece.length * piece.width * piece.height
-
-		actual_cube = 0
-		for shipment in self.shipments:
-			shipment._set_dims()
-			actual_cube += sum([piece.length * piece.width * piece.height for piece in shipment.pieces])
+		piece_table = self.get_piece_table()
+		num_pieces = len(piece_table)
+		actual_cube = float(piece_table.get_volumes().sum())
 
-		stacked_cube = sum([shipment.length * shipment.width * shipment.height for shipment in self.shipments])
-		trailer_cube = sum([shipment.length * shipment.width * self.height for shipment in self.shipments])
+		shipment_dims = piece_table.get_shipment_dims()
+		stacked_cube = float(np.prod(shipment_dims,axis=1).sum())
+		trailer_cube = float((shipment_dims[:,0] * shipment_dims[:,1] * self.height).sum())
 
 		linear_feet = self.get_linear_feet()
 
@@ -294,7 +733,7 @@ class Trailer(LogisticsObject):
 			'stacked_cube_portion_of_trailer' : round(stacked_cube_portion_of_trailer,3),
 			'trailer_cube_portion_of_trailer' : round(trailer_cube_portion_of_trailer,3),
 
-			'load_order' : self.get_load_order()
+			'load_order' : self.get_load_order(piece_table=piece_table)
 		}
 		return trailer_stats
 
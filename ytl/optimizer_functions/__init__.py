@@ -3,9 +3,11 @@ from .shipment_arrangement.naive import naive_shipment_arrangement, naive_shipme
 from .shipment_arrangement.bin_packing import no_stack_trailer_arrange, no_stack_bin_pack_shipment_arrangement_details
 from .shipment_arrangement.simple_movements import slide_shipments_back, simple_movement_slide_back_shipment_arrangement_details
 from .shipment_arrangement.greedy import greedy_trailer_load, greedy_shipment_arrangement_details
+from .shipment_arrangement.rectangle_packing import maxrects_trailer_arrange, maxrects_shipment_arrangement_details, skyline_trailer_arrange, skyline_shipment_arrangement_details
+from .shipment_arrangement.skyline import skyline_trailer_load, skyline_greedy_shipment_arrangement_details
 
-from .piece_arrangement.naive import naive_piece_arrangement, naive_piece_arrangement_details
-from .piece_arrangement.greedy import greedy_stack_pieces, greedy_stack_piece_arrangement_details
+from .piece_arrangement.naive import naive_piece_arrangement, naive_piece_group_arrangement, naive_piece_arrangement_details
+from .piece_arrangement.greedy import greedy_stack_pieces, greedy_stack_piece_groups, greedy_stack_piece_arrangement_details
 
 
 PIECE_ARRANGEMENT_ROUTER = {
@@ -13,11 +15,20 @@ PIECE_ARRANGEMENT_ROUTER = {
 	'GREEDY_STACK': (greedy_stack_pieces, greedy_stack_piece_arrangement_details),
 }
 
+# Piece arrangement algorithms working on groups of identical pieces, same keys as `PIECE_ARRANGEMENT_ROUTER`
+PIECE_GROUP_ARRANGEMENT_ROUTER = {
+	'NAIVE': (naive_piece_group_arrangement, naive_piece_arrangement_details),
+	'GREEDY_STACK': (greedy_stack_piece_groups, greedy_stack_piece_arrangement_details),
+}
+
 SHIPMENT_ARRANGEMENT_ROUTER = {
 	'NAIVE': (naive_shipment_arrangement, naive_shipment_arrangement_details),
 	'NO_STACK_BIN_PACK': (no_stack_trailer_arrange, no_stack_bin_pack_shipment_arrangement_details),
 	'SLIDE_BACK': (slide_shipments_back, simple_movement_slide_back_shipment_arrangement_details),
 	'GREEDY_LOAD': (greedy_trailer_load, greedy_shipment_arrangement_details),
+	'MAXRECTS_PACK': (maxrects_trailer_arrange, maxrects_shipment_arrangement_details),
+	'SKYLINE_PACK': (skyline_trailer_arrange, skyline_shipment_arrangement_details),
+	'SKYLINE_LOAD': (skyline_trailer_load, skyline_greedy_shipment_arrangement_details),
 }
 
 def optimize_pieces_arrangement(pieces,algorithm : str,**kwargs):
@@ -51,6 +62,33 @@ def optimize_pieces_arrangement(pieces,algorithm : str,**kwargs):
 	return PIECE_ARRANGEMENT_ROUTER[algorithm][0](pieces=pieces,**kwargs)
 
 
+def optimize_piece_groups_arrangement(groups,algorithm : str,**kwargs):
+	'''
+	Piece Group Arrangement Optimization Router Function
+
+	Same as `optimize_pieces_arrangement`, for pieces provided as groups
+	of identical pieces.  Router function leverages
+	`PIECE_GROUP_ARRANGEMENT_ROUTER`, whose functions build the same
+	shipments as their counterparts in `PIECE_ARRANGEMENT_ROUTER`.
+
+	Parameters
+	-------------
+	groups : List[logistics_objects.PieceGroup]
+		List of piece groups to be arranged into shipments
+	algorithm : str
+		Algorithm key, options are the keys of `PIECE_GROUP_ARRANGEMENT_ROUTER`
+
+	Returns
+	-------------
+	shipments : List[logistics_objects.Shipment]
+		List of shipments made up of the pieces of provided groups
+
+	'''
+	if not algorithm in PIECE_GROUP_ARRANGEMENT_ROUTER.keys():
+		raise NotImplementedError(f'Algorithm `{algorithm}` has not been implemented')
+	return PIECE_GROUP_ARRANGEMENT_ROUTER[algorithm][0](groups=groups,**kwargs)
+
+
 def optimize_shipment_arrangement(trailer,algorithm,**kwargs):
 	'''
 	Shipment Arrangement Optimization Router Function
@@ -1,7 +1,8 @@
 
 from typing import List
 from ...logistics_objects import Shipment
-from ...utils import list_allocate
+from .naive import replicate_shipment, naive_piece_group_arrangement
+from bisect import bisect_left
 import numpy as np
 
 greedy_stack_piece_arrangement_details = {
@@ -10,7 +11,61 @@ greedy_stack_piece_arrangement_details = {
 	'desc' : 'Greedy stacking algorithm to stack smaller pieces on top of larger pieces to make shipments',
 }
 
-def try_to_stack(shipment, idx : int, trailer_height : float, allocated_pieces : List[int], available_pieces : List[int], stackable_pieces : List, allow_rotations : bool=True):
+class StackProfile:
+	'''
+	Running State of a Stack of Pieces
+
+	Keeps the quantities `Shipment.can_stack` derives from all pieces in
+	the stack, updated as pieces are stacked, so checking a piece does not
+	depend on the size of the stack.
+	'''
+
+	def __init__(self, piece):
+		self.min_length = piece.length
+		self.min_width = piece.width
+		self.total_height = piece.height
+		self.num_pieces = 1
+		self.stack_limit = piece.stack_limit
+		self.has_box = piece.packing == 'BOX'
+
+	def get_footprint_bound(self):
+		'''
+		Largest Footprint Sort Key of a Piece that can Fit on the Stack, in either Orientation
+		'''
+		return self.min_length ** .5 + self.min_width ** .5
+
+	def is_full(self):
+		'''
+		Check No Further Piece can be Stacked Because of the Stack Limit
+		'''
+		return self.num_pieces >= self.stack_limit
+
+	def can_stack(self, piece, trailer_height : float):
+		'''
+		Check if Provided Piece can be Stacked on top of the Stack, see `Shipment.can_stack`
+		'''
+		# Allow stacking pallets on pallets, boxes on boxes, and boxes on pallets, but not pallets on boxes.
+		return (
+			(piece.length <= self.min_length) and
+			(piece.width <= self.min_width) and
+			(self.total_height + piece.height <= trailer_height) and
+			(self.num_pieces < min(self.stack_limit, piece.stack_limit)) and
+			not (piece.packing == 'PALLET' and self.has_box)
+		)
+
+	def add(self, piece):
+		'''
+		Update the Stack State for a Stacked Piece
+		'''
+		self.min_length = min(self.min_length, piece.length)
+		self.min_width = min(self.min_width, piece.width)
+		self.total_height += piece.height
+		self.num_pieces += 1
+		self.stack_limit = min(self.stack_limit, piece.stack_limit)
+		self.has_box = self.has_box or piece.packing == 'BOX'
+
+
+def try_to_stack(shipment, profile : StackProfile, piece, trailer_height : float, allow_rotations : bool=True):
 	'''
 	Try to Stack Piece
 
@@ -18,16 +73,12 @@ def try_to_stack(shipment, idx : int, trailer_height : float, allocated_pieces :
 	------------
 	shipment : logistics_objects.Shipment
 		Shipment object attemping to be stacked on
-	idx : int
-		Index of piece proposed to be stacked on shipment
+	profile : StackProfile
+		Running state of the pieces in the shipment
+	piece : logistics_objects.Piece
+		Piece proposed to be stacked on shipment
 	trailer_height : float
 		Height of trailer
-	allocated_pieces : List[int]
-		List of indices for pieces already allocated to shipments
-	available_pieces : List[int]
-		List of indices for pieces unallocated and available to be added to shipments
-	stackable_pieces : List[logistics_objects.Shipment]
-		List of pieces that are stackable
 	allow_rotations : bool
 		Allow rotation of pieces when attempting to stack
 	
@@ -36,36 +87,47 @@ def try_to_stack(shipment, idx : int, trailer_height : float, allocated_pieces :
 	added_piece_to_shipment : bool
 		True if piece was added to shipment, False if not
 	'''
-	if idx in allocated_pieces:
-		return False
-	piece = stackable_pieces[idx]
-	can_stack = shipment.can_stack(
-		piece=piece,
-		trailer_height=trailer_height
-	)
-	if can_stack:
+	if profile.can_stack(piece=piece, trailer_height=trailer_height):
 		shipment.stack(piece)
-		list_allocate(idx, allocated_pieces, available_pieces)
+		profile.add(piece)
 		return True
 	elif allow_rotations:
 		piece.rotate()
-		can_stack = shipment.can_stack(
-			piece=piece,
-			trailer_height=trailer_height
-		)
-		if can_stack:
+		if profile.can_stack(piece=piece, trailer_height=trailer_height):
 			shipment.stack(piece)
-			list_allocate(idx, allocated_pieces, available_pieces)
+			profile.add(piece)
 			return True
 		else:
 			piece.rotate()
 	return False
 
 
+def get_next_available(next_available : List[int], pos : int):
+	'''
+	Get First Unallocated Position at or After `pos`
+
+	`next_available` points each allocated position further along the
+	sort order, and paths are compressed as they are followed.
+	'''
+	root = pos
+	while next_available[root] != root:
+		root = next_available[root]
+	while next_available[pos] != root:
+		next_available[pos], pos = root, next_available[pos]
+	return root
+
+
 def greedy_stack_pieces(pieces : List, trailer_height : int, allow_rotations : bool=True, **kwargs):
 	'''
 	Allocate Provided Pieces into Shipments Using a Simple Greedy Stacking Algorithm
 
+	Stackable pieces are sorted by footprint, largest first.  Each stack
+	starts with the largest unallocated piece, and the other unallocated
+	pieces are tried on top of it in sort order.  Pieces with a footprint
+	sort key above that of the top of the stack cannot fit and are
+	skipped by bisection, allocated pieces are skipped through
+	`get_next_available`, and a stack at its stack limit is closed.
+
 	Parameters
 	------------
 	pieces : List[logistics_objects.Piece]
@@ -84,35 +146,227 @@ def greedy_stack_pieces(pieces : List, trailer_height : int, allow_rotations : b
 	stackable_pieces = [p for p in pieces if p.stack_limit > 1]
 
 	shipments = []
-	allocated_pieces = []
-	available_pieces = list(range(len(stackable_pieces)))
-
-	sorted_indices = np.argsort(
-		[p.length ** .5 + p.width ** .5 for p in stackable_pieces]
-	)[::-1]
-	count = 0
-	max_iter = len(available_pieces) + 1
-	while len(available_pieces) > 0 and count < max_iter:
-		bottom_idx = [i for i in sorted_indices if i in available_pieces][0]
-		list_allocate(bottom_idx, allocated_pieces, available_pieces)
-		shipment = Shipment(pieces=stackable_pieces[bottom_idx])
-		sorted_indices = np.argsort(
-			[p.length ** .5 + p.width ** .5 for p in stackable_pieces]
-		)[::-1]
-		for idx in sorted_indices:
-			_ = try_to_stack(
+	# Sort key is unchanged by rotations, so the sort order is fixed
+	sort_keys = np.array([p.length ** .5 + p.width ** .5 for p in stackable_pieces])
+	sorted_indices = np.argsort(sort_keys)[::-1]
+	sorted_pieces = [stackable_pieces[i] for i in sorted_indices]
+	# Negated keys are non-decreasing along the sort order
+	negated_sort_keys = list(-sort_keys[sorted_indices])
+	num_pieces = len(sorted_pieces)
+	next_available = list(range(num_pieces + 1))
+
+	bottom_pos = get_next_available(next_available, 0)
+	while bottom_pos < num_pieces:
+		next_available[bottom_pos] = bottom_pos + 1
+		shipment = Shipment(pieces=sorted_pieces[bottom_pos])
+		profile = StackProfile(sorted_pieces[bottom_pos])
+		pos = 0
+		while not profile.is_full():
+			pos = max(pos, bisect_left(negated_sort_keys, -profile.get_footprint_bound()))
+			pos = get_next_available(next_available, pos)
+			if pos >= num_pieces:
+				break
+			if try_to_stack(
 				shipment=shipment,
-				idx=idx,
+				profile=profile,
+				piece=sorted_pieces[pos],
 				trailer_height=trailer_height,
-				allocated_pieces=allocated_pieces,
-				available_pieces=available_pieces,
-				stackable_pieces=stackable_pieces,
-				allow_rotations=allow_rotations
-			)
+				allow_rotations=allow_rotations,
+			):
+				next_available[pos] = pos + 1
+			pos += 1
 		shipment._set_dims()
 		shipments += [shipment]
+		bottom_pos = get_next_available(next_available, 0)
 	for piece in unstackable_pieces:
 		shipment = Shipment(pieces=piece)
 		shipment._set_dims()
 		shipments += [shipment]
 	return shipments
+
+
+def stack_piece_group(profile : StackProfile, group, num_available : int, trailer_height : float, allow_rotations : bool=True):
+	'''
+	Stack as Many Pieces of a Group as Fit on a Stack
+
+	Same outcome as `try_to_stack` on the available pieces of the group
+	one at a time:  the orientation that takes the first piece takes the
+	following ones, until the stack height or stack limit is reached.
+
+	Parameters
+	------------
+	profile : StackProfile
+		Running state of the stack, updated for the stacked pieces
+	group : logistics_objects.PieceGroup
+		Group of pieces proposed to be stacked
+	num_available : int
+		Number of pieces of the group left to allocate
+	trailer_height : float
+		Height of trailer
+	allow_rotations : bool
+		Allow rotation of pieces when attempting to stack
+
+	Returns
+	------------
+	num_stacked : int
+		Number of pieces of the group stacked
+	rotated : bool
+		True if the stacked pieces are rotated
+	'''
+	for rotated in ([False, True] if allow_rotations else [False]):
+		piece = group.get_template(rotated)
+		num_stacked = 0
+		while num_stacked < num_available and profile.can_stack(piece=piece, trailer_height=trailer_height):
+			profile.add(piece)
+			num_stacked += 1
+		if num_stacked > 0:
+			return num_stacked, rotated
+	return 0, False
+
+
+class PieceGroupRun:
+	'''
+	Pieces of a Piece Group Next to Each Other in the Sort Order of `greedy_stack_pieces`
+
+	Has the attributes of a `PieceGroup` used by `greedy_stack_piece_groups`,
+	with its pieces mapped to their indices within the group.
+	'''
+
+	def __init__(self, group, piece_indices : List[int]):
+		self.group = group
+		self.piece_indices = piece_indices
+		self.count = len(piece_indices)
+		self.length = group.length
+		self.width = group.width
+		self.stack_limit = group.stack_limit
+
+	def get_template(self, rotated : bool = False):
+		return self.group.get_template(rotated)
+
+	def get_piece_name(self, j : int):
+		return self.group.get_piece_name(self.piece_indices[j])
+
+	def make_piece(self, j : int, rotated : bool = False):
+		return self.group.make_piece(self.piece_indices[j], rotated=rotated)
+
+
+def get_piece_group_runs(groups : List):
+	'''
+	Split the Pieces of Groups into Runs of One Group, in the Order `greedy_stack_pieces` Sorts the Pieces
+
+	Pieces are sorted the way `greedy_stack_pieces` sorts the pieces of
+	the groups in the order they are provided, ties included, so both
+	allocate the same pieces in the same order.
+
+	Parameters
+	------------
+	groups : List[logistics_objects.PieceGroup]
+		List of piece groups
+
+	Returns
+	-----------
+	runs : List[PieceGroupRun]
+		Runs of consecutive pieces of one group, in sort order
+	'''
+	if len(groups) == 0:
+		return []
+	counts = [g.count for g in groups]
+	group_ids = np.repeat(np.arange(len(groups)), counts)
+	piece_ids = np.concatenate([np.arange(count) for count in counts])
+	sort_keys = np.repeat([g.length ** .5 + g.width ** .5 for g in groups], counts)
+	sorted_indices = np.argsort(sort_keys)[::-1]
+	sorted_group_ids = group_ids[sorted_indices]
+	starts = np.concatenate([[0], np.flatnonzero(np.diff(sorted_group_ids)) + 1])
+	return [
+		PieceGroupRun(groups[sorted_group_ids[start]], piece_ids[indices].tolist())
+		for start, indices in zip(starts, np.split(sorted_indices, starts[1:]))
+	]
+
+
+def greedy_stack_piece_groups(groups : List, trailer_height : int, allow_rotations : bool=True, **kwargs):
+	'''
+	Allocate Provided Piece Groups into Shipments Using the Greedy Stacking Algorithm
+
+	Builds the same shipments as `greedy_stack_pieces` on the pieces of
+	the groups, in the order the groups are provided.  Stacks are built
+	from runs of pieces of one group in the sort order (see
+	`get_piece_group_runs`) rather than from pieces, and a stack is
+	repeated without building it again for as long as every run it uses
+	has enough pieces left.
+
+	Parameters
+	------------
+	groups : List[logistics_objects.PieceGroup]
+		List of piece groups to be allocated into shipments
+	trailer_height : int
+		Trailer height
+	allow_rotations : bool
+		Allows pieces to be rotated if True, does not allow rotation otherwise.
+
+	Returns
+	-----------
+	shipments : List[logistics_objects.Shipment]
+		List of shipments composed of the pieces of the provided groups
+	'''
+	unstackable_groups = [g for g in groups if g.stack_limit <= 1]
+	stackable_groups = [g for g in groups if g.stack_limit > 1]
+
+	shipments = []
+	sorted_groups = get_piece_group_runs(stackable_groups)
+	negated_sort_keys = [-(g.length ** .5 + g.width ** .5) for g in sorted_groups]
+	num_groups = len(sorted_groups)
+	num_available = [g.count for g in sorted_groups]
+	next_available = list(range(num_groups + 1))
+	next_piece = {g : 0 for g in sorted_groups}
+
+	def allocate(pos, num):
+		num_available[pos] -= num
+		if num_available[pos] == 0:
+			next_available[pos] = pos + 1
+
+	bottom_pos = get_next_available(next_available, 0)
+	while bottom_pos < num_groups:
+		# Layers of the stack as (position in sort order, rotated, number of pieces)
+		layers = [(bottom_pos, False, 1)]
+		num_used = {bottom_pos : 1}
+		allocate(bottom_pos, 1)
+		profile = StackProfile(sorted_groups[bottom_pos].get_template())
+		pos = 0
+		while not profile.is_full():
+			pos = max(pos, bisect_left(negated_sort_keys, -profile.get_footprint_bound()))
+			pos = get_next_available(next_available, pos)
+			if pos >= num_groups:
+				break
+			num_stacked, rotated = stack_piece_group(
+				profile=profile,
+				group=sorted_groups[pos],
+				num_available=num_available[pos],
+				trailer_height=trailer_height,
+				allow_rotations=allow_rotations,
+			)
+			if num_stacked > 0:
+				layers += [(pos, rotated, num_stacked)]
+				num_used[pos] = num_used.get(pos, 0) + num_stacked
+				allocate(pos, num_stacked)
+			pos += 1
+		# Groups with pieces left after each copy are stacked the same way again
+		num_copies = min([(num_available[i] + n) // n for i, n in num_used.items()])
+		for i, n in num_used.items():
+			allocate(i, (num_copies - 1) * n)
+
+		pieces, piece_groups = [], []
+		for i, rotated, num in layers:
+			group = sorted_groups[i]
+			for _ in range(num):
+				pieces += [group.make_piece(next_piece[group], rotated=rotated)]
+				piece_groups += [group]
+				next_piece[group] += 1
+		shipment = Shipment(pieces=pieces[0])
+		for piece in pieces[1:]:
+			shipment.stack(piece)
+		shipment._set_dims()
+		shipments += [shipment]
+		shipments += replicate_shipment(shipment, piece_groups, num_copies - 1, next_piece)
+		bottom_pos = get_next_available(next_available, 0)
+	shipments += naive_piece_group_arrangement(unstackable_groups)
+	return shipments
@@ -1,5 +1,5 @@
 
-from typing import List
+from typing import List, Dict
 from ...logistics_objects import Shipment
 
 naive_piece_arrangement_details = {
@@ -30,3 +30,60 @@ def naive_piece_arrangement(pieces : List, **kwargs):
 		shipment._set_dims()
 	return shipments
 
+
+
+def replicate_shipment(shipment, piece_groups : List, num_copies : int, next_piece : Dict):
+	'''
+	Copy a Shipment Made of Pieces from Piece Groups, Naming the Pieces of Each Copy
+
+	Parameters
+	------------
+	shipment : logistics_objects.Shipment
+		Shipment to be copied
+	piece_groups : List[logistics_objects.PieceGroup]
+		Group of each piece of the shipment, in the order of `shipment.pieces`
+	num_copies : int
+		Number of copies to make
+	next_piece : Dict
+		Index of the next unnamed piece of each group, advanced as pieces are named
+
+	Returns
+	-----------
+	shipments : List[logistics_objects.Shipment]
+		Copies of the provided shipment
+	'''
+	shipments = []
+	for _ in range(num_copies):
+		replica = shipment.replicate()
+		for piece, group in zip(replica.pieces, piece_groups):
+			piece.name = group.get_piece_name(next_piece[group])
+			next_piece[group] += 1
+		shipments += [replica]
+	return shipments
+
+
+def naive_piece_group_arrangement(groups : List, **kwargs):
+	'''
+	Allocate Provided Piece Groups into Shipments in a Trivial/Naive Manner
+
+	Same allocation as `naive_piece_arrangement` on the pieces of the
+	groups, the shipment of the first piece of each group is copied for
+	the others.
+
+	Parameters
+	------------
+	groups : List[logistics_objects.PieceGroup]
+		List of piece groups to be allocated into shipments
+
+	Returns
+	-----------
+	shipments : List[logistics_objects.Shipment]
+		List of shipments composed of the pieces of the provided groups
+	'''
+	shipments = []
+	for group in groups:
+		shipment = Shipment(pieces=group.make_piece(0))
+		shipment._set_dims()
+		shipments += [shipment]
+		shipments += replicate_shipment(shipment, [group], group.count - 1, {group : 1})
+	return shipments
@@ -1,5 +1,7 @@
+import math
 
 from ...py3dbp import Packer
+from ...py3dbp.main import NumericModeInteger
 
 no_stack_bin_pack_shipment_arrangement_details = {
 	'code' : 'NO_STACK_BIN_PACK',
@@ -7,7 +9,7 @@ no_stack_bin_pack_shipment_arrangement_details = {
 	'desc' : 'Bin packing algorithm with stacking dissallowed to load shipments onto the trailer',
 }
 
-def no_stack_pack_trailer(trailer, trailer_occupy_length : int, allow_rotations=True):
+def no_stack_pack_trailer(trailer, trailer_occupy_length : int, allow_rotations=True, numeric_mode : str = NumericModeInteger):
 	'''
 	Apply Bin Packing Algorithm to Load a Portion of a Trailer
 
@@ -17,6 +19,8 @@ def no_stack_pack_trailer(trailer, trailer_occupy_length : int, allow_rotations=
 		Trailer object to attempt to load
 	trailer_occupy_length : int
 		Number of inches of the trailer to allow for loading
+	numeric_mode : str
+		Bin packing arithmetic, `integer` (exact scaled integers) or `decimal`, both give the same packing
 	
 	Returns
 	------------
@@ -36,16 +40,37 @@ def no_stack_pack_trailer(trailer, trailer_occupy_length : int, allow_rotations=
 
 	packer.pack(
 		distribute_items=False,
-		bigger_first=True
+		bigger_first=True,
+		numeric_mode=numeric_mode,
 	)
 	b = packer.bins[0]
 	return len(b.unfitted_items) == 0
 
 
-def no_stack_trailer_arrange(trailer, allow_rotations=True,search_method : str = 'bisection', **kwargs):
+def get_packed_placements(trailer):
+	'''
+	Get Rotation and Bin Packing Position of Each Trailer Shipment
+
+	Returns
+	------------
+	placements : List[Tuple[int, list]]
+		Bin packing rotation type and position for each shipment in the trailer
+	'''
+	return [
+		(shipment.binpack_item.rotation_type, shipment.binpack_item.get_position())
+		for shipment in trailer.shipments
+	]
+
+
+def no_stack_trailer_arrange(trailer, allow_rotations=True,search_method : str = 'bisection', numeric_mode : str = NumericModeInteger, tolerance : float = 1, **kwargs):
 	'''
 	Allocate Shipments in Trailer using an Incremental Bin Packing Algorithm without Stacking
 
+	The bisection search starts from the footprint area lower bound (no
+	packing shorter than the total shipment footprint over the trailer
+	width can succeed) and keeps the placements of the shortest successful
+	packing, so the best packing is never repeated.
+
 	Parameters
 	------------
 	trailer : logistics_objects.Trailer
@@ -54,6 +79,10 @@ def no_stack_trailer_arrange(trailer, allow_rotations=True,search_method : str =
 		Allow shipments to be rotated in order to load
 	search_method : str
 		Method for searching for optimal portion of trailer, options: `bisection`, `foot_increment`
+	numeric_mode : str
+		Bin packing arithmetic, `integer` (exact scaled integers) or `decimal`, both give the same packing
+	tolerance : float
+		Stop bisecting once the trailer length search interval is this many inches or shorter
 
 	Returns
 	------------
@@ -61,13 +90,16 @@ def no_stack_trailer_arrange(trailer, allow_rotations=True,search_method : str =
 	'''
 
 	for shipment in trailer.shipments:
-		shipment.position[0] = 0
-		shipment.position[1] = 0
+		position = shipment.position.copy()
+		position[0] = 0
+		position[1] = 0
+		shipment.position = position
 
 	all_shipment_loaded = False
 	for shipment in trailer.shipments:
 		shipment._update_binpack_item(height=1)
 	
+	placements = None
 	if search_method == 'foot_increment':
 		trailer_occupy_length = min([shipment.length for shipment in trailer.shipments]) - 12
 		for _ in range(100):
@@ -76,35 +108,45 @@ def no_stack_trailer_arrange(trailer, allow_rotations=True,search_method : str =
 				trailer=trailer,
 				trailer_occupy_length=trailer_occupy_length,
 				allow_rotations=allow_rotations,
+				numeric_mode=numeric_mode,
 			)
 			if all_shipment_loaded:
 				break
 	else:
-		a = 0
+		footprint_area = sum([shipment.length * shipment.width for shipment in trailer.shipments])
+		a = max(math.ceil(footprint_area / trailer.width) - 1, 0)
 		b = sum([shipment.length for shipment in trailer.shipments])
 		c = round((a+b)/2)
 		count = 0
-		while count < 25:
+		while count < 25 and b - a > tolerance:
 			count += 1
 			all_shipment_loaded = no_stack_pack_trailer(
 				trailer=trailer,
 				trailer_occupy_length=c,
 				allow_rotations=allow_rotations,
+				numeric_mode=numeric_mode,
 			)
 			if all_shipment_loaded:
 				b = c
+				placements = get_packed_placements(trailer)
 			else:
 				a = c
 			c = round((a+b)/2)
 			if c in (a,b):
 				break
-		all_shipment_loaded = no_stack_pack_trailer(
-			trailer=trailer,
-			trailer_occupy_length=b,
-			allow_rotations=allow_rotations,
-		)
-	for shipment in trailer.shipments:
-		if shipment.binpack_item.rotation_type == 1:
+		if placements is None:
+			no_stack_pack_trailer(
+				trailer=trailer,
+				trailer_occupy_length=b,
+				allow_rotations=allow_rotations,
+				numeric_mode=numeric_mode,
+			)
+	if placements is None:
+		placements = get_packed_placements(trailer)
+	for shipment, (rotation_type, binpack_position) in zip(trailer.shipments, placements):
+		if rotation_type == 1:
 			shipment.rotate()
-		shipment.position[0] = float(shipment.binpack_item.position[1])
-		shipment.position[1] = float(shipment.binpack_item.position[0])
+		position = shipment.position.copy()
+		position[0] = binpack_position[1]
+		position[1] = binpack_position[0]
+		shipment.position = position
@@ -4,6 +4,8 @@ from ...utils import (
 	get_current_trailer_configuration,
 	restore_trailer_configuration,
 )
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import copy
 import time
 import numpy as np
 
@@ -18,9 +20,46 @@ def loss_function(trailer, shipment=None, **kwargs):
 	Loss Function Intended to Score Trailer Load Plan Based on Trailer Linear Feet
 	'''
 	if trailer.arrangement_is_valid(shipment=shipment):
-		return max([s.position[0] + s.length for s in trailer.shipments])
+		return trailer.get_front_extent()
 	return np.Infinity
 
+def score_candidate_positions(trailer, shipment, positions, rotated):
+	'''
+	Score Candidate Placements of a Shipment Not Yet Loaded on the Trailer
+
+	Vectorized `loss_function` over K candidate placements, testing all
+	candidates against the loaded shipments at once (see
+	`Trailer.placements_overlap`) without moving or rotating the shipment.
+
+	Parameters
+	------------
+	trailer : logistics_objects.Trailer
+		Trailer the shipment is to be loaded on
+	shipment : logistics_objects.Shipment
+		Shipment to be loaded
+	positions : np.ndarray
+		Array of shape (K,3) of candidate shipment positions
+	rotated : np.ndarray
+		Boolean array of shape (K,), True where the candidate has the shipment rotated
+
+	Returns
+	------------
+	position_loss : np.ndarray
+		Array of shape (K,) of losses, infinite for invalid placements
+	'''
+	local_boundaries = shipment.get_local_boundaries()
+	candidate_boundaries = np.where(
+		rotated[:, None, None],
+		local_boundaries[[1, 0, 2]],
+		local_boundaries,
+	) + positions[:, :, None]
+	is_valid = trailer._in_trailer(candidate_boundaries) & ~trailer.placements_overlap(candidate_boundaries)
+	loss = np.maximum(
+		positions[:, 0] + np.where(rotated, shipment.width, shipment.length),
+		trailer.get_front_extent(),
+	)
+	return np.where(is_valid, loss, np.Infinity)
+
 def load_shipment(trailer, shipment, allow_rotations=True):
 	'''
 	Load Shipment on Trailer
@@ -45,58 +84,26 @@ def load_shipment(trailer, shipment, allow_rotations=True):
 			for s in trailer.shipments[-5:] if s.position[1] - shipment.width > 0
 	]
 	ul_candidate_positions += [trailer.position + np.array([0, trailer.width, 0])]
-	trailer.add_shipment(shipment)
-	position_loss = []
-	for ll_candidate in ll_candidate_positions:
-		shipment.position = ll_candidate
-		loss = loss_function(trailer, shipment)
-		position_loss += [
-			(
-				ll_candidate, 
-				loss, 
-				False
-			)
-		]
-	for ul_candidate in ul_candidate_positions:
-		shipment.position = ul_candidate - np.array([0, shipment.width, 0])
-		loss = loss_function(trailer, shipment)
-		position_loss += [
-			(
-				ul_candidate - np.array([0, shipment.width, 0]), 
-				loss, 
-				False
-			)
-		]
+	candidates = [(ll_candidate, False) for ll_candidate in ll_candidate_positions]
+	candidates += [(ul_candidate - np.array([0, shipment.width, 0]), False) for ul_candidate in ul_candidate_positions]
 	if allow_rotations:
-		shipment.rotate()
-		for ll_candidate in ll_candidate_positions:
-			shipment.position = ll_candidate
-			loss = loss_function(trailer, shipment)
-			position_loss += [
-				(
-					ll_candidate, 
-					loss, 
-					True
-				)
-			]
-		for ul_candidate in ul_candidate_positions:
-			shipment.position = ul_candidate - np.array([0, shipment.width, 0])
-			loss = loss_function(trailer, shipment)
-			position_loss += [
-				(
-					ul_candidate - np.array([0, shipment.width, 0]), 
-					loss, 
-					True
-				)
-			]
-	if all([loss == np.Infinity for pos, loss, rot in position_loss]):
-		if allow_rotations:
-			shipment.rotate()
+		# Rotated shipment width is the current length
+		candidates += [(ll_candidate, True) for ll_candidate in ll_candidate_positions]
+		candidates += [(ul_candidate - np.array([0, shipment.length, 0]), True) for ul_candidate in ul_candidate_positions]
+	position_loss = score_candidate_positions(
+		trailer=trailer,
+		shipment=shipment,
+		positions=np.array([pos for pos, rot in candidates], dtype=float),
+		rotated=np.array([rot for pos, rot in candidates]),
+	)
+	trailer.add_shipment(shipment)
+	if np.all(position_loss == np.Infinity):
+		# No candidate fits, the shipment is placed at the front of the trailer
 		shipment.position = np.array([trailer.get_boundaries()[0, 1], 0, 0])
 		return loss_function(trailer, shipment)
-	min_idx = np.argmin([loss for pos, loss, rot in position_loss])
-	shipment.position, loss, rot = position_loss[min_idx]
-	if allow_rotations and (not rot):
+	min_idx = np.argmin(position_loss)
+	shipment.position, rot = candidates[min_idx]
+	if rot:
 		shipment.rotate()
 	shipment.slide_back(trailer)
 	return loss_function(trailer, shipment)
@@ -130,7 +137,104 @@ def get_sort_attr(s,r):
 	elif r == 2:
 		return s.width
 
-def greedy_trailer_load(trailer, max_iter : int = None, timeout : float = None, allow_rotations : bool=True, **kwargs):
+def get_random_index_order(shipments, rng=np.random):
+	'''
+	Get Random Fuzzy Size Descending Loading Order of Shipments
+	'''
+	random_ls = rng.choice(a=[0,1,2],size=len(shipments),replace=True)
+	prob = np.array([get_sort_attr(s,r) for s,r in zip(shipments,random_ls)])
+	prob = prob / np.sum(prob)
+	return [
+		int(x) for x in rng.choice(
+			a=len(shipments),
+			p=prob,
+			size=len(shipments),
+			replace=False
+		)
+	]
+
+def greedy_trailer_load_restarts(trailer, num_restarts : int, allow_rotations : bool = True, seed=None, deadline : float = None):
+	'''
+	Run Randomized Greedy Loading Restarts on a Trailer
+
+	Worker function for parallel `greedy_trailer_load`, run on a copy of
+	the trailer with its own random number generator.
+
+	Parameters
+	------------
+	trailer : logistics_objects.Trailer
+		Trailer to be loaded, modified in place
+	num_restarts : int
+		Number of randomized restarts to run
+	allow_rotations : bool
+		Allow shipments to be rotated when loading
+	seed : int or np.random.SeedSequence
+		Seed for the random number generator of the worker
+	deadline : float
+		Time (as returned by `time.time`) after which no further restarts are started
+
+	Returns
+	------------
+	min_loss : float
+		Loss of the best restart
+	shipment_arrangement : List[Tuple[np.ndarray, bool]]
+		Position and rotation of each shipment in the best restart, in the original shipment order
+	'''
+	rng = np.random.default_rng(seed)
+	shipments = list(trailer.shipments)
+	min_loss = np.Infinity
+	shipment_arrangement = None
+	for _ in range(num_restarts):
+		loss = tetris_trailer_load(
+			trailer=trailer,
+			allow_rotations=allow_rotations,
+			index_order=get_random_index_order(trailer.shipments, rng=rng),
+		)
+		if shipment_arrangement is None or loss < min_loss:
+			shipment_arrangement = [(s.position.copy(), s.is_rotated) for s in shipments]
+			min_loss = loss
+		if deadline is not None:
+			if time.time() > deadline:
+				break
+	return min_loss, shipment_arrangement
+
+def parallel_greedy_trailer_load(trailer, max_iter : int, timeout : float = None, allow_rotations : bool = True, workers : int = 2, executor : str = 'process', seed : int = None):
+	'''
+	Spread Greedy Loading Restarts over a Worker Pool
+
+	Returns
+	------------
+	shipment_arrangement : List[Tuple[logistics_objects.Shipment, np.ndarray, bool]]
+		Best shipment arrangement found by the workers, see `restore_trailer_configuration`
+	'''
+	if not executor in EXECUTOR_ROUTER.keys():
+		raise NotImplementedError(f'Executor `{executor}` has not been implemented')
+	workers = min(workers, max_iter)
+	deadline = time.time() + timeout if timeout is not None else None
+	seeds = np.random.SeedSequence(seed).spawn(workers)
+	with EXECUTOR_ROUTER[executor](max_workers=workers) as pool:
+		futures = [
+			pool.submit(
+				greedy_trailer_load_restarts,
+				# Process workers receive a pickled copy, thread workers need their own copy
+				trailer if executor == 'process' else copy.deepcopy(trailer),
+				max_iter // workers + int(i < max_iter % workers),
+				allow_rotations,
+				seeds[i],
+				deadline,
+			)
+			for i in range(workers)
+		]
+		results = [future.result() for future in futures]
+	min_loss, shipment_arrangement = min(results, key=lambda x : x[0])
+	return [(s, pos, rot) for s, (pos, rot) in zip(trailer.shipments, shipment_arrangement)]
+
+EXECUTOR_ROUTER = {
+	'process' : ProcessPoolExecutor,
+	'thread' : ThreadPoolExecutor,
+}
+
+def greedy_trailer_load(trailer, max_iter : int = None, timeout : float = None, allow_rotations : bool=True, workers : int = None, executor : str = 'process', seed : int = None, occupancy_grid : float = None, stop_event=None, **kwargs):
 	'''
 	Arrange Shipments in Trailer Using a Greedy Loading Algorithm
 	
@@ -144,6 +248,16 @@ def greedy_trailer_load(trailer, max_iter : int = None, timeout : float = None,
 		Timeout for main loop of optimization
 	allow_rotations : bool
 		Allow shipments to be rotated when loading
+	workers : int
+		Number of workers to spread the iterations over, iterations are run sequentially in this process if None or 1
+	executor : str
+		Worker pool type when using multiple workers, options are the keys of `EXECUTOR_ROUTER`
+	seed : int
+		Seed for the random number generators, of the workers when using multiple workers, the global NumPy generator is used if None and iterations are run in this process
+	occupancy_grid : float
+		Occupancy grid resolution in inches used for collision checks while loading, exact geometry only if None
+	stop_event : threading.Event
+		Event checked after each iteration run in this process, the best arrangement so far is kept once it is set, never stops early if None
 	
 	Returns
 	------------
@@ -152,34 +266,46 @@ def greedy_trailer_load(trailer, max_iter : int = None, timeout : float = None,
 	max_iter = max_iter or 3
 	temp_trailer_length = trailer.length
 	trailer.length = sum([s.length for s in trailer.shipments])
-	min_loss = np.Infinity
-	shipment_arrangement = None
-	start_time = time.perf_counter()
-	for _ in range(max_iter):
-		random_ls = np.random.choice(a=[0,1,2],size=len(trailer.shipments),replace=True)
-		prob = np.array([get_sort_attr(s,r) for s,r in zip(trailer.shipments,random_ls)])
-		prob = prob / np.sum(prob)
-		index_order = [
-			int(x) for x in np.random.choice(
-				a=len(trailer.shipments),
-				p=prob,
-				size=len(trailer.shipments),
-				replace=False
-			)
-		]
-		loss = tetris_trailer_load(
+	temp_occupancy_grid = trailer.occupancy_grid
+	if occupancy_grid is not None:
+		trailer.set_occupancy_grid(occupancy_grid)
+	if workers is not None and workers > 1:
+		shipment_arrangement = parallel_greedy_trailer_load(
 			trailer=trailer,
+			max_iter=max_iter,
+			timeout=timeout,
 			allow_rotations=allow_rotations,
-			index_order = index_order,
+			workers=workers,
+			executor=executor,
+			seed=seed,
 		)
-		if loss < min_loss:
-			shipment_arrangement = get_current_trailer_configuration(trailer)
-			min_loss = loss
-		if timeout is not None:
-			if time.perf_counter() - start_time > timeout:
+	else:
+		rng = np.random if seed is None else np.random.default_rng(seed)
+		min_loss = np.Infinity
+		shipment_arrangement = None
+		start_time = time.perf_counter()
+		for _ in range(max_iter):
+			index_order = get_random_index_order(trailer.shipments, rng=rng)
+			loss = tetris_trailer_load(
+				trailer=trailer,
+				allow_rotations=allow_rotations,
+				index_order = index_order,
+			)
+			if loss < min_loss:
+				# The snapshot array is allocated once and refilled on each improvement
+				if shipment_arrangement is None:
+					shipment_arrangement = get_current_trailer_configuration(trailer)
+				else:
+					shipment_arrangement.capture()
+				min_loss = loss
+			if timeout is not None:
+				if time.perf_counter() - start_time > timeout:
+					break
+			if stop_event is not None and stop_event.is_set():
 				break
 	restore_trailer_configuration(shipment_arrangement)
 	trailer.length = temp_trailer_length
+	if occupancy_grid is not None:
+		trailer.set_occupancy_grid(getattr(temp_occupancy_grid, 'resolution', None))
 	for shipment in trailer.shipments:
 		shipment._set_dims()
-
@@ -20,6 +20,8 @@ def naive_shipment_arrangement(trailer, **kwargs):
 	'''
 	length_pos = 0
 	for shipment in trailer.shipments:
-		shipment.position[0] = length_pos
+		position = shipment.position.copy()
+		position[0] = length_pos
+		shipment.position = position
 		length_pos += shipment.length
 
@@ -0,0 +1,259 @@
+from typing import List, Tuple
+import time
+import numpy as np
+from ...logistics_objects.skyline import FloorSkyline
+
+maxrects_shipment_arrangement_details = {
+	'code' : 'MAXRECTS_PACK',
+	'name' : 'MaxRects Floor Packing Shipment Arrangement',
+	'desc' : 'Two dimensional MaxRects packing (best short side fit) of shipment footprints onto the trailer floor, searching for the shortest trailer length that fits all shipments',
+}
+
+skyline_shipment_arrangement_details = {
+	'code' : 'SKYLINE_PACK',
+	'name' : 'Skyline Floor Packing Shipment Arrangement',
+	'desc' : 'Two dimensional skyline packing of shipment footprints onto the trailer floor, placing each shipment where it ends closest to the nose of the trailer',
+}
+
+# Deterministic shipment orderings tried by the floor packers, one per iteration
+FOOTPRINT_SORT_KEYS = [
+	lambda l, w : (l * w, max(l, w)),
+	lambda l, w : (max(l, w), min(l, w)),
+	lambda l, w : (l, w),
+	lambda l, w : (w, l),
+	lambda l, w : (l + w, l * w),
+]
+
+
+class MaxRectsPacker:
+	'''
+	MaxRects Rectangle Packer for a Length x Width Floor
+
+	Keeps the maximal free rectangles of the floor as an (n,4) array of
+	[x0,y0,x1,y1] rows, x along the length and y along the width.  Each
+	rectangle is placed using the best short side fit rule, ties going to
+	the position closest to the origin along the length.
+	'''
+
+	def __init__(self, length : float, width : float):
+		self.length = length
+		self.width = width
+		self.free = np.array([[0, 0, length, width]], dtype=float)
+
+	def find_position(self, length : float, width : float, allow_rotations : bool = True):
+		'''
+		Find Best Short Side Fit Position for a Rectangle
+
+		Returns
+		------------
+		placement : Tuple[float, float, bool]
+			Position along the length, position along the width, and whether the rectangle is rotated, None if it does not fit
+		'''
+		orientations = [(length, width, False)]
+		if allow_rotations and length != width:
+			orientations += [(width, length, True)]
+		best = None
+		free_length = self.free[:, 2] - self.free[:, 0]
+		free_width = self.free[:, 3] - self.free[:, 1]
+		for l, w, rotated in orientations:
+			fits = np.flatnonzero((l <= free_length) & (w <= free_width))
+			if len(fits) == 0:
+				continue
+			leftover_l = free_length[fits] - l
+			leftover_w = free_width[fits] - w
+			short = np.minimum(leftover_l, leftover_w)
+			long = np.maximum(leftover_l, leftover_w)
+			j = np.lexsort((self.free[fits, 1], self.free[fits, 0], long, short))[0]
+			i = fits[j]
+			score = (short[j], long[j], self.free[i, 0], self.free[i, 1])
+			if best is None or score < best[0]:
+				best = (score, self.free[i, 0], self.free[i, 1], rotated)
+		if best is None:
+			return None
+		return best[1], best[2], best[3]
+
+	def place(self, x : float, y : float, length : float, width : float):
+		'''
+		Place a Rectangle and Split the Free Rectangles it Overlaps
+		'''
+		x1, y1 = x + length, y + width
+		free = self.free
+		hit = (free[:, 0] < x1) & (free[:, 2] > x) & (free[:, 1] < y1) & (free[:, 3] > y)
+		split = free[hit]
+		pieces = [
+			# Free space before, after, left, and right of the placed rectangle
+			np.column_stack([split[:, 0], split[:, 1], np.full(len(split), x), split[:, 3]]),
+			np.column_stack([np.full(len(split), x1), split[:, 1], split[:, 2], split[:, 3]]),
+			np.column_stack([split[:, 0], split[:, 1], split[:, 2], np.full(len(split), y)]),
+			np.column_stack([split[:, 0], np.full(len(split), y1), split[:, 2], split[:, 3]]),
+		]
+		pieces = np.concatenate(pieces)
+		pieces = pieces[(pieces[:, 2] > pieces[:, 0]) & (pieces[:, 3] > pieces[:, 1])]
+		free = np.concatenate([free[~hit], pieces])
+		self.free = self._prune(free)
+
+	@staticmethod
+	def _prune(free):
+		'''
+		Remove Free Rectangles Contained in Another Free Rectangle
+		'''
+		free = np.unique(free, axis=0)
+		contained = (
+			(free[:, None, 0] >= free[None, :, 0]) & (free[:, None, 1] >= free[None, :, 1]) &
+			(free[:, None, 2] <= free[None, :, 2]) & (free[:, None, 3] <= free[None, :, 3])
+		)
+		np.fill_diagonal(contained, False)
+		return free[~contained.any(axis=1)]
+
+
+def pack_footprints(packer, footprints : List[Tuple[float, float]], order : List[int], allow_rotations : bool = True):
+	'''
+	Pack Shipment Footprints in the Provided Order
+
+	Parameters
+	------------
+	packer : MaxRectsPacker or logistics_objects.skyline.FloorSkyline
+		Packer to place footprints with
+	footprints : List[Tuple[float, float]]
+		Length and width of each shipment
+	order : List[int]
+		Order to pack the footprints in
+	allow_rotations : bool
+		Allow footprints to be rotated
+
+	Returns
+	------------
+	placements : List[Tuple[float, float, bool]]
+		Position along the length, position along the width, and rotation for each footprint, None if any footprint does not fit
+	'''
+	placements = [None] * len(footprints)
+	for i in order:
+		length, width = footprints[i]
+		placement = packer.find_position(length, width, allow_rotations=allow_rotations)
+		if placement is None:
+			return None
+		x, y, rotated = placement
+		if rotated:
+			length, width = width, length
+		packer.place(x, y, length, width)
+		placements[i] = placement
+	return placements
+
+
+def get_linear_extent(footprints : List[Tuple[float, float]], placements : List[Tuple[float, float, bool]]):
+	'''
+	Get Occupied Trailer Length of Placed Footprints
+	'''
+	return max([
+		x + (width if rotated else length)
+		for (length, width), (x, y, rotated) in zip(footprints, placements)
+	])
+
+
+def apply_placements(trailer, placements : List[Tuple[float, float, bool]]):
+	'''
+	Move Trailer Shipments to Packed Floor Positions
+	'''
+	for shipment, (x, y, rotated) in zip(trailer.shipments, placements):
+		if rotated:
+			shipment.rotate()
+		shipment.position = np.array([x, y, 0])
+
+
+def get_footprint_orders(footprints : List[Tuple[float, float]], max_iter : int = None):
+	'''
+	Get Size Descending Orders of Footprints to Try
+	'''
+	max_iter = max_iter or 1
+	return [
+		sorted(range(len(footprints)), key=lambda i : sort_key(*footprints[i]), reverse=True)
+		for sort_key in FOOTPRINT_SORT_KEYS[:max_iter]
+	]
+
+
+def skyline_trailer_arrange(trailer, max_iter : int = None, timeout : float = None, allow_rotations : bool = True, stop_event=None, **kwargs):
+	'''
+	Arrange Shipments on the Trailer Floor with Skyline Rectangle Packing
+
+	Parameters
+	------------
+	trailer : logistics_objects.Trailer
+		Trailer object to be optimally loaded
+	max_iter : int
+		Number of shipment orderings to try, up to the number of `FOOTPRINT_SORT_KEYS`
+	timeout : float
+		Timeout for trying additional orderings
+	allow_rotations : bool
+		Allow shipments to be rotated in order to load
+	stop_event : threading.Event
+		Event checked after each ordering, no additional orderings are tried once it is set, never stops early if None
+
+	Returns
+	------------
+	None
+	'''
+	footprints = [(s.length, s.width) for s in trailer.shipments]
+	start_time = time.perf_counter()
+	best_placements, best_extent = None, np.inf
+	for order in get_footprint_orders(footprints, max_iter=max_iter):
+		placements = pack_footprints(FloorSkyline(width=trailer.width), footprints, order, allow_rotations=allow_rotations)
+		if placements is not None and get_linear_extent(footprints, placements) < best_extent:
+			best_placements, best_extent = placements, get_linear_extent(footprints, placements)
+		if timeout is not None and time.perf_counter() - start_time > timeout:
+			break
+		if stop_event is not None and stop_event.is_set():
+			break
+	if best_placements is not None:
+		apply_placements(trailer, best_placements)
+
+
+def maxrects_trailer_arrange(trailer, max_iter : int = None, timeout : float = None, allow_rotations : bool = True, tolerance : float = 1, stop_event=None, **kwargs):
+	'''
+	Arrange Shipments on the Trailer Floor with MaxRects Rectangle Packing
+
+	Bisects on the length of floor the shipments are packed into, between
+	the footprint area lower bound and a skyline packing of the shipments,
+	keeping the shortest successful MaxRects packing.
+
+	Parameters
+	------------
+	trailer : logistics_objects.Trailer
+		Trailer object to be optimally loaded
+	max_iter : int
+		Number of shipment orderings to try, up to the number of `FOOTPRINT_SORT_KEYS`
+	timeout : float
+		Timeout for trying additional orderings
+	allow_rotations : bool
+		Allow shipments to be rotated in order to load
+	tolerance : float
+		Stop bisecting once the length search interval is shorter than this, in inches
+	stop_event : threading.Event
+		Event checked after each ordering, no additional orderings are tried once it is set, never stops early if None
+
+	Returns
+	------------
+	None
+	'''
+	footprints = [(s.length, s.width) for s in trailer.shipments]
+	start_time = time.perf_counter()
+	orders = get_footprint_orders(footprints, max_iter=max_iter)
+	best_placements = pack_footprints(FloorSkyline(width=trailer.width), footprints, orders[0], allow_rotations=allow_rotations)
+	if best_placements is None:
+		return
+	best_extent = get_linear_extent(footprints, best_placements)
+	area_bound = sum([l * w for l, w in footprints]) / trailer.width
+	for order in orders:
+		a, b = area_bound, best_extent
+		while b - a > tolerance:
+			c = (a + b) / 2
+			placements = pack_footprints(MaxRectsPacker(length=c, width=trailer.width), footprints, order, allow_rotations=allow_rotations)
+			if placements is None:
+				a = c
+			else:
+				b = get_linear_extent(footprints, placements)
+				best_placements, best_extent = placements, b
+		if timeout is not None and time.perf_counter() - start_time > timeout:
+			break
+		if stop_event is not None and stop_event.is_set():
+			break
+	apply_placements(trailer, best_placements)
@@ -8,7 +8,7 @@ simple_movement_slide_back_shipment_arrangement_details = {
 	'desc' : 'Attempt to slide shipments back in the trailer where space is available - Cannot be run stand-alone, intended to be run after `NO_STACK_BIN_PACK`',
 }
 
-def slide_shipments_back(trailer, max_iter : int = None, timeout : float = None, **kwargs):
+def slide_shipments_back(trailer, max_iter : int = None, timeout : float = None, occupancy_grid : float = None, seed : int = None, stop_event=None, **kwargs):
 	'''
 	Slide Shipment Back in Trailer
 
@@ -20,12 +20,22 @@ def slide_shipments_back(trailer, max_iter : int = None, timeout : float = None,
 		Number of iterations to run
 	timeout : float 
 		Timeout for main loop of optimization
+	occupancy_grid : float
+		Occupancy grid resolution in inches used for collision checks while sliding, exact geometry only if None
+	seed : int
+		Seed for the random slide directions, the global NumPy generator is used if None
+	stop_event : threading.Event
+		Event checked after each pass over the shipments, no further passes are run once it is set, never stops early if None
 	
 	Returns
 	------------
 	None
 	'''
 	max_iter = max_iter or 5
+	rng = np.random if seed is None else np.random.default_rng(seed)
+	temp_occupancy_grid = trailer.occupancy_grid
+	if occupancy_grid is not None:
+		trailer.set_occupancy_grid(occupancy_grid)
 	start_time = time.perf_counter()
 	break_loop = False
 	index_order = np.argsort([
@@ -34,7 +44,7 @@ def slide_shipments_back(trailer, max_iter : int = None, timeout : float = None,
 	for count in range(max_iter):
 		for i in index_order:
 			shipment = trailer.shipments[i]
-			directions = np.random.choice(a=['left', 'right'], replace=False, size=2)
+			directions = rng.choice(a=['left', 'right'], replace=False, size=2)
 			shipment.slide_back(trailer)
 			for d in directions:
 				if d == 'left':
@@ -47,7 +57,9 @@ def slide_shipments_back(trailer, max_iter : int = None, timeout : float = None,
 				if time.perf_counter() - start_time > timeout and count > 0:
 					break_loop = True
 					break
-		if break_loop:
+		if break_loop or (stop_event is not None and stop_event.is_set()):
 			break
 	shipment._set_dims()
+	if occupancy_grid is not None:
+		trailer.set_occupancy_grid(getattr(temp_occupancy_grid, 'resolution', None))
 	trailer.balance()
@@ -0,0 +1,70 @@
+from .greedy import get_random_index_order
+from .rectangle_packing import (
+	pack_footprints,
+	get_linear_extent,
+	apply_placements,
+)
+from ...logistics_objects.skyline import FloorSkyline
+import time
+import numpy as np
+
+skyline_greedy_shipment_arrangement_details = {
+	'code' : 'SKYLINE_LOAD',
+	'name' : 'Skyline Greedy Shipment Arrangement',
+	'desc' : 'A stochastic greedy optimization placing each shipment in the best gap of the trailer floor skyline',
+}
+
+def skyline_trailer_load(trailer, max_iter : int = None, timeout : float = None, allow_rotations : bool = True, seed : int = None, stop_event=None, **kwargs):
+	'''
+	Arrange Shipments in Trailer Using Greedy Loading on the Floor Skyline
+
+	Shipments are loaded in the same randomized size descending orders as
+	`GREEDY_LOAD`, but each shipment goes where it ends closest to the
+	front of the trailer among every gap in the floor skyline, instead of
+	next to one of the last few shipments loaded.
+
+	Parameters
+	------------
+	trailer : logistics_objects.Trailer
+		Trailer to be loaded
+	max_iter : int
+		Maximum number of iterations to be used for the optimization
+	timeout : float 
+		Timeout for main loop of optimization
+	allow_rotations : bool
+		Allow shipments to be rotated when loading
+	seed : int
+		Seed for the random loading orders, the global NumPy generator is used if None
+	stop_event : threading.Event
+		Event checked after each iteration, the best arrangement so far is kept once it is set, never stops early if None
+	
+	Returns
+	------------
+	None
+	'''
+	max_iter = max_iter or 3
+	rng = np.random if seed is None else np.random.default_rng(seed)
+	footprints = [(s.length, s.width) for s in trailer.shipments]
+	min_loss = np.Infinity
+	best_placements = None
+	start_time = time.perf_counter()
+	for _ in range(max_iter):
+		index_order = get_random_index_order(trailer.shipments, rng=rng)
+		placements = pack_footprints(
+			FloorSkyline(width=trailer.width),
+			footprints,
+			index_order,
+			allow_rotations=allow_rotations,
+		)
+		if placements is not None:
+			loss = get_linear_extent(footprints, placements)
+			if loss < min_loss:
+				best_placements = placements
+				min_loss = loss
+		if timeout is not None:
+			if time.perf_counter() - start_time > timeout:
+				break
+		if stop_event is not None and stop_event.is_set():
+			break
+	if best_placements is not None:
+		apply_placements(trailer, best_placements)
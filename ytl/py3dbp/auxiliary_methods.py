@@ -5,15 +5,16 @@ def rect_intersect(item1, item2, x, y):
     d1 = item1.get_dimension()
     d2 = item2.get_dimension()
 
-    cx1 = item1.position[x] + d1[x]/2
-    cy1 = item1.position[y] + d1[y]/2
-    cx2 = item2.position[x] + d2[x]/2
-    cy2 = item2.position[y] + d2[y]/2
+    # Centers are doubled so integer dimensions never need division
+    cx1 = 2 * item1.position[x] + d1[x]
+    cy1 = 2 * item1.position[y] + d1[y]
+    cx2 = 2 * item2.position[x] + d2[x]
+    cy2 = 2 * item2.position[y] + d2[y]
 
     ix = max(cx1, cx2) - min(cx1, cx2)
     iy = max(cy1, cy2) - min(cy1, cy2)
 
-    return ix < (d1[x]+d2[x])/2 and iy < (d1[y]+d2[y])/2
+    return ix < d1[x]+d2[x] and iy < d1[y]+d2[y]
 
 
 def intersect(item1, item2):
@@ -32,3 +33,23 @@ def set_to_decimal(value, number_of_decimals):
     number_of_decimals = get_limit_number_of_decimals(number_of_decimals)
 
     return Decimal(value).quantize(number_of_decimals)
+
+
+def set_to_scaled_integer(value, number_of_decimals):
+    '''
+    Round a value to `number_of_decimals` places like `set_to_decimal`, returned as an integer count of 10 ** -number_of_decimals units
+    '''
+    return int(set_to_decimal(value, number_of_decimals).scaleb(number_of_decimals))
+
+
+def quantize_scaled_integer(value, shift):
+    '''
+    Round an integer to a multiple of 10 ** shift, half to even like Decimal.quantize, returned in units of 10 ** shift
+    '''
+    if shift <= 0:
+        return value
+    quotient, remainder = divmod(value, 10 ** shift)
+    half = 5 * 10 ** (shift - 1)
+    if remainder > half or (remainder == half and quotient % 2 == 1):
+        quotient += 1
+    return quotient
@@ -3,11 +3,48 @@ from .constants import (
     NoRotationType, 
     Axis,
 )
-from .auxiliary_methods import intersect, set_to_decimal
+import numpy as np
+from .auxiliary_methods import (
+    intersect,
+    set_to_decimal,
+    set_to_scaled_integer,
+    quantize_scaled_integer,
+)
 
 DEFAULT_NUMBER_OF_DECIMALS = 3
 START_POSITION = [0, 0, 0]
 
+# Numeric modes for packing arithmetic:  `decimal` stores dimensions as
+# Decimal values rounded to the number of decimals, `integer` stores them as
+# exact integer multiples of 10 ** -number_of_decimals, which packs
+# identically but avoids Decimal arithmetic
+NumericModeDecimal = 'decimal'
+NumericModeInteger = 'integer'
+DEFAULT_NUMERIC_MODE = NumericModeDecimal
+
+
+def format_value(value, number_of_decimals, numeric_mode):
+    if numeric_mode == NumericModeInteger:
+        return set_to_scaled_integer(value, number_of_decimals)
+    return set_to_decimal(value, number_of_decimals)
+
+
+def get_volume(box):
+    if box.numeric_mode == NumericModeInteger:
+        # Round like set_to_decimal, the product carries 3 times the decimals
+        return quantize_scaled_integer(
+            box.width * box.height * box.depth, 2 * box.number_of_decimals
+        )
+    return set_to_decimal(
+        box.width * box.height * box.depth, box.number_of_decimals
+    )
+
+
+def get_position(item):
+    if item.numeric_mode == NumericModeInteger:
+        return [p / 10 ** item.number_of_decimals for p in item.position]
+    return [float(p) for p in item.position]
+
 
 class Item:
     def __init__(self, name, width, height, depth, weight):
@@ -19,13 +56,21 @@ class Item:
         self.rotation_type = 0
         self.position = START_POSITION
         self.number_of_decimals = DEFAULT_NUMBER_OF_DECIMALS
+        self.numeric_mode = None
+        self._unformatted = (width, height, depth, weight)
+        self._volume = None
 
-    def format_numbers(self, number_of_decimals):
-        self.width = set_to_decimal(self.width, number_of_decimals)
-        self.height = set_to_decimal(self.height, number_of_decimals)
-        self.depth = set_to_decimal(self.depth, number_of_decimals)
-        self.weight = set_to_decimal(self.weight, number_of_decimals)
+    def format_numbers(self, number_of_decimals, numeric_mode=DEFAULT_NUMERIC_MODE):
+        if (numeric_mode, number_of_decimals) == (self.numeric_mode, self.number_of_decimals):
+            return
+        width, height, depth, weight = self._unformatted
+        self.width = format_value(width, number_of_decimals, numeric_mode)
+        self.height = format_value(height, number_of_decimals, numeric_mode)
+        self.depth = format_value(depth, number_of_decimals, numeric_mode)
+        self.weight = format_value(weight, number_of_decimals, numeric_mode)
         self.number_of_decimals = number_of_decimals
+        self.numeric_mode = numeric_mode
+        self._volume = None
 
     def string(self):
         return "%s(%sx%sx%s, weight: %s) pos(%s) rt(%s) vol(%s)" % (
@@ -34,9 +79,12 @@ class Item:
         )
 
     def get_volume(self):
-        return set_to_decimal(
-            self.width * self.height * self.depth, self.number_of_decimals
-        )
+        if self._volume is None:
+            self._volume = get_volume(self)
+        return self._volume
+
+    def get_position(self):
+        return get_position(self)
 
     def get_dimension(self):
         if self.rotation_type == RotationType.RT_WHD:
@@ -58,6 +106,8 @@ class Item:
 
 
 class Bin:
+    rotation_types = RotationType.ALL
+
     def __init__(self, name, width, height, depth, max_weight):
         self.name = name
         self.width = width
@@ -67,13 +117,55 @@ class Bin:
         self.items = []
         self.unfitted_items = []
         self.number_of_decimals = DEFAULT_NUMBER_OF_DECIMALS
+        self.numeric_mode = None
+        self._unformatted = (width, height, depth, max_weight)
+        self.total_weight = 0
+        self._reset_extreme_points()
 
-    def format_numbers(self, number_of_decimals):
-        self.width = set_to_decimal(self.width, number_of_decimals)
-        self.height = set_to_decimal(self.height, number_of_decimals)
-        self.depth = set_to_decimal(self.depth, number_of_decimals)
-        self.max_weight = set_to_decimal(self.max_weight, number_of_decimals)
+    def format_numbers(self, number_of_decimals, numeric_mode=DEFAULT_NUMERIC_MODE):
+        if (numeric_mode, number_of_decimals) == (self.numeric_mode, self.number_of_decimals):
+            return
+        width, height, depth, max_weight = self._unformatted
+        self.width = format_value(width, number_of_decimals, numeric_mode)
+        self.height = format_value(height, number_of_decimals, numeric_mode)
+        self.depth = format_value(depth, number_of_decimals, numeric_mode)
+        self.max_weight = format_value(max_weight, number_of_decimals, numeric_mode)
         self.number_of_decimals = number_of_decimals
+        self.numeric_mode = numeric_mode
+        self.total_weight = sum([item.weight for item in self.items])
+        self._reset_extreme_points()
+        for item in self.items:
+            self._add_extreme_points(item)
+
+    def _reset_extreme_points(self):
+        # Placed items as (min corner, max corner) rows, integer mode only
+        self._boxes = np.zeros((0, 2, 3), dtype=np.int64)
+        # Candidate positions next to placed items, one list per axis in
+        # placement order (the pivot order of Packer.pack_to_bin), without
+        # the points already covered by a placed item
+        self._extreme_points = [np.zeros((0, 3), dtype=np.int64) for _ in Axis.ALL]
+
+    def _add_extreme_points(self, item):
+        if self.numeric_mode != NumericModeInteger:
+            return
+        lo = np.array(item.position, dtype=np.int64)
+        hi = lo + np.array(item.get_dimension(), dtype=np.int64)
+        for axis in Axis.ALL:
+            points = self._extreme_points[axis]
+            covered = np.all((lo <= points) & (points < hi), axis=1)
+            self._extreme_points[axis] = points[~covered]
+        self._boxes = np.concatenate([self._boxes, np.stack([lo, hi])[None]])
+        for axis in Axis.ALL:
+            point = lo.copy()
+            point[axis] = hi[axis]
+            covered = np.any(np.all((self._boxes[:, 0] <= point) & (point < self._boxes[:, 1]), axis=1))
+            if not covered:
+                self._extreme_points[axis] = np.concatenate([self._extreme_points[axis], point[None]])
+
+    def _add_item(self, item):
+        self.items.append(item)
+        self.total_weight += item.weight
+        self._add_extreme_points(item)
 
     def string(self):
         return "%s(%sx%sx%s, max_weight:%s) vol(%s)" % (
@@ -82,24 +174,19 @@ class Bin:
         )
 
     def get_volume(self):
-        return set_to_decimal(
-            self.width * self.height * self.depth, self.number_of_decimals
-        )
+        return get_volume(self)
 
     def get_total_weight(self):
-        total_weight = 0
-
-        for item in self.items:
-            total_weight += item.weight
-
-        return set_to_decimal(total_weight, self.number_of_decimals)
+        if self.numeric_mode == NumericModeInteger:
+            return self.total_weight
+        return set_to_decimal(self.total_weight, self.number_of_decimals)
 
     def put_item(self, item, pivot):
         fit = False
         valid_item_position = item.position
         item.position = pivot
 
-        for i in range(0, len(RotationType.ALL)):
+        for i in range(0, len(self.rotation_types)):
             item.rotation_type = i
             dimension = item.get_dimension()
             if (
@@ -121,7 +208,7 @@ class Bin:
                     fit = False
                     return fit
 
-                self.items.append(item)
+                self._add_item(item)
 
             if not fit:
                 item.position = valid_item_position
@@ -135,44 +222,7 @@ class Bin:
 
 
 class NoRotateBin(Bin):
-    def put_item(self, item, pivot):
-        fit = False
-        valid_item_position = item.position
-        item.position = pivot
-
-        for i in range(0, len(NoRotationType.ALL)):
-            item.rotation_type = i
-            dimension = item.get_dimension()
-            if (
-                self.width < pivot[0] + dimension[0] or
-                self.height < pivot[1] + dimension[1] or
-                self.depth < pivot[2] + dimension[2]
-            ):
-                continue
-
-            fit = True
-
-            for current_item_in_bin in self.items:
-                if intersect(current_item_in_bin, item):
-                    fit = False
-                    break
-
-            if fit:
-                if self.get_total_weight() + item.weight > self.max_weight:
-                    fit = False
-                    return fit
-
-                self.items.append(item)
-
-            if not fit:
-                item.position = valid_item_position
-
-            return fit
-
-        if not fit:
-            item.position = valid_item_position
-
-        return fit
+    rotation_types = NoRotationType.ALL
 
 
 class Packer:
@@ -201,6 +251,13 @@ class Packer:
 
             return
 
+        if (
+            bin.numeric_mode == NumericModeInteger and
+            min(item.width, item.height, item.depth) > 0 and
+            bin.get_total_weight() + item.weight <= bin.max_weight
+        ):
+            return self.pack_to_extreme_point(bin, item)
+
         for axis in range(0, 3):
             items_in_bin = bin.items
 
@@ -235,15 +292,56 @@ class Packer:
         if not fitted:
             bin.unfitted_items.append(item)
 
+    def pack_to_extreme_point(self, bin, item):
+        """
+        Place the item at the first pivot of pack_to_bin it fits at, testing
+        the bin's extreme points against all placed items at once.  Pivots
+        covered by a placed item can never fit, so the placement (and the
+        rotation) is the same as pack_to_bin.
+        """
+        points = np.concatenate(bin._extreme_points)
+        dimensions = []
+        for i in range(0, len(bin.rotation_types)):
+            item.rotation_type = i
+            dimensions.append(item.get_dimension())
+        dimensions = np.array(dimensions, dtype=np.int64)
+        bin_dimension = np.array([bin.width, bin.height, bin.depth], dtype=np.int64)
+
+        # put_item uses the first rotation inside the bin at each pivot
+        in_bin = np.all(points[:, None, :] + dimensions[None, :, :] <= bin_dimension, axis=2)
+        candidates = np.flatnonzero(in_bin.any(axis=1))
+        rotations = np.argmax(in_bin[candidates], axis=1)
+        lo = points[candidates]
+        hi = lo + dimensions[rotations]
+        boxes = bin._boxes
+        hit = np.any(
+            np.all((lo[:, None, :] < boxes[None, :, 1, :]) & (boxes[None, :, 0, :] < hi[:, None, :]), axis=2),
+            axis=1
+        )
+        free = np.flatnonzero(~hit)
+        if len(free) > 0:
+            item.rotation_type = int(rotations[free[0]])
+            item.position = [int(v) for v in lo[free[0]]]
+            bin._add_item(item)
+            return
+
+        # Leave the item as the last failed put_item of pack_to_bin would
+        last_item = bin.items[-1]
+        pivot = list(last_item.position)
+        pivot[Axis.DEPTH] += last_item.get_dimension()[Axis.DEPTH]
+        bin.put_item(item, pivot)
+        bin.unfitted_items.append(item)
+
     def pack(
         self, bigger_first=False, distribute_items=False,
-        number_of_decimals=DEFAULT_NUMBER_OF_DECIMALS
+        number_of_decimals=DEFAULT_NUMBER_OF_DECIMALS,
+        numeric_mode=DEFAULT_NUMERIC_MODE
     ):
         for bin in self.bins:
-            bin.format_numbers(number_of_decimals)
+            bin.format_numbers(number_of_decimals, numeric_mode)
 
         for item in self.items:
-            item.format_numbers(number_of_decimals)
+            item.format_numbers(number_of_decimals, numeric_mode)
 
         self.bins.sort(
             key=lambda bin: bin.get_volume(), reverse=bigger_first
@@ -1,3 +1,6 @@
 
 from .trailer_load import optimize_trailer_load_plan
-from .trailer_load_api import optimize_trailer_load_plan_wrapper
\ No newline at end of file
+from .trailer_load_api import optimize_trailer_load_plan_wrapper
+from .request_cache import RequestCache
+from .plan_store import SQLitePlanStore
+from .batch import optimize_trailer_load_plans_batch
@@ -0,0 +1,210 @@
+from typing import Iterable, List, Dict, Tuple
+from .trailer_load_api import optimize_trailer_load_plan_wrapper
+from .request_cache import RequestCache
+from ..optimizer_functions.shipment_arrangement.greedy import EXECUTOR_ROUTER
+from ..defaults import (
+	DEFAULT_REQUEST_CACHE_SIZE,
+	DEFAULT_BATCH_EXECUTOR,
+	DEFAULT_BATCH_CHUNKSIZE,
+	BATCH_IN_FLIGHT_PER_WORKER,
+)
+from concurrent.futures import wait, FIRST_COMPLETED
+from collections import deque
+from functools import partial
+from itertools import islice
+import time
+import os
+
+# Small request run once by each worker process, so the first request of the batch does not pay for warming it up
+BATCH_WARMUP_REQUEST = {
+	'equipment_code' : 'DV_53',
+	'shipment_list' : [
+		{'length' : 48, 'width' : 40, 'height' : 40, 'weight' : 500, 'packing' : 'PALLET', 'stack_limit' : 2, 'num_pieces' : 2},
+	],
+	'seed' : 0,
+}
+
+# Cache of a worker process, set by `initialize_batch_worker`
+_worker_cache = None
+
+def initialize_batch_worker(cache_size : int = None, store=None):
+	'''
+	Set Up a Batch Worker Process, Creating its Cache and Running the Warm-Up Request
+
+	Parameters
+	------------
+	cache_size : int
+		Maximum number of requests cached by the worker, see `get_batch_cache`
+	store : SQLitePlanStore
+		Persistent store of load plans shared by the workers, see `get_batch_cache`
+	'''
+	global _worker_cache
+	_worker_cache = get_batch_cache(cache_size=cache_size,store=store)
+	optimize_trailer_load_plan_wrapper(BATCH_WARMUP_REQUEST)
+
+
+def get_batch_cache(cache_size : int = None, store=None):
+	'''
+	Get Cache of a Batch Worker, None if Neither a Cache Size nor a Store is Provided
+	'''
+	if cache_size is None and store is None:
+		return None
+	return RequestCache(max_size=cache_size or DEFAULT_REQUEST_CACHE_SIZE,store=store)
+
+
+def optimize_trailer_load_plan_chunk(chunk : List[Tuple[int, Dict]], cache : RequestCache = None):
+	'''
+	Optimize Trailer Load Plans of a Chunk of Indexed Requests
+
+	Parameters
+	------------
+	chunk : List[Tuple[int, Dict]]
+		Index and request data of each request of the chunk
+	cache : RequestCache
+		Cache of load plans, see `optimize_trailer_load_plan_wrapper`
+
+	Returns
+	------------
+	results : List[Tuple[int, int, Dict, float]]
+		Index, status code, response, and seconds taken of each request of the chunk
+	'''
+	results = []
+	for idx,request_data in chunk:
+		start = time.perf_counter()
+		try:
+			status_code,response_dict = optimize_trailer_load_plan_wrapper(request_data,cache=cache)
+		except:
+			status_code,response_dict = 500,{
+				'error_code' : 'TrailerLoadingException',
+				'error_message' : 'Unknown error',
+			}
+		results += [(idx,status_code,response_dict,time.perf_counter() - start)]
+	return results
+
+
+def run_batch_chunk(chunk : List[Tuple[int, Dict]]):
+	'''
+	Optimize Trailer Load Plans of a Chunk of Indexed Requests with the Cache of the Worker Process
+	'''
+	return optimize_trailer_load_plan_chunk(chunk,cache=_worker_cache)
+
+
+def get_chunks(iterable : Iterable, chunksize : int):
+	'''
+	Split an Iterable into Lists of `chunksize` Items, Lazily
+	'''
+	iterator = iter(iterable)
+	chunk = list(islice(iterator,chunksize))
+	while len(chunk) > 0:
+		yield chunk
+		chunk = list(islice(iterator,chunksize))
+
+
+def optimize_trailer_load_plans_batch(
+	requests : Iterable[Dict],
+	workers : int = None,
+	chunksize : int = DEFAULT_BATCH_CHUNKSIZE,
+	ordered : bool = True,
+	max_in_flight : int = None,
+	executor : str = DEFAULT_BATCH_EXECUTOR,
+	cache_size : int = None,
+	store=None,
+):
+	'''
+	Optimize Trailer Load Plans of Many Requests with a Pool of Workers
+
+	Requests are read from `requests` as workers free up, in chunks of
+	`chunksize` requests, with at most `max_in_flight` chunks submitted
+	and not yet returned, so the requests and results held in memory
+	stay bounded however many requests there are.  Each worker process
+	imports the package and runs `BATCH_WARMUP_REQUEST` once when it
+	starts, thread workers share the imports and one cache per batch.
+
+	Parameters
+	------------
+	requests : Iterable[Dict]
+		Request data of each request, see `optimize_trailer_load_plan_wrapper`
+	workers : int
+		Number of workers, the number of CPUs if None, requests are run in this process if 1
+	chunksize : int
+		Number of requests sent to a worker at a time
+	ordered : bool
+		Return results in the order of the requests if True, as they finish if False
+	max_in_flight : int
+		Maximum number of chunks submitted to the workers and not yet returned, `BATCH_IN_FLIGHT_PER_WORKER` per worker if None
+	executor : str
+		Worker pool type, options are the keys of `EXECUTOR_ROUTER`
+	cache_size : int
+		Maximum number of requests cached by each worker, requests are not cached if None and no store is provided
+	store : SQLitePlanStore
+		Persistent store of load plans shared by the workers, not used if None
+
+	Returns
+	------------
+	results : Iterator[Tuple[int, int, Dict, float]]
+		Index of the request, status code, response, and seconds taken by the worker, of each request
+	'''
+	if not executor in EXECUTOR_ROUTER.keys():
+		raise NotImplementedError(f'Executor `{executor}` has not been implemented')
+	assert chunksize > 0
+	workers = workers or os.cpu_count() or 1
+	max_in_flight = max(max_in_flight or BATCH_IN_FLIGHT_PER_WORKER * workers,1)
+	# Arguments are checked here, the generator only runs once results are requested
+	return iterate_batch_results(
+		chunks=get_chunks(enumerate(requests),chunksize),
+		workers=workers,
+		ordered=ordered,
+		max_in_flight=max_in_flight,
+		executor=executor,
+		cache_size=cache_size,
+		store=store,
+	)
+
+
+def iterate_batch_results(chunks : Iterable, workers : int, ordered : bool, max_in_flight : int, executor : str, cache_size : int = None, store=None):
+	'''
+	Submit Chunks of Indexed Requests to a Pool of Workers and Yield their Results, see `optimize_trailer_load_plans_batch`
+	'''
+	if workers == 1:
+		cache = get_batch_cache(cache_size=cache_size,store=store)
+		for chunk in chunks:
+			yield from optimize_trailer_load_plan_chunk(chunk,cache=cache)
+		return
+	if executor == 'process':
+		pool = EXECUTOR_ROUTER[executor](max_workers=workers,initializer=initialize_batch_worker,initargs=(cache_size,store))
+		run_chunk = run_batch_chunk
+	else:
+		# Thread workers share the imports, and the cache of this batch
+		pool = EXECUTOR_ROUTER[executor](max_workers=workers)
+		run_chunk = partial(optimize_trailer_load_plan_chunk,cache=get_batch_cache(cache_size=cache_size,store=store))
+	pending = deque() if ordered else set()
+	try:
+		for chunk in chunks:
+			while len(pending) >= max_in_flight:
+				yield from pop_batch_results(pending)
+			future = pool.submit(run_chunk,chunk)
+			if ordered:
+				pending.append(future)
+			else:
+				pending.add(future)
+		while len(pending) > 0:
+			yield from pop_batch_results(pending)
+	finally:
+		# Chunks not started are dropped if the results are not consumed to the end
+		for future in pending:
+			future.cancel()
+		pool.shutdown(wait=True)
+
+
+def pop_batch_results(pending):
+	'''
+	Wait for the Next Chunk, the Oldest if `pending` is a Deque, the First to Finish if a Set, and Get its Results
+	'''
+	if isinstance(pending,deque):
+		return pending.popleft().result()
+	done,_ = wait(pending,return_when=FIRST_COMPLETED)
+	results = []
+	for future in done:
+		pending.remove(future)
+		results += future.result()
+	return results
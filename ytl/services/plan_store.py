@@ -0,0 +1,220 @@
+from typing import Dict
+from .. import __version__
+from ..defaults import (
+	OVERWEIGHT_SHIPMENT_THRESHOLD,
+	DEFAULT_PIECE_ARRANGEMENT_ALGORITHM,
+	DEFAULT_SHIPMENT_ARRANGEMENT_ALGORITHM,
+	DEFAULT_PLAN_STORE_MAX_BYTES,
+	PLAN_STORE_PRUNE_FRACTION,
+)
+import threading
+import sqlite3
+import hashlib
+import json
+import zlib
+import time
+import os
+
+# Must be bumped with any change to stored payloads or to the load plans computed for a request,
+# e.g. piece order or positions, so stores written before the change stop serving stale plans
+PLAN_STORE_FORMAT = 2
+
+def get_plan_store_version():
+	'''
+	Get Version Stamp of Stored Load Plans
+
+	Ties stored load plans to `PLAN_STORE_FORMAT`, the package version,
+	and the default algorithm settings, so plans computed by other
+	versions or settings are not served.  Changes to the load plans
+	computed for a request must bump `PLAN_STORE_FORMAT`.
+	'''
+	return hashlib.sha256(json.dumps({
+		'format' : PLAN_STORE_FORMAT,
+		'version' : __version__,
+		'overweight_shipment_threshold' : OVERWEIGHT_SHIPMENT_THRESHOLD,
+		'piece_arrangement_algorithm' : DEFAULT_PIECE_ARRANGEMENT_ALGORITHM,
+		'shipment_optimization_ls' : DEFAULT_SHIPMENT_ARRANGEMENT_ALGORITHM,
+	},sort_keys=True).encode()).hexdigest()[:16]
+
+
+class SQLitePlanStore:
+	'''
+	Persistent Store of Load Plans in a SQLite Database
+
+	Load plans are kept as zlib compressed JSON, keyed by request hash
+	(see `get_request_key`), in a database in WAL mode, so several worker
+	processes on one host can read and write the same file.  Each
+	process, and each copy of the store sent to a worker process, opens
+	its own connection.
+
+	Plans stamped with another version (see `get_plan_store_version`) are
+	deleted when the store is opened and are never served.  When the
+	compressed plans exceed `max_bytes`, the least recently used plans
+	are deleted until they fit in `PLAN_STORE_PRUNE_FRACTION` of it.
+
+	Parameters
+	------------
+	path : str
+		Path of the database file, created if it does not exist
+	max_bytes : int
+		Maximum total size of the compressed plans in bytes
+	version : str
+		Version stamp of the plans, `get_plan_store_version()` if None
+	timeout : float
+		Seconds to wait for a lock held by another process
+	'''
+
+	def __init__(self,path : str,max_bytes : int = DEFAULT_PLAN_STORE_MAX_BYTES,version : str = None,timeout : float = 30):
+		self.path = path
+		self.max_bytes = max_bytes
+		self.version = version or get_plan_store_version()
+		self.timeout = timeout
+		self._lock = threading.Lock()
+		self._connection = None
+		self._pid = None
+		self.hits = 0
+		self.misses = 0
+		self.writes = 0
+		self.pruned = 0
+		with self._lock:
+			connection = self._connect()
+			with connection:
+				connection.execute('DELETE FROM plans WHERE version != ?',(self.version,))
+
+	def __getstate__(self):
+		state = self.__dict__.copy()
+		state['_lock'] = None
+		state['_connection'] = None
+		state['_pid'] = None
+		return state
+
+	def __setstate__(self,state):
+		self.__dict__.update(state)
+		self._lock = threading.Lock()
+
+	def _connect(self):
+		'''
+		Get the Connection of this Process, Opening the Database if Needed
+		'''
+		if self._connection is None or self._pid != os.getpid():
+			# Connections must not be shared with forked processes
+			connection = sqlite3.connect(self.path,timeout=self.timeout,check_same_thread=False)
+			connection.execute('PRAGMA journal_mode=WAL')
+			connection.execute('PRAGMA synchronous=NORMAL')
+			with connection:
+				connection.execute(
+					'CREATE TABLE IF NOT EXISTS plans ('
+					'key TEXT PRIMARY KEY, version TEXT NOT NULL, payload BLOB NOT NULL, '
+					'size INTEGER NOT NULL, created REAL NOT NULL, last_used REAL NOT NULL)'
+				)
+				connection.execute('CREATE INDEX IF NOT EXISTS plans_last_used ON plans (last_used)')
+			self._connection,self._pid = connection,os.getpid()
+		return self._connection
+
+	def get(self,key : str,max_age : float = None):
+		'''
+		Get Stored Load Plan for a Key, None if Missing, Stamped with Another Version, or Older than `max_age` Seconds
+		'''
+		entry = self.get_entry(key,max_age=max_age)
+		return entry[0] if entry is not None else None
+
+	def get_entry(self,key : str,max_age : float = None):
+		'''
+		Get Stored Load Plan for a Key and its Age
+
+		Parameters
+		------------
+		key : str
+			Request hash, see `get_request_key`
+		max_age : float
+			Plans stored at least `max_age` seconds ago are not served, plans do not expire if None
+
+		Returns
+		------------
+		entry : Tuple[Dict, float]
+			Load plan and seconds since it was stored, None if missing, stamped with another version, or expired
+		'''
+		now = time.time()
+		with self._lock:
+			connection = self._connect()
+			row = connection.execute('SELECT payload, created FROM plans WHERE key = ? AND version = ?',(key,self.version)).fetchone()
+			if row is None or (max_age is not None and now - row[1] >= max_age):
+				self.misses += 1
+				return None
+			with connection:
+				connection.execute('UPDATE plans SET last_used = ? WHERE key = ?',(now,key))
+			self.hits += 1
+		return json.loads(zlib.decompress(row[0])),max(now - row[1],0.)
+
+	def put(self,key : str,response : Dict):
+		'''
+		Store a Load Plan, Pruning Least Recently Used Plans if the Store is Full
+		'''
+		payload = zlib.compress(json.dumps(response,separators=(',',':')).encode())
+		now = time.time()
+		with self._lock:
+			connection = self._connect()
+			with connection:
+				connection.execute(
+					'INSERT OR REPLACE INTO plans (key, version, payload, size, created, last_used) VALUES (?, ?, ?, ?, ?, ?)',
+					(key,self.version,payload,len(payload),now,now),
+				)
+			self.writes += 1
+			self._prune(connection)
+
+	def _prune(self,connection):
+		'''
+		Delete Least Recently Used Plans Until they Fit in the Prune Fraction of the Size Cap
+		'''
+		total_bytes = connection.execute('SELECT COALESCE(SUM(size), 0) FROM plans').fetchone()[0]
+		if total_bytes <= self.max_bytes:
+			return
+		excess = total_bytes - int(self.max_bytes * PLAN_STORE_PRUNE_FRACTION)
+		keys = []
+		for key,size in connection.execute('SELECT key, size FROM plans ORDER BY last_used'):
+			if excess <= 0:
+				break
+			keys += [(key,)]
+			excess -= size
+		with connection:
+			connection.executemany('DELETE FROM plans WHERE key = ?',keys)
+		self.pruned += len(keys)
+
+	def clear(self):
+		'''
+		Delete All Stored Plans
+		'''
+		with self._lock:
+			connection = self._connect()
+			with connection:
+				connection.execute('DELETE FROM plans')
+
+	def __len__(self):
+		with self._lock:
+			return self._connect().execute('SELECT COUNT(*) FROM plans').fetchone()[0]
+
+	def get_stats(self):
+		'''
+		Get Hit, Miss, Write, and Prune Counts of this Process, and Size of the Store
+		'''
+		with self._lock:
+			num_plans,total_bytes = self._connect().execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM plans').fetchone()
+		return {
+			'hits' : self.hits,
+			'misses' : self.misses,
+			'writes' : self.writes,
+			'pruned' : self.pruned,
+			'num_plans' : num_plans,
+			'total_bytes' : total_bytes,
+			'max_bytes' : self.max_bytes,
+			'version' : self.version,
+		}
+
+	def close(self):
+		'''
+		Close the Connection of this Process
+		'''
+		with self._lock:
+			if self._connection is not None and self._pid == os.getpid():
+				self._connection.close()
+			self._connection = None
@@ -0,0 +1,319 @@
+from typing import Dict, Tuple
+from ..validation import validate_pieces
+from .. import options
+from ..defaults import (
+	OVERWEIGHT_SHIPMENT_THRESHOLD,
+	DEFAULT_PIECE_ARRANGEMENT_ALGORITHM,
+	DEFAULT_SHIPMENT_ARRANGEMENT_ALGORITHM,
+	DEFAULT_REQUEST_CACHE_SIZE,
+	REQUEST_CACHE_MAX_LAYOUTS,
+)
+from collections import OrderedDict
+import threading
+import hashlib
+import json
+import time
+
+class RequestCache:
+	'''
+	LRU Cache of Trailer Load Plan Responses, with Optional Expiry
+
+	Entries are keyed by `get_request_key`.  The least recently used
+	entry is evicted when the cache is full, and entries older than `ttl`
+	seconds are dropped when they are looked up.  Cached responses are
+	shared by every hit, `optimize_trailer_load_plan_wrapper` returns
+	copies of them (see `copy_load_plan`).
+
+	A persistent store, e.g. `SQLitePlanStore`, can be layered under the
+	cache:  responses are written to the store when they are cached, and
+	requests missing from memory are looked up in the store before being
+	counted as misses.  The time to live applies to stored responses too,
+	counted from when they were stored.
+
+	Parameters
+	------------
+	max_size : int
+		Maximum number of cached requests
+	ttl : float
+		Time to live of an entry in seconds, entries do not expire if None
+	store : SQLitePlanStore
+		Persistent store of responses shared with other processes, memory only if None
+	'''
+
+	def __init__(self,max_size : int = DEFAULT_REQUEST_CACHE_SIZE,ttl : float = None,store=None):
+		assert max_size > 0
+		self.max_size = max_size
+		self.ttl = ttl
+		self.store = store
+		self._lock = threading.Lock()
+		self.clear()
+
+	def clear(self):
+		'''
+		Remove All Entries from Memory and Reset the Statistics, the Store is Kept
+		'''
+		with self._lock:
+			self._entries = OrderedDict()
+			self.hits = 0
+			self.store_hits = 0
+			self.misses = 0
+			self.evictions = 0
+			self.expirations = 0
+
+	def __len__(self):
+		return len(self._entries)
+
+	def get(self,key : str):
+		'''
+		Get Cached Entry for a Key, None if Missing or Expired
+
+		Entries hold the cached response under `response`, and the
+		response renamed for request layouts under `layouts`, see
+		`RequestCache.get_layout_response`.
+		'''
+		with self._lock:
+			entry = self._entries.get(key)
+			if entry is not None and self.ttl is not None and time.monotonic() - entry[0] >= self.ttl:
+				del self._entries[key]
+				self.expirations += 1
+				entry = None
+			if entry is not None:
+				self._entries.move_to_end(key)
+				self.hits += 1
+				return entry[1]
+		stored = self.store.get_entry(key,max_age=self.ttl) if self.store is not None else None
+		with self._lock:
+			if stored is None:
+				self.misses += 1
+				return None
+			self.store_hits += 1
+		response,age = stored
+		return self._add(key,response,age=age)
+
+	def put(self,key : str,response : Dict):
+		'''
+		Cache a Response, and Write it to the Store
+
+		Returns
+		------------
+		entry : Dict
+			Cache entry of the response, see `get`
+		'''
+		if self.store is not None:
+			self.store.put(key,response)
+		return self._add(key,response)
+
+	def _add(self,key : str,response : Dict,age : float = 0.):
+		'''
+		Add an Entry to Memory, Evicting the Least Recently Used Entry if the Cache is Full
+
+		Entries read from the store keep their age, so they expire when the stored response would.
+		'''
+		entry = {'response' : response,'layouts' : {}}
+		with self._lock:
+			self._entries[key] = (time.monotonic() - age,entry)
+			self._entries.move_to_end(key)
+			while len(self._entries) > self.max_size:
+				self._entries.popitem(last=False)
+				self.evictions += 1
+		return entry
+
+	def get_layout_response(self,entry : Dict,layout : Tuple[Tuple[int, int]]):
+		'''
+		Get Load Plan of a Cached Entry Named After a Request's Shipment List
+
+		Renamed load plans are kept in the entry for up to
+		`REQUEST_CACHE_MAX_LAYOUTS` layouts, so repeated requests with the
+		same shipment list are served without renaming.  Entries are shared
+		by threads, the layouts are read and written under the cache lock.
+		'''
+		with self._lock:
+			response = entry['layouts'].get(layout)
+		if response is None:
+			response = rename_response_pieces(entry['response'],layout)
+			with self._lock:
+				if len(entry['layouts']) < REQUEST_CACHE_MAX_LAYOUTS:
+					response = entry['layouts'].setdefault(layout,response)
+		return response
+
+	def get_stats(self):
+		'''
+		Get Hit, Miss, Eviction, and Expiration Counts of the Cache
+
+		Hits served from the store count as hits and as store hits.
+		'''
+		hits = self.hits + self.store_hits
+		lookups = hits + self.misses
+		stats = {
+			'hits' : hits,
+			'store_hits' : self.store_hits,
+			'misses' : self.misses,
+			'hit_rate' : hits / lookups if lookups > 0 else 0.,
+			'evictions' : self.evictions,
+			'expirations' : self.expirations,
+			'size' : len(self._entries),
+			'max_size' : self.max_size,
+			'ttl' : self.ttl,
+		}
+		if self.store is not None:
+			stats['store'] = self.store.get_stats()
+		return stats
+
+
+def get_piece_signature(shipment : Dict):
+	'''
+	Get the Attributes of a Shipment List Entry that Determine its Pieces, Raising a ValueError if they cannot be Canonicalized
+	'''
+	if not isinstance(shipment.get('stack_limit'),int) or isinstance(shipment.get('stack_limit'),bool):
+		raise ValueError('Stack limit must be an integer')
+	if not isinstance(shipment.get('packing'),str):
+		raise ValueError('Packing must be a string')
+	return (
+		float(shipment['length']),
+		float(shipment['width']),
+		float(shipment['height']),
+		float(shipment['weight']),
+		shipment['packing'],
+		shipment['stack_limit'],
+	)
+
+
+def get_value_or_default(request_data : Dict,key : str,default):
+	'''
+	Get Request Parameter, with the Default Used by `optimize_trailer_load_plan` if Missing or None
+	'''
+	return default if request_data.get(key) is None else request_data[key]
+
+
+def get_canonical_request(parsed_request_data : Dict):
+	'''
+	Get Canonical Form of a Parsed Request
+
+	The pieces of the request are reduced to a multiset:  shipment list
+	entries with the same dimensions, weight, packing, and stack limit
+	are merged, and the merged entries are sorted.  Defaults are filled
+	in for omitted parameters, so requests for the same load plan have
+	the same canonical form, whatever the order or grouping of their
+	pieces.
+
+	Parameters
+	------------
+	parsed_request_data : Dict
+		Request data returned by `parse_request_data`
+
+	Returns
+	------------
+	canonical_request : Dict
+		Request data with the canonical shipment list, JSON serializable
+	layout : Tuple[Tuple[int, int]]
+		Index of the canonical entry and number of pieces of each entry of the request's shipment list
+
+	Raises
+	------------
+	ValueError
+		Raised when the pieces or trailer dimensions are invalid or cannot be canonicalized
+	'''
+	shipment_list = parsed_request_data['shipment_list']
+	validate_pieces(shipment_list=shipment_list)
+	signatures = [get_piece_signature(shipment) for shipment in shipment_list]
+	counts = [shipment.get('num_pieces',1) for shipment in shipment_list]
+	if not all([isinstance(count,int) and not isinstance(count,bool) and count > 0 for count in counts]):
+		raise ValueError('Number of pieces must be a positive integer')
+	canonical_signatures = sorted(set(signatures))
+	index = {signature : i for i,signature in enumerate(canonical_signatures)}
+	canonical_counts = [0] * len(canonical_signatures)
+	for signature,count in zip(signatures,counts):
+		canonical_counts[index[signature]] += count
+	trailer_dims = parsed_request_data['trailer_dims']
+	canonical_request = {
+		'trailer_dims' : {
+			key : float(trailer_dims[key])
+			for key in ['inner_width','inner_length','inner_height','max_weight']
+		},
+		'shipment_list' : [
+			{
+				'length' : length,
+				'width' : width,
+				'height' : height,
+				'weight' : weight,
+				'packing' : packing,
+				'stack_limit' : stack_limit,
+				'num_pieces' : count,
+				'dimension_unit_of_measure' : options.DimUomInches,
+				'weight_unit_of_measure' : options.WeightUomPounds,
+			}
+			for (length,width,height,weight,packing,stack_limit),count in zip(canonical_signatures,canonical_counts)
+		],
+		'allow_rotations' : parsed_request_data.get('allow_rotations',True),
+		'overweight_shipment_threshold' : float(get_value_or_default(parsed_request_data,'overweight_shipment_threshold',OVERWEIGHT_SHIPMENT_THRESHOLD)),
+		'piece_arrangement_algorithm' : get_value_or_default(parsed_request_data,'piece_arrangement_algorithm',DEFAULT_PIECE_ARRANGEMENT_ALGORITHM),
+		'shipment_optimization_ls' : get_value_or_default(parsed_request_data,'shipment_optimization_ls',DEFAULT_SHIPMENT_ARRANGEMENT_ALGORITHM),
+		'shipment_optimization_portfolio' : parsed_request_data.get('shipment_optimization_portfolio'),
+		'stop_at_lower_bound' : parsed_request_data.get('stop_at_lower_bound',False),
+		'seed' : parsed_request_data.get('seed'),
+	}
+	layout = tuple([(index[signature],count) for signature,count in zip(signatures,counts)])
+	return canonical_request,layout
+
+
+def get_request_key(canonical_request : Dict):
+	'''
+	Get Hash of a Canonical Request, Used as Cache Key
+	'''
+	return hashlib.sha256(json.dumps(canonical_request,sort_keys=True).encode()).hexdigest()
+
+
+def copy_load_plan(response : Dict):
+	'''
+	Copy a Cached Load Plan, Down to the Pieces of its Load Order, so Callers can Modify it
+	'''
+	response = dict(response)
+	if 'load_order' in response:
+		response['load_order'] = {
+			key : {**piece,'position' : list(piece['position'])} if 'position' in piece else dict(piece)
+			for key,piece in response['load_order'].items()
+		}
+	return response
+
+
+def get_piece_name(shipment_idx : int,piece_idx : int):
+	'''
+	Get Piece Name Used in Load Plans, see `PieceGroup.get_piece_name`
+	'''
+	return f'Shipment {shipment_idx+1}:  Piece {piece_idx+1}'
+
+
+def rename_response_pieces(response : Dict,layout : Tuple[Tuple[int, int]]):
+	'''
+	Rename Pieces of a Load Plan of a Canonical Request After the Entries of the Request's Shipment List
+
+	Pieces of a canonical entry are handed out, in order, to the entries
+	of the request merged into it, in the order of the request.
+
+	Parameters
+	------------
+	response : Dict
+		Load plan of the canonical request
+	layout : Tuple[Tuple[int, int]]
+		Layout of the request, see `get_canonical_request`
+
+	Returns
+	------------
+	response : Dict
+		Copy of the load plan with the pieces named after the request's shipment list
+	'''
+	names = {}
+	next_piece = {}
+	for shipment_idx,(canonical_idx,count) in enumerate(layout):
+		start = next_piece.get(canonical_idx,0)
+		for piece_idx in range(count):
+			names[get_piece_name(canonical_idx,start + piece_idx)] = get_piece_name(shipment_idx,piece_idx)
+		next_piece[canonical_idx] = start + count
+	return {
+		**response,
+		'load_order' : {
+			key : {**piece,'name' : names.get(piece.get('name'),piece.get('name'))}
+			for key,piece in response.get('load_order',{}).items()
+		}
+	}
+
@@ -1,10 +1,10 @@
 
 from typing import List, Dict
 from ..logistics_objects import (
-	Piece, Shipment, Trailer
+	PieceGroup, Shipment, Trailer
 )
 from ..utils import (
-	get_current_trailer_configuration, restore_trailer_configuration
+	TrailerConfiguration, get_current_trailer_configuration, restore_trailer_configuration
 )
 from ..exceptions import (
 	NoPiecesException,
@@ -17,15 +17,211 @@ from ..validation import (
 	validate_piece_length, validate_pieces, validate_trailer_dims
 )
 from ..optimizer_functions import (
-	optimize_pieces_arrangement, optimize_shipment_arrangement,
+	optimize_piece_groups_arrangement, optimize_shipment_arrangement,
 )
+from ..optimizer_functions.shipment_arrangement.greedy import EXECUTOR_ROUTER
 from .. import options
 from ..defaults import (
 	OVERWEIGHT_SHIPMENT_THRESHOLD,
 	DEFAULT_PIECE_ARRANGEMENT_ALGORITHM,
 	DEFAULT_SHIPMENT_ARRANGEMENT_ALGORITHM,
+	DEFAULT_SPATIAL_INDEX,
+	SPATIAL_INDEX_SHIPMENT_THRESHOLD,
+	DEFAULT_PORTFOLIO_EXECUTOR,
 )
+from concurrent.futures import wait, FIRST_COMPLETED
 from copy import deepcopy
+import multiprocessing
+import threading
+import os
+
+# Worker pools of portfolios, with the id of the process that created them, kept between requests and keyed by executor and number of workers
+_portfolio_pools = {}
+# Manager process sharing the stop events of portfolios with process workers, with the id of the process that created it
+_portfolio_manager = (None, None)
+_portfolio_lock = threading.Lock()
+
+def run_shipment_optimization_chain(trailer, shipment_optimization_ls : List[Dict], allow_rotations : bool = True, lower_bound : float = None, seed : int = None, stop_event=None):
+	'''
+	Run Shipment Arrangement Optimizations One After Another on a Trailer
+
+	Each optimization starts from the arrangement left by the previous
+	one, and the result of every optimization is recorded.
+
+	Parameters
+	------------
+	trailer : logistics_objects.Trailer
+		Trailer whose shipments are arranged
+	shipment_optimization_ls : List[Dict]
+		Keyword arguments of `optimize_shipment_arrangement` for each optimization of the chain
+	allow_rotations : bool
+		Allow shipments to be rotated when loading
+	lower_bound : float
+		Linear feet no valid arrangement can go below, the chain stops once a valid arrangement reaches it, never stops early if None
+	seed : int
+		Seed passed to optimizations that do not set their own, randomized optimizations use the global NumPy generator if None
+	stop_event : threading.Event
+		Event checked before each optimization, and passed to the optimizations to be checked between their iterations, never stops early if None
+
+	Returns
+	------------
+	results : List[Dict]
+		Linear feet, configuration, validity, and optimization parameters after each optimization
+	'''
+	results = []
+	for opt_kwargs in shipment_optimization_ls:
+		if stop_event is not None and stop_event.is_set():
+			break
+		run_kwargs = opt_kwargs if seed is None else {'seed' : seed,**opt_kwargs}
+		optimize_shipment_arrangement(
+			trailer=trailer,
+			allow_rotations=allow_rotations,
+			**(run_kwargs if stop_event is None else {**run_kwargs,'stop_event' : stop_event}),
+		)
+		trailer._set_weight()
+		results += [
+			{
+				'linear_feet' : trailer.get_linear_feet(),
+				'configuration' : get_current_trailer_configuration(trailer),
+				'valid' : trailer.arrangement_is_valid(),
+				'request_kwargs' : opt_kwargs,
+			}
+		]
+		if reaches_lower_bound(results[-1],lower_bound):
+			break
+	return results
+
+def reaches_lower_bound(result : Dict, lower_bound : float = None):
+	'''
+	Check a Result is a Valid Arrangement Reaching the Lower Bound, so No Other Arrangement can be Shorter
+	'''
+	return lower_bound is not None and result.get('valid') and result.get('linear_feet') <= lower_bound + 1e-9
+
+def run_portfolio_chain(trailer, shipment_optimization_ls : List[Dict], allow_rotations : bool = True, lower_bound : float = None, seed : int = None, stop_event=None):
+	'''
+	Run a Chain of a Portfolio on a Trailer Copy
+
+	Same as `run_shipment_optimization_chain`, with each configuration
+	returned as values ordered like the shipments of the trailer when the
+	chain started, so they can be restored on the original trailer.
+	'''
+	shipments = list(trailer.shipments)
+	results = run_shipment_optimization_chain(
+		trailer=trailer,
+		shipment_optimization_ls=shipment_optimization_ls,
+		allow_rotations=allow_rotations,
+		lower_bound=lower_bound,
+		seed=seed,
+		stop_event=stop_event,
+	)
+	for result in results:
+		result['configuration'] = result['configuration'].get_values(shipments)
+	return results
+
+def get_portfolio_pool(executor : str, workers : int):
+	'''
+	Get a Worker Pool for Portfolios, Created on First Use and Reused by Later Portfolios
+
+	A pool is replaced if a crashed worker broke it, or if another
+	process created it, e.g. a worker forked from this one.
+	'''
+	with _portfolio_lock:
+		pid,pool = _portfolio_pools.get((executor,workers),(None,None))
+		if pool is None or pid != os.getpid() or getattr(pool,'_broken',False):
+			pool = EXECUTOR_ROUTER[executor](max_workers=workers)
+			_portfolio_pools[(executor,workers)] = (os.getpid(),pool)
+		return pool
+
+def get_portfolio_stop_event(executor : str):
+	'''
+	Get an Event to Stop the Chains of a Portfolio, Shared with Process Workers through a Manager Process
+	'''
+	global _portfolio_manager
+	if executor != 'process':
+		return threading.Event()
+	with _portfolio_lock:
+		pid,manager = _portfolio_manager
+		if manager is None or pid != os.getpid():
+			manager = multiprocessing.Manager()
+			_portfolio_manager = (os.getpid(),manager)
+		return manager.Event()
+
+def optimize_shipment_arrangement_portfolio(trailer, shipment_optimization_portfolio : List[List[Dict]], allow_rotations : bool = True, workers : int = None, executor : str = DEFAULT_PORTFOLIO_EXECUTOR, stop_at_lower_bound : bool = False, seed : int = None):
+	'''
+	Run Independent Chains of Shipment Arrangement Optimizations in Parallel
+
+	Each chain is a `shipment_optimization_ls` run by a worker on its own
+	copy of the trailer, e.g. NO_STACK_BIN_PACK then SLIDE_BACK alongside
+	GREEDY_LOAD from the initial arrangement, so a portfolio takes about
+	as long as its slowest chain when there are enough workers.  The
+	trailer itself is not changed.  Chains run on a pool kept between
+	portfolios, see `get_portfolio_pool`.
+
+	Parameters
+	------------
+	trailer : logistics_objects.Trailer
+		Trailer whose shipments are arranged
+	shipment_optimization_portfolio : List[List[Dict]]
+		List of chains, each a list of keyword arguments of `optimize_shipment_arrangement`
+	allow_rotations : bool
+		Allow shipments to be rotated when loading
+	workers : int
+		Number of workers to run the chains on, one per chain if None
+	executor : str
+		Worker pool type, options are the keys of `EXECUTOR_ROUTER`
+	stop_at_lower_bound : bool
+		Stop the other chains once a valid arrangement reaches
+		`Trailer.get_linear_feet_lower_bound`.  Chains not started are
+		cancelled, chains already running stop after their current
+		iteration and are waited for, so no work is left running.
+	seed : int
+		Seed passed to optimizations that do not set their own, see `run_shipment_optimization_chain`
+
+	Returns
+	------------
+	results : List[Dict]
+		Results of the optimizations of the chains finished before stopping, in portfolio order, see `run_shipment_optimization_chain`
+	'''
+	if not executor in EXECUTOR_ROUTER.keys():
+		raise NotImplementedError(f'Executor `{executor}` has not been implemented')
+	lower_bound = trailer.get_linear_feet_lower_bound(allow_rotations=allow_rotations) if stop_at_lower_bound else None
+	workers = max(min(workers or len(shipment_optimization_portfolio),len(shipment_optimization_portfolio)),1)
+	chain_results = [[] for _ in shipment_optimization_portfolio]
+	# Only a portfolio stopping at the lower bound can stop its chains early
+	stop_event = get_portfolio_stop_event(executor) if stop_at_lower_bound else None
+	pool = get_portfolio_pool(executor,workers)
+	futures = {
+		pool.submit(
+			run_portfolio_chain,
+			# Process workers receive a pickled copy, thread workers need their own copy
+			trailer if executor == 'process' else deepcopy(trailer),
+			shipment_optimization_ls,
+			allow_rotations,
+			lower_bound,
+			seed,
+			stop_event,
+		) : i
+		for i,shipment_optimization_ls in enumerate(shipment_optimization_portfolio)
+	}
+	pending = set(futures)
+	try:
+		stopped = False
+		while len(pending) > 0 and not stopped:
+			done,pending = wait(pending,return_when=FIRST_COMPLETED)
+			for future in done:
+				chain_results[futures[future]] = future.result()
+			stopped = any([reaches_lower_bound(result,lower_bound) for results in chain_results for result in results])
+	finally:
+		# Chains not started are cancelled, and running chains are stopped and waited for, so the pool is idle for the next portfolio
+		if stop_event is not None:
+			stop_event.set()
+		for future in pending:
+			future.cancel()
+		wait(pending)
+	return [
+		{**result,'configuration' : TrailerConfiguration(trailer,values=result['configuration'])}
+		for results in chain_results for result in results
+	]
 
 def optimize_trailer_load_plan(shipment_list : List[Dict], trailer_dims : Dict, allow_rotations : bool = True, **kwargs):
 	# Validation of Pieces and Trailer Dimensions
@@ -54,23 +250,17 @@ def optimize_trailer_load_plan(shipment_list : List[Dict], trailer_dims : Dict,
 	overweight_shipment_threshold = OVERWEIGHT_SHIPMENT_THRESHOLD if kwargs.get('overweight_shipment_threshold') is None else kwargs.get('overweight_shipment_threshold')
 	piece_arrangement_algorithm = DEFAULT_PIECE_ARRANGEMENT_ALGORITHM if kwargs.get('piece_arrangement_algorithm') is None else kwargs.get('piece_arrangement_algorithm')
 	shipment_optimization_ls = DEFAULT_SHIPMENT_ARRANGEMENT_ALGORITHM if kwargs.get('shipment_optimization_ls') is None else kwargs.get('shipment_optimization_ls')
+	shipment_optimization_portfolio = kwargs.get('shipment_optimization_portfolio')
+	stop_at_lower_bound = bool(kwargs.get('stop_at_lower_bound'))
 	
-	# Create pieces for all provided shipments
-	pieces = []
-	for i, shipment_dict in enumerate(deepcopy(shipment_list)):
-		num_items = shipment_dict.pop('num_pieces', 1)
-		for j in range(num_items):
-			shipment_dict.update(
-				{
-					'name': f'Shipment {i+1}:  Piece {j+1}',
-					'id' : shipment_dict.get('id'),
-					'desc' : shipment_dict.get('desc'),
-				}
-			)
-			pieces += [Piece(**shipment_dict)]
-	# Identify overweight shipments
-	overweight_pieces = [piece for piece in pieces if piece.weight > overweight_shipment_threshold]
-	pieces = [piece for piece in pieces if not piece in overweight_pieces]
+	# Create one group of identical pieces for each provided shipment
+	groups = PieceGroup.from_shipment_list(deepcopy(shipment_list))
+	# Identify overweight shipments, their pieces are loaded individually
+	overweight_pieces = []
+	for group in groups:
+		if group.weight > overweight_shipment_threshold:
+			overweight_pieces += group.make_pieces()
+	groups = [group for group in groups if not group.weight > overweight_shipment_threshold]
 	
 	# Orient overweight shipments to maximally distribute weight in the length dimension, if allowed
 	if allow_rotations:
@@ -78,11 +268,11 @@ def optimize_trailer_load_plan(shipment_list : List[Dict], trailer_dims : Dict,
 			if piece.length < piece.width:
 				piece.rotate()
 	
-	# Arrange non-overweight pieces into shipments
-	if len(pieces) > 0:
+	# Arrange non-overweight pieces into shipments, identical stacks are built once and copied
+	if len(groups) > 0:
 		try:
-			shipments = optimize_pieces_arrangement(
-				pieces=pieces,
+			shipments = optimize_piece_groups_arrangement(
+				groups=groups,
 				algorithm=piece_arrangement_algorithm,
 				trailer_height=trailer_dims.get('inner_height'),
 				allow_rotations=allow_rotations,
@@ -92,6 +282,14 @@ def optimize_trailer_load_plan(shipment_list : List[Dict], trailer_dims : Dict,
 	else:
 		shipments = []
 	
+	# Collision queries only benefit from a spatial index on heavily loaded trailers
+	if kwargs.get('spatial_index') is not None:
+		spatial_index = kwargs.get('spatial_index')
+	elif len(shipments) >= SPATIAL_INDEX_SHIPMENT_THRESHOLD:
+		spatial_index = DEFAULT_SPATIAL_INDEX
+	else:
+		spatial_index = None
+
 	# Create trailer object associated to shipments made up of non-overweight pieces
 	trailer = Trailer(
 		shipments=shipments,
@@ -102,27 +300,33 @@ def optimize_trailer_load_plan(shipment_list : List[Dict], trailer_dims : Dict,
 		weight=0,
 		weight_unit_of_measure=weight_unit_of_measure,
 		max_weight=trailer_dims.get('max_weight'),
+		spatial_index=spatial_index,
 	)
 
 	# Optimize shipment arrangement within trailer
 	results = []
-	if len(pieces) > 0:
+	if len(groups) > 0:
 		try:
-			for opt_kwargs in shipment_optimization_ls:
-				optimize_shipment_arrangement(
+			if shipment_optimization_portfolio is not None:
+				# Chains run in parallel on trailer copies, the best arrangement is restored below
+				results = optimize_shipment_arrangement_portfolio(
 					trailer=trailer,
+					shipment_optimization_portfolio=shipment_optimization_portfolio,
 					allow_rotations=allow_rotations,
-					**opt_kwargs,
+					workers=kwargs.get('portfolio_workers'),
+					executor=kwargs.get('portfolio_executor') or DEFAULT_PORTFOLIO_EXECUTOR,
+					stop_at_lower_bound=stop_at_lower_bound,
+					seed=kwargs.get('seed'),
 				)
 				trailer._set_weight()
-				results += [
-					{
-						'linear_feet' : trailer.get_linear_feet(),
-						'configuration' : get_current_trailer_configuration(trailer),
-						'valid' : trailer.arrangement_is_valid(),
-						'request_kwargs' : opt_kwargs,
-					}
-				]
+			else:
+				results = run_shipment_optimization_chain(
+					trailer=trailer,
+					shipment_optimization_ls=shipment_optimization_ls,
+					allow_rotations=allow_rotations,
+					lower_bound=trailer.get_linear_feet_lower_bound(allow_rotations=allow_rotations) if stop_at_lower_bound else None,
+					seed=kwargs.get('seed'),
+				)
 			assert len([result for result in results if result.get('valid')]) > 0
 			result = sorted([result for result in results if result.get('valid')],key=lambda x : x.get('linear_feet'))[0]
 			restore_trailer_configuration(result['configuration'])
@@ -136,8 +340,10 @@ def optimize_trailer_load_plan(shipment_list : List[Dict], trailer_dims : Dict,
 		linear_inches = boundaries[0, 1]
 		for shipment in overweight_shipments:
 			shipment._set_dims()
-			shipment.position[0] = linear_inches
-			shipment.position[1] = trailer.width / 2 - shipment.width / 2
+			position = shipment.position.copy()
+			position[0] = linear_inches
+			position[1] = trailer.width / 2 - shipment.width / 2
+			shipment.position = position
 			trailer.add_shipment(shipment)
 			linear_inches += shipment.length
 			shipment._set_dims()
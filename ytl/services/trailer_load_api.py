@@ -1,6 +1,9 @@
 
-from typing import Dict
+from typing import List, Dict
 from .trailer_load import optimize_trailer_load_plan
+from .request_cache import (
+	RequestCache, get_canonical_request, get_request_key, copy_load_plan,
+)
 from ..exceptions import (
 	TooManyPiecesException,
 	NoPiecesException,
@@ -13,7 +16,6 @@ from ..exceptions import (
 from ..optimizer_functions import PIECE_ARRANGEMENT_ROUTER, SHIPMENT_ARRANGEMENT_ROUTER
 from ..standard_logistic_dims import STANDARD_TRAILER_DIMS
 from .. import options
-from copy import deepcopy
 import numpy as np
 import json
 
@@ -34,6 +36,16 @@ class NumpyArrayEncoder(json.JSONEncoder):
 			return bool(obj)
 		return json.JSONEncoder.default(self, obj)
 
+def validate_shipment_optimization_ls(shipment_optimization_ls : List[Dict]):
+	'''
+	Validate a List of Shipment Arrangement Parameters, Raising an AssertionError if Invalid
+	'''
+	for params in shipment_optimization_ls:
+		assert isinstance(params,dict)
+		assert params['algorithm'] in SHIPMENT_ARRANGEMENT_ROUTER
+		assert isinstance(params.get('max_iter'),(int,type(None)))
+		assert isinstance(params.get('timeout'),(int,float,type(None)))
+
 def parse_request_data(request_data : Dict):
 	'''
 	Parse Request Data for Trailer Load Optimization API Serivce
@@ -87,11 +99,15 @@ def parse_request_data(request_data : Dict):
 			'error_code' : 'InvalidPiecesException',
 			'error_message' : 'Invalid pieces provided',
 		}
-	for shipment in parsed_request_data['shipment_list']:
-		shipment.update({
+	# Shipments are copied, the request data is not modified
+	parsed_request_data['shipment_list'] = [
+		{
+			**shipment,
 			"dimension_unit_of_measure": options.DimUomInches,
 			"weight_unit_of_measure": options.WeightUomPounds,
-		})
+		}
+		for shipment in parsed_request_data['shipment_list']
+	]
 
 	# Parse allow rotations parameter
 	if request_data.get('allow_rotations') == False:
@@ -127,22 +143,48 @@ def parse_request_data(request_data : Dict):
 	
 	if request_data.get('shipment_optimization_ls') is not None:
 		try:
-			for params in request_data.get('shipment_optimization_ls'):
-				assert isinstance(params,dict)
-				assert params['algorithm'] in SHIPMENT_ARRANGEMENT_ROUTER
-				assert isinstance(params.get('max_iter'),(int,type(None)))
-				assert isinstance(params.get('timeout'),(int,float,type(None)))
+			validate_shipment_optimization_ls(request_data.get('shipment_optimization_ls'))
 			parsed_request_data.update({'shipment_optimization_ls' : request_data['shipment_optimization_ls']})
 		except:
 			return 400,{},{
 				'error_code' : 'OptimizationFailedServiceException',
 				'error_message' : 'Invalid shipment arrangement parameter provided',
 			}
+	
+	if request_data.get('shipment_optimization_portfolio') is not None:
+		try:
+			assert len(request_data.get('shipment_optimization_portfolio')) > 0
+			for shipment_optimization_ls in request_data.get('shipment_optimization_portfolio'):
+				validate_shipment_optimization_ls(shipment_optimization_ls)
+			parsed_request_data.update({'shipment_optimization_portfolio' : request_data['shipment_optimization_portfolio']})
+		except:
+			return 400,{},{
+				'error_code' : 'OptimizationFailedServiceException',
+				'error_message' : 'Invalid shipment arrangement portfolio parameter provided',
+			}
+	
+	if request_data.get('seed') is not None:
+		if isinstance(request_data.get('seed'),int) and not isinstance(request_data.get('seed'),bool) and request_data.get('seed') >= 0:
+			parsed_request_data.update({'seed' : request_data['seed']})
+		else:
+			return 400,{},{
+				'error_code' : 'OptimizationFailedServiceException',
+				'error_message' : 'Invalid seed parameter provided',
+			}
+	
+	if request_data.get('stop_at_lower_bound') is not None:
+		if isinstance(request_data.get('stop_at_lower_bound'),bool):
+			parsed_request_data.update({'stop_at_lower_bound' : request_data['stop_at_lower_bound']})
+		else:
+			return 400,{},{
+				'error_code' : 'OptimizationFailedServiceException',
+				'error_message' : 'Invalid stop at lower bound parameter provided',
+			}
 
 	return 200,parsed_request_data,{}
 
 
-def optimize_trailer_load_plan_wrapper(request_data : Dict):
+def optimize_trailer_load_plan_wrapper(request_data : Dict, cache : RequestCache = None):
 	'''
 	Trailer Load Optimization Function Intended for Use with API
 
@@ -150,6 +192,15 @@ def optimize_trailer_load_plan_wrapper(request_data : Dict):
 	------------
 	request_data : Dict
 		Request data for trailer loading optimization
+	cache : RequestCache
+		Cache of load plans keyed by canonical request, load plans are
+		computed for every request if None.  With a cache, load plans are
+		computed for the canonical form of the request (see
+		`get_canonical_request`), with pieces named after the request's
+		shipment list, so hits and misses give the same load plan.  It
+		may differ from the load plan of the same request and seed
+		without a cache, as the canonical form merges and reorders the
+		shipment list.  Each call returns its own copy of the load plan.
 	
 	Returns
 	------------
@@ -160,7 +211,7 @@ def optimize_trailer_load_plan_wrapper(request_data : Dict):
 	'''
 	# Parse request data
 	try:
-		request_status_code,parsed_request_data,errors = parse_request_data(request_data=deepcopy(request_data))
+		request_status_code,parsed_request_data,errors = parse_request_data(request_data=request_data)
 		if request_status_code != 200:
 			return request_status_code,errors
 	except:
@@ -170,7 +221,41 @@ def optimize_trailer_load_plan_wrapper(request_data : Dict):
 			'request' : request_data,
 		}
 	
-	# Do trailer load optimization
+	if cache is None:
+		return get_trailer_load_plan_response(parsed_request_data=parsed_request_data)
+	
+	# Requests with the same canonical form share a cached load plan
+	try:
+		canonical_request_data,layout = get_canonical_request(parsed_request_data=parsed_request_data)
+	except:
+		# Invalid pieces are reported by the optimization, without caching
+		return get_trailer_load_plan_response(parsed_request_data=parsed_request_data)
+	key = get_request_key(canonical_request_data)
+	entry = cache.get(key)
+	if entry is None:
+		status_code,response_dict = get_trailer_load_plan_response(parsed_request_data=canonical_request_data)
+		if status_code != 200:
+			return status_code,response_dict
+		entry = cache.put(key,response_dict)
+	return 200,copy_load_plan(cache.get_layout_response(entry,layout))
+
+
+def get_trailer_load_plan_response(parsed_request_data : Dict):
+	'''
+	Optimize Trailer Load Plan for Parsed Request Data, see `optimize_trailer_load_plan_wrapper`
+
+	Parameters
+	------------
+	parsed_request_data : Dict
+		Request data returned by `parse_request_data`
+	
+	Returns
+	------------
+	status_code : int 
+		Status code to be used for API response
+	response_dict : Dict
+		Response, trailer loading result when status_code is 200, error summary when status_code is not 200
+	'''
 	try:
 		trailer = optimize_trailer_load_plan(**parsed_request_data)
 		if not trailer.arrangement_is_valid():
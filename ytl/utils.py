@@ -1,4 +1,4 @@
-from typing import List, Dict
+from typing import List
 import numpy as np
 
 
@@ -59,6 +59,48 @@ def interval_is_subset(a : List[float], b : List[float]):
 	return a[0] >= b[0] and a[1] <= b[1]
 
 
+def get_overlapping_pairs(boundaries : np.ndarray):
+	'''
+	Find All Pairs of Overlapping Boxes with a Sort and Sweep on the Length Axis
+
+	Boxes are sorted by the start of their length interval, and each box is
+	only compared to the boxes starting before it ends, so only pairs with
+	overlapping length intervals are checked in all three dimensions.  This
+	runs in O(n log n + k), where k is the number of pairs overlapping in
+	the length dimension.
+
+	Params
+	-----------
+	boundaries : np.ndarray
+		Array of shape (n,3,2) with the lower and upper bound of each box in each dimension
+	
+	Returns
+	-----------
+	pairs : np.ndarray
+		Array of shape (m,2) with the indices of each pair of overlapping boxes, lower index first
+	
+	Examples
+	-----------
+	get_overlapping_pairs(np.array([[[0,2],[0,1],[0,1]],[[1,3],[0,1],[0,1]]])) # returns [[0,1]]
+	get_overlapping_pairs(np.array([[[0,1],[0,1],[0,1]],[[1,2],[0,1],[0,1]]])) # returns empty (0,2) array
+	'''
+	boundaries = np.asarray(boundaries,dtype=float)
+	order = np.argsort(boundaries[:,0,0],kind='stable')
+	starts = boundaries[order,0,0]
+	ends = boundaries[order,0,1]
+	# Boxes i+1,...,stop[i]-1 (in sorted order) start before box i ends
+	stop = np.searchsorted(starts,ends,side='left')
+	counts = np.maximum(stop - np.arange(len(order)) - 1,0)
+	first = np.repeat(np.arange(len(order)),counts)
+	offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts,counts)
+	second = first + 1 + offsets
+	a = boundaries[order[first]]
+	b = boundaries[order[second]]
+	overlap = np.all((a[:,:,0] < b[:,:,1]) & (a[:,:,1] > b[:,:,0]),axis=1)
+	pairs = np.sort(np.stack([order[first[overlap]],order[second[overlap]]],axis=1),axis=1)
+	return pairs[np.lexsort((pairs[:,1],pairs[:,0]))]
+
+
 def rotation_matrix(theta : float):
 	'''
 	Construct a 3x3 Rotation Matrix Rotating Counter-Clockwise in the First Two Dimensions
@@ -80,38 +122,78 @@ def rotation_matrix(theta : float):
 	])
 
 
-def list_remove(idx : int, allocated : List, available : List):
+class TrailerConfiguration:
 	'''
-	Remove Element from List While Managing Available/Unavailable Selections
-
-	Params
-	----------
-	idx : int
-		Index of value to be removed
-	
-	Returns
-	----------
-	None
+	Snapshot of the Position and Orientation of Every Shipment in a Trailer
+
+	Positions and rotation flags are packed into a single (n,4) array of
+	x, y, z, and is_rotated, holding values rather than references to the
+	shipments' position arrays.  The array is allocated once and refilled
+	by `capture`, so a snapshot can be kept up to date on every improvement
+	of an optimizer, and `restore` moves all shipments back in one pass.
+	Iterating gives `(shipment, position, is_rotated)` tuples.
 	'''
-	allocated.remove(idx)
-	available += [idx]
 
+	def __init__(self,trailer,values=None):
+		self.trailer = trailer
+		self.shipments = []
+		self.values = np.empty((0,4))
+		if values is None:
+			self.capture()
+		else:
+			# Values recorded elsewhere, e.g. on a copy of the trailer, ordered like the trailer's shipments
+			self.shipments = list(trailer.shipments)
+			self.values = np.array(values,dtype=float).reshape(len(self.shipments),4)
+
+	def capture(self):
+		'''
+		Record the Current Position and Orientation of the Trailer's Shipments, Reusing the Snapshot Array
+		'''
+		self.shipments = list(self.trailer.shipments)
+		if len(self.values) != len(self.shipments):
+			self.values = np.empty((len(self.shipments),4))
+		if len(self.shipments) > 0:
+			self.values[:] = [(s._x,s._y,s._z,s.is_rotated) for s in self.shipments]
+		return self
+
+	@property
+	def positions(self):
+		return self.values[:,:3]
+
+	@property
+	def is_rotated(self):
+		return self.values[:,3].astype(bool)
+
+	def __len__(self):
+		return len(self.shipments)
+
+	def get_values(self,shipments):
+		'''
+		Get the Recorded Values Ordered Like the Provided Shipments
+		'''
+		rows = {id(s) : i for i,s in enumerate(self.shipments)}
+		return self.values[[rows[id(s)] for s in shipments]]
+
+	def __iter__(self):
+		return iter(zip(self.shipments,self.positions.copy(),self.is_rotated.tolist()))
+
+	def restore(self):
+		'''
+		Move and Rotate the Shipments Back to the Recorded Configuration
+
+		Shipments are restored through `Trailer.set_configuration` when they
+		are still the shipments of the trailer, in any order, and one at a
+		time otherwise.
+		'''
+		trailer = self.trailer
+		if len(self.shipments) == len(trailer.shipments) and all([s._trailer is trailer for s in self.shipments]):
+			trailer.set_configuration(self.positions,self.is_rotated,shipments=self.shipments)
+			return
+		for s, pos, rot in self:
+			s.position = pos
+			if rot != s.is_rotated:
+				s.rotate()
 
-def list_allocate(idx : int, allocated : List, available : List):
-	'''
-	Allocate Element from List While Managing Available/Unavailable Selections
-
-	Params
-	----------
-	idx : int
-		Index of value to be allocated
-	
-	Returns
-	----------
-	None
-	'''
-	available.remove(idx)
-	allocated += [idx]
 
 def get_current_trailer_configuration(trailer):
 	'''
@@ -128,13 +210,13 @@ def get_current_trailer_configuration(trailer):
 	
 	Returns
 	---------
-	shipment_arrangement : List[Dict]
-		List of dictionaries detailing the location of pieces in the current trailer load plan
+	shipment_arrangement : TrailerConfiguration
+		Snapshot of the position and orientation of each shipment in the current trailer load plan
 	'''
-	return [(s, s.position, s.is_rotated) for s in trailer.shipments]
+	return TrailerConfiguration(trailer)
 
 
-def restore_trailer_configuration(shipment_arrangement : List[Dict]):
+def restore_trailer_configuration(shipment_arrangement):
 	'''
 	Restore Provided Piece Location Configuration
 	
@@ -144,15 +226,18 @@ def restore_trailer_configuration(shipment_arrangement : List[Dict]):
 
 	Params
 	---------
-	shipment_arrangement : List[Dict]
-		Shipment arrangment list - typically, this would be a value returned by `get_current_trailer_configuration`
+	shipment_arrangement : TrailerConfiguration
+		Shipment arrangment - typically, this would be a value returned by `get_current_trailer_configuration`,
+		a list of `(shipment, position, is_rotated)` tuples is also accepted
 	
 	Returns
 	---------
 	None
 	'''
+	if isinstance(shipment_arrangement,TrailerConfiguration):
+		shipment_arrangement.restore()
+		return
 	for s, pos, rot in shipment_arrangement:
 		s.position = pos
 		if rot != s.is_rotated:
 			s.rotate()
-		s._set_dims()